@@ -6,7 +6,7 @@ The main functionality of dynesty is performed by the
 dynesty.NestedSampler and dynesty.DynamicNestedSampler
 classes
 """
-from .dynesty import NestedSampler, DynamicNestedSampler
+from .dynesty import NestedSampler, DynamicNestedSampler, run_ensemble
 from . import bounding
 from . import utils
 from . import pool
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compiled versions of the small time-critical functions used when proposing
+new points (i.e. :func:`~dynesty.bounding.randsphere`,
+:func:`~dynesty.utils.unitcheck` or
+:func:`~dynesty.sampling.propose_ball_point`).
+They are compiled with numba if it is installed, otherwise
+the original numpy implementations are used.
+
+The kernels never draw random numbers themselves, they
+only receive the numbers drawn by the callers, so the consumption of the
+random number generator is the same irrespective of whether the kernels are
+used or not.
+
+"""
+
+import math
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+__all__ = [
+    "ENABLED", "sphere_point", "choice_index", "in_unit_cube",
+    "in_unit_cube_masked", "reflect", "ball_point", "line_point"
+]
+
+# Whether the kernels are used. The pure python versions of
+# the kernels are slower than the numpy code they replace, therefore
+# by default they are only used if numba is available
+ENABLED = numba is not None
+
+
+def _jit(func):
+    """ Compile the function if numba is available """
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+@_jit
+def sphere_point(z, r):
+    """
+    Return the point uniformly distributed within the unit n-sphere
+    given the n-vector `z` of standard normal variates and the uniform
+    variate `r`
+    """
+    n = z.shape[0]
+    norm2 = 0.
+    for i in range(n):
+        norm2 += z[i] * z[i]
+    fac = r**(1. / n) / math.sqrt(norm2)
+    ret = np.empty(n)
+    for i in range(n):
+        ret[i] = z[i] * fac
+    return ret
+
+
+@_jit
+def choice_index(pb, xr):
+    """
+    Return the index selected with the probability `pb` given the
+    uniform variate `xr`
+    """
+    n = pb.shape[0]
+    csum = 0.
+    for i in range(n):
+        csum += pb[i]
+        if csum >= xr:
+            return i
+    return n - 1
+
+
+@_jit
+def in_unit_cube(u):
+    """ Check whether `u` is strictly inside the unit cube """
+    for i in range(u.shape[0]):
+        if not (u[i] > 0 and u[i] < 1):
+            return False
+    return True
+
+
+@_jit
+def in_unit_cube_masked(u, nonbounded):
+    """
+    Check whether `u` is inside the unit cube, allowing the dimensions
+    where `nonbounded` is False to exceed the cube by 0.5
+    """
+    for i in range(u.shape[0]):
+        if nonbounded[i]:
+            if not (u[i] > 0 and u[i] < 1):
+                return False
+        elif not (u[i] > -0.5 and u[i] < 1.5):
+            return False
+    return True
+
+
+@_jit
+def reflect(u):
+    """ Reflect the values of `u` into [0, 1] in place """
+    for i in range(u.shape[0]):
+        if u[i] % 2 < 1:
+            u[i] = u[i] % 1
+        else:
+            u[i] = 1 - u[i] % 1
+    return u
+
+
+@_jit
+def ball_point(u, axes, dr, scale, u_non_cluster, periodic, reflective,
+               nonbounded):
+    """
+    Return the point proposed within the ellipsoid with `axes` around `u`
+    given the point `dr` within the unit sphere and the uniform variates
+    `u_non_cluster` for the non-clustered dimensions together with the
+    flag whether the point is inside the unit cube.
+    The `periodic` and `reflective` are (possibly empty) arrays of
+    indices and `nonbounded` is the boolean mask.
+    """
+    n = u.shape[0]
+    n_cluster = axes.shape[0]
+    u_prop = np.empty(n)
+    for i in range(n_cluster):
+        du = 0.
+        for j in range(n_cluster):
+            du += axes[i, j] * dr[j]
+        u_prop[i] = u[i] + scale * du
+    for i in range(n_cluster, n):
+        u_prop[i] = u_non_cluster[i - n_cluster]
+    for i in periodic:
+        u_prop[i] = u_prop[i] % 1
+    for i in reflective:
+        if u_prop[i] % 2 < 1:
+            u_prop[i] = u_prop[i] % 1
+        else:
+            u_prop[i] = 1 - u_prop[i] % 1
+    return u_prop, in_unit_cube_masked(u_prop, nonbounded)
+
+
+@_jit
+def line_point(u, direction, x, nonbounded):
+    """
+    Return the point `u + x * direction` together with the flag
+    whether it is inside the unit cube
+    (see :func:`in_unit_cube_masked`)
+    """
+    n = u.shape[0]
+    u_new = np.empty(n)
+    for i in range(n):
+        u_new[i] = u[i] + x * direction[i]
+    return u_new, in_unit_cube_masked(u_new, nonbounded)
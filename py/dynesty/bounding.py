@@ -31,6 +31,7 @@ from scipy import linalg as lalg
 from scipy.special import logsumexp, gammaln
 from scipy.cluster.vq import kmeans2
 from .utils import unitcheck, get_seed_sequence, get_random_generator
+from . import _kernels
 
 __all__ = [
     "UnitCube", "Ellipsoid", "MultiEllipsoid", "RadFriends", "SupFriends",
@@ -1193,6 +1194,8 @@ def randsphere(n, rstate=None):
     """Draw a point uniformly within an `n`-dimensional unit sphere."""
 
     z = rstate.standard_normal(size=n)  # initial n-dim vector
+    if _kernels.ENABLED:
+        return _kernels.sphere_point(z, rstate.random())
     # notice I use random () instead of uniform
     # and standard_norm instead of normal as those are faster
     # as this is a time-critical function
@@ -1206,6 +1209,8 @@ def rand_choice(pb, rstate):
     Return an index of a point selected with the probability pb
     The pb must sum to 1
     """
+    if _kernels.ENABLED:
+        return _kernels.choice_index(np.asarray(pb), rstate.random())
     p1 = np.cumsum(pb)
     # random is faster than uniform
     xr = rstate.random()
@@ -15,6 +15,11 @@ import sys
 import warnings
 import math
 import copy
+import asyncio
+import functools
+import queue
+import threading
+import concurrent.futures as cf
 from enum import Enum
 import numpy as np
 from scipy.special import logsumexp
@@ -22,10 +27,11 @@ from .nestedsamplers import (UnitCubeSampler, SingleEllipsoidSampler,
                              MultiEllipsoidSampler, RadFriendsSampler,
                              SupFriendsSampler)
 from .results import Results
-from .utils import (get_seed_sequence, get_print_func, _kld_error,
-                    compute_integrals, IteratorResult, IteratorResultShort,
-                    get_enlarge_bootstrap, RunRecord, get_neff_from_logwt,
-                    DelayTimer, save_sampler, restore_sampler, _LOWL_VAL)
+from .utils import (get_seed_sequence, get_random_generator, get_print_func,
+                    _realizations_logz, compute_integrals, IteratorResult,
+                    IteratorResultShort, get_enlarge_bootstrap, RunRecord,
+                    get_neff_from_logwt, DelayTimer, save_sampler,
+                    restore_sampler, _combined_logvol, _LOWL_VAL)
 
 __all__ = [
     "DynamicSampler",
@@ -33,6 +39,10 @@ __all__ = [
     "stopping_function",
 ]
 
+# The number of realizations of the run computed in one task when
+# the stopping function uses a pool
+_MC_CHUNKSIZE = 25
+
 _SAMPLERS = {
     'none': UnitCubeSampler,
     'single': SingleEllipsoidSampler,
@@ -189,7 +199,7 @@ def _get_update_interval_ratio(update_interval, sample, bound, ndim, nlive,
     if update_interval is None:
         if sample == 'unif':
             update_interval_frac = 1.5
-        elif sample == 'rwalk':
+        elif sample in ['rwalk', 'hmc']:
             update_interval_frac = 0.15 * walks
         elif sample == 'slice':
             update_interval_frac = 0.9 * ndim * slices
@@ -238,8 +248,9 @@ def stopping_function(results,
 
     Estimates of the mean and standard deviation are computed using `n_mc`
     realizations of the input using a provided `'error'` keyword (either
-    `'jitter'` or `'resample'`, which call related functions :meth:`jitter_run`
-    and :meth:`resample_run` in :mod:`dynesty.utils`, respectively.
+    `'jitter'` or `'resample'`, which call related functions
+    :meth:`jitter_run_batch` and :meth:`resample_run_batch` in
+    :mod:`dynesty.utils`, respectively.
 
     Returns the boolean `stop <= 1`. If `True`, the :class:`DynamicSampler`
     will stop adding new samples to our results.
@@ -314,13 +325,17 @@ def stopping_function(results,
 
     if n_mc > 1:
         # Compute realizations of ln(evidence) and the KL divergence.
-        rlist = [results for i in range(n_mc)]
-        error_list = [error for i in range(n_mc)]
-        approx_list = [approx for i in range(n_mc)]
-        seeds = get_seed_sequence(rstate, n_mc)
-        args = zip(rlist, error_list, approx_list, seeds)
-        outputs = list(M(_kld_error, args))
-        lnz_arr = np.array([res[1].logz[-1] for res in outputs])
+        # The realizations are computed in batches, with a single batch
+        # if we are not using a pool
+        if M is map:
+            nchunk = 1
+        else:
+            nchunk = (n_mc + _MC_CHUNKSIZE - 1) // _MC_CHUNKSIZE
+        nreal = [len(_) for _ in np.array_split(np.arange(n_mc), nchunk)]
+        seeds = get_seed_sequence(rstate, nchunk)
+        args = [(results, error, approx, nreal[i], seeds[i])
+                for i in range(nchunk)]
+        lnz_arr = np.concatenate(list(M(_realizations_logz, args)))
         # Evidence stopping value.
         lnz_std = np.std(lnz_arr)
     else:
@@ -430,12 +445,18 @@ def _initialize_live_points(live_points,
 
             # simulate nlive points by uniform sampling
             cur_live_u = rstate.random(size=(nlive, ndim))
+            # reuse the prior draws from the archive of evaluations
+            # if available. We still draw the random numbers above, so that
+            # the state of the generator does not depend on the archive
+            archive_u = loglikelihood.archive_prior_draws(nlive)
+            cur_live_u[:len(archive_u)] = archive_u
             if use_pool_ptform:
                 cur_live_v = M(prior_transform, np.asarray(cur_live_u))
             else:
                 cur_live_v = map(prior_transform, np.asarray(cur_live_u))
             cur_live_v = np.array(list(cur_live_v))
-            cur_live_logl = loglikelihood.map(np.asarray(cur_live_v))
+            cur_live_logl = loglikelihood.map(np.asarray(cur_live_v),
+                                              upars=cur_live_u)
             if blob:
                 cur_live_blobs = np.array([_.blob for _ in cur_live_logl])
             cur_live_logl = np.array([_.val for _ in cur_live_logl])
@@ -541,7 +562,10 @@ def _configure_batch_sampler(main_sampler,
                              nlive_new,
                              update_interval,
                              logl_bounds=None,
-                             save_bounds=None):
+                             save_bounds=None,
+                             rstate=None,
+                             queue_size=None,
+                             kwargs=None):
     """
     This is a utility method that construct a new internal
     sampler that will sample one batch.
@@ -572,6 +596,18 @@ def _configure_batch_sampler(main_sampler,
     save_bounds: bool
         If true bounds will be preserved
 
+    rstate: `~numpy.random.Generator`, optional
+        The random generator used by the batch. If not provided
+        the generator of the parent sampler is used
+
+    queue_size: int, optional
+        The queue size of the batch. If not provided
+        the queue size of the parent sampler is used
+
+    kwargs: dict, optional
+        The sampling options of the batch. If not provided
+        the (shared) options of the parent sampler are used
+
     Returns
     -------
     batch_sampler: Sampler
@@ -596,14 +632,20 @@ def _configure_batch_sampler(main_sampler,
     # Counters of calls and iterations throughout.
     ncall = 0
     niter = 0
+    if rstate is None:
+        rstate = main_sampler.rstate
+    if queue_size is None:
+        queue_size = main_sampler.queue_size
+    if kwargs is None:
+        kwargs = main_sampler.kwargs
 
     # Grab results from saved run.
-    saved_u = np.array(main_sampler.saved_run['u'])
-    saved_v = np.array(main_sampler.saved_run['v'])
-    saved_logl = np.array(main_sampler.saved_run['logl'])
-    saved_logvol = np.array(main_sampler.saved_run['logvol'])
-    saved_scale = np.array(main_sampler.saved_run['scale'])
-    saved_blobs = np.array(main_sampler.saved_run['blob'])
+    saved_u = np.asarray(main_sampler.saved_run['u'])
+    saved_v = np.asarray(main_sampler.saved_run['v'])
+    saved_logl = np.asarray(main_sampler.saved_run['logl'])
+    saved_logvol = np.asarray(main_sampler.saved_run['logvol'])
+    saved_scale = np.asarray(main_sampler.saved_run['scale'])
+    saved_blobs = np.asarray(main_sampler.saved_run['blob'])
     first_points = []
 
     # This will be a list of first points yielded from
@@ -617,12 +659,12 @@ def _configure_batch_sampler(main_sampler,
         main_sampler.method,
         update_interval,
         main_sampler.first_update,
-        main_sampler.rstate,
-        main_sampler.queue_size,
+        rstate,
+        queue_size,
         main_sampler.pool,
         main_sampler.use_pool,
         ncdim=main_sampler.ncdim,
-        kwargs=main_sampler.kwargs,
+        kwargs=kwargs,
         blob=main_sampler.blob)
     batch_sampler.save_bounds = save_bounds
     batch_sampler.logl_first_update = main_sampler.sampler.logl_first_update
@@ -659,7 +701,7 @@ def _configure_batch_sampler(main_sampler,
              main_sampler.M,
              nlive=nlive_new,
              ndim=main_sampler.ndim,
-             rstate=main_sampler.rstate,
+             rstate=rstate,
              blob=main_sampler.blob,
              use_pool_ptform=main_sampler.use_pool_ptform)
         live_bound = np.zeros(nlive_new, dtype=int)
@@ -742,10 +784,10 @@ def _configure_batch_sampler(main_sampler,
         # uniform
         n_pos_weight = (cur_uniwt > 0).sum()
 
-        subset = main_sampler.rstate.choice(subset0,
-                                            size=min(nlive_new, n_pos_weight),
-                                            p=cur_uniwt,
-                                            replace=False)
+        subset = rstate.choice(subset0,
+                               size=min(nlive_new, n_pos_weight),
+                               p=cur_uniwt,
+                               replace=False)
         # subset will now have indices of selected points from
         # saved_* arrays
         cur_nlive = len(subset)
@@ -840,8 +882,10 @@ def _configure_batch_sampler(main_sampler,
 
     # truncate information in the saver of the internal sampler
     # to make it look like we are just continuing
+    # (the combined run may be stored as arrays, while the batch sampler
+    # appends to lists)
     for k in batch_sampler.saved_run.keys():
-        batch_sampler.saved_run[k] = main_sampler.saved_run[k][:vol_idx]
+        batch_sampler.saved_run[k] = list(main_sampler.saved_run[k][:vol_idx])
 
     batch_sampler.dlv = math.log((nlive_new + 1.) / nlive_new)
 
@@ -851,6 +895,146 @@ def _configure_batch_sampler(main_sampler,
     return batch_sampler, ncall, niter, logl_min, logl_max
 
 
+def _split_logl_bounds(results, logl_bounds, nsplit):
+    """
+    Split the ln(likelihood) range into (up to) `nsplit` disjoint
+    consecutive ranges covering equal intervals in ln(prior volume)
+    of the current run, so that batches with the same number of live points
+    need a similar number of iterations to sample each of them.
+
+    Parameters
+    ----------
+    results: Results
+        The results of the current run
+
+    logl_bounds: tuple of size (2,)
+        The ln(likelihood) range that will be split
+
+    nsplit: int
+        The number of ranges
+
+    Returns
+    -------
+    bounds_list: list of tuples of size (2,)
+        The ln(likelihood) bounds of the individual ranges sorted
+        in the order of increasing likelihood
+    """
+    logl_min, logl_max = logl_bounds
+    logl = np.asarray(results['logl'])
+    logvol = np.asarray(results['logvol'])
+    inside = np.nonzero((logl > logl_min) & (logl < logl_max))[0]
+    if nsplit < 2 or len(inside) < 2:
+        return [(logl_min, logl_max)]
+    # the ln(volume) is decreasing along the run
+    edges = np.linspace(logvol[inside[0]], logvol[inside[-1]],
+                        nsplit + 1)[1:-1]
+    pos = np.searchsorted(-logvol[inside], -edges)
+    pos = np.minimum(pos, len(inside) - 1)
+    # the plateaus can produce identical edges
+    cuts = np.unique(logl[inside[pos]]).tolist()
+    edges = [logl_min] + cuts + [logl_max]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _run_concurrent_batch(main_sampler, nlive_new, update_interval,
+                          logl_bounds, rstate, queue_size, dlogz, maxiter,
+                          maxcall, save_bounds, ibatch, output, stop_event):
+    """
+    Sample one of the batches that are run concurrently by
+    :meth:`DynamicSampler.add_batch`. The batch is sampled by its own
+    batch sampler with its own random generator and sampling options,
+    so that it does not modify the parent sampler. The points are put
+    in the `output` queue as `(ibatch, IteratorResultShort)` for printing.
+
+    Returns
+    -------
+    new_run: RunRecord
+        The samples of the batch or None if the sampling was stopped
+    ncall: int
+        The number of likelihood calls
+    logl_min: float
+        actually used logl_min
+    logl_max: float
+        actually used logl_max
+    bound: list
+        The bounds of the batch sampler
+    """
+    (batch_sampler, ncall, niter, logl_min,
+     logl_max) = _configure_batch_sampler(main_sampler,
+                                          nlive_new,
+                                          update_interval=update_interval,
+                                          logl_bounds=logl_bounds,
+                                          save_bounds=save_bounds,
+                                          rstate=rstate,
+                                          queue_size=queue_size,
+                                          kwargs=dict(main_sampler.kwargs))
+    it0 = main_sampler.it
+    for point in batch_sampler.first_points:
+        output.put((ibatch, point))
+    batch_sampler.first_points = []
+    new_run = RunRecord(dynamic=True)
+
+    def save_point(results, nlive):
+        new_run.append(
+            dict(id=results.worst,
+                 u=results.ustar,
+                 v=results.vstar,
+                 logl=results.loglstar,
+                 nc=results.nc,
+                 it=results.worst_it + it0,
+                 blob=results.blob,
+                 n=nlive,
+                 boundidx=results.boundidx,
+                 bounditer=results.bounditer,
+                 scale=batch_sampler.scale,
+                 nsteps=batch_sampler.nsteps))
+        output.put((ibatch,
+                    IteratorResultShort(worst=results.worst,
+                                        ustar=results.ustar,
+                                        vstar=results.vstar,
+                                        loglstar=results.loglstar,
+                                        nc=results.nc,
+                                        worst_it=results.worst_it + it0,
+                                        boundidx=results.boundidx,
+                                        bounditer=results.bounditer,
+                                        eff=100. * niter / ncall)))
+
+    maxiter_left = maxiter - niter
+    maxcall_left = maxcall - ncall
+    iterated_batch = False
+    for results in batch_sampler.sample(dlogz=dlogz,
+                                        logl_max=logl_max,
+                                        maxiter=maxiter_left,
+                                        maxcall=maxcall_left,
+                                        save_samples=True,
+                                        save_bounds=save_bounds):
+        if stop_event.is_set():
+            return None, ncall, logl_min, logl_max, batch_sampler.bound
+        ncall += results.nc
+        niter += 1
+        maxiter_left -= 1
+        maxcall_left -= results.nc
+        iterated_batch = True
+        save_point(results, nlive_new)
+    if iterated_batch and results.loglstar < logl_max and np.isfinite(
+            logl_max) and maxiter_left > 0 and maxcall_left > 0:
+        warnings.warn('Warning. The maximum likelihood not reached '
+                      'in the batch. '
+                      'You may not have enough livepoints and/or have '
+                      'highly multi-modal distribution')
+    if not iterated_batch and len(batch_sampler.saved_run['logl']) == 0:
+        # see DynamicSampler.sample_batch()
+        batch_sampler.saved_run['logvol'] = [-np.inf]
+        batch_sampler.saved_run['logl'] = [logl_min]
+        batch_sampler.saved_run['logz'] = [-1e100]
+        batch_sampler.saved_run['logzvar'] = [0]
+        batch_sampler.saved_run['h'] = [0]
+    for it, results in enumerate(batch_sampler.add_live_points()):
+        niter += 1
+        save_point(results, nlive_new - it)
+    return new_run, ncall, logl_min, logl_max, batch_sampler.bound
+
+
 class DynamicSampler:
     """
     A dynamic nested sampler that allocates live points adaptively during
@@ -876,7 +1060,7 @@ class DynamicSampler:
         propose new live points.
 
     method : {`'unif'`, `'rwalk'`,
-        `'slice'`, `'rslice'`, `'hslice'`}, optional
+        `'slice'`, `'rslice'`, `'hslice'`, `'hmc'`}, optional
         Method used to sample uniformly within the likelihood constraint,
         conditioned on the provided bounds.
 
@@ -977,6 +1161,9 @@ class DynamicSampler:
 
         self.new_logl_min, self.new_logl_max = -np.inf, np.inf
         # logl bounds of latest "new" run
+        self._cache = None
+        # results/ESS of the current state of the run
+        # (see :meth:`_get_cache`)
 
         # these are set-up during sampling
         self.live_u = None
@@ -996,6 +1183,7 @@ class DynamicSampler:
         self.__dict__ = state
         self.pool = None
         self.M = map
+        self._cache = None
 
     def __getstate__(self):
         """Get state information for pickling."""
@@ -1005,6 +1193,8 @@ class DynamicSampler:
         # deal with pool
         del state['pool']  # remove pool
         del state['M']  # remove `pool.map` function hook
+        # the cached results are recomputed on demand
+        state.pop('_cache', None)
 
         return state
 
@@ -1070,18 +1260,44 @@ class DynamicSampler:
         self.base_run = RunRecord(dynamic=True)
         self.new_run = None
         self.new_logl_min, self.new_logl_max = -np.inf, np.inf
+        self._cache = None
+
+    def _get_cache(self):
+        """
+        Return the dictionary caching the quantities derived from the
+        current state of the run (i.e. the results and the effective
+        sample size). The cache is dropped whenever the saved run is
+        replaced (after the baseline run or a merged batch) and it is
+        keyed on the counters of the run to account for the samples
+        appended during the baseline run.
+        """
+        key = (self.it, self.ncall, self.eff, self.batch,
+               len(self.saved_run['logl']), len(self.bound))
+        if self._cache is None or self._cache['key'] != key:
+            self._cache = {'key': key}
+        return self._cache
 
     @property
     def results(self):
         """Saved results from the dynamic nested sampling run. All saved
-        bounds are also returned."""
+        bounds are also returned. The results are computed once for
+        each state of the run, i.e. repeated calls between batches return
+        the same object."""
+        cache = self._get_cache()
+        if 'results' not in cache:
+            cache['results'] = self._compute_results()
+        return cache['results']
+
+    def _compute_results(self):
+        """ Assemble the :class:`Results` from the saved run """
         d = {}
         for k in [
                 'nc', 'v', 'id', 'batch', 'it', 'u', 'n', 'logwt', 'logl',
                 'logvol', 'logz', 'logzvar', 'h', 'batch_nlive',
                 'batch_bounds', 'blob'
         ]:
-            d[k] = np.array(self.saved_run[k])
+            # Results copies the values, so no copy is needed here
+            d[k] = np.asarray(self.saved_run[k])
 
         # Add all saved samples (and ancillary quantities) to the results.
         with warnings.catch_warnings():
@@ -1106,6 +1322,9 @@ class DynamicSampler:
             results.append(
                 ('samples_bound', np.array(self.saved_run['boundidx'])))
             results.append(('scale', np.array(self.saved_run['scale'])))
+            results.append(('nsteps', np.array(self.saved_run['nsteps'])))
+        if getattr(self.loglikelihood, 'timeout', None) is not None:
+            results.append(('ntimeout', self.loglikelihood.ntimeout))
 
         return Results(results)
 
@@ -1118,12 +1337,15 @@ class DynamicSampler:
         `1` if there is only one non-zero element in `wts`.
 
         """
-        logwt = self.saved_run['logwt']
-        if len(logwt) == 0 or np.isneginf(np.max(logwt)):
-            # If there are no saved weights, or its -inf return 0.
-            return 0
-        else:
-            return get_neff_from_logwt(np.asarray(logwt))
+        cache = self._get_cache()
+        if 'n_effective' not in cache:
+            logwt = np.asarray(self.saved_run['logwt'])
+            if len(logwt) == 0 or np.isneginf(np.max(logwt)):
+                # If there are no saved weights, or its -inf return 0.
+                cache['n_effective'] = 0
+            else:
+                cache['n_effective'] = get_neff_from_logwt(logwt)
+        return cache['n_effective']
 
     @property
     def citations(self):
@@ -1358,7 +1580,8 @@ class DynamicSampler:
                             blob=results.blob,
                             boundidx=results.boundidx,
                             bounditer=results.bounditer,
-                            scale=self.sampler.scale)
+                            scale=self.sampler.scale,
+                            nsteps=self.sampler.nsteps)
 
             self.base_run.append(add_info)
             self.saved_run.append(add_info)
@@ -1403,7 +1626,8 @@ class DynamicSampler:
                             n=self.nlive_init - it,
                             boundidx=results.boundidx,
                             bounditer=results.bounditer,
-                            scale=self.sampler.scale)
+                            scale=self.sampler.scale,
+                            nsteps=self.sampler.nsteps)
 
             self.base_run.append(add_info)
             self.saved_run.append(add_info)
@@ -1441,6 +1665,7 @@ class DynamicSampler:
         self.saved_run['batch_nlive'].append(self.nlive_init)  # initial nlive
         self.saved_run['batch_bounds'].append(
             (-np.inf, np.inf))  # initial bounds
+        self._cache = None
 
         self.base = True  # baseline run complete
         self.internal_state = DynamicSamplerStatesEnum.BASE_DONE
@@ -1611,7 +1836,8 @@ class DynamicSampler:
                      n=nlive_new,
                      boundidx=results.boundidx,
                      bounditer=results.bounditer,
-                     scale=batch_sampler.scale)
+                     scale=batch_sampler.scale,
+                     nsteps=batch_sampler.nsteps)
             self.new_run.append(D)
             # Increment relevant counters.
             self.ncall += results.nc
@@ -1660,7 +1886,8 @@ class DynamicSampler:
                      blob=results.blob,
                      boundidx=results.boundidx,
                      bounditer=results.bounditer,
-                     scale=batch_sampler.scale)
+                     scale=batch_sampler.scale,
+                     nsteps=batch_sampler.nsteps)
             self.new_run.append(D)
 
             # Increment relevant counters.
@@ -1693,16 +1920,17 @@ class DynamicSampler:
 
         for k in [
                 'id', 'u', 'v', 'logl', 'nc', 'boundidx', 'it', 'bounditer',
-                'n', 'scale', 'blob', 'logvol'
+                'n', 'scale', 'nsteps', 'blob'
         ]:
-            saved_d[k] = np.array(self.saved_run[k])
+            saved_d[k] = np.asarray(self.saved_run[k])
             new_d[k] = np.array(self.new_run[k])
 
-        saved_d['batch'] = np.array(self.saved_run['batch'])
+        saved_d['batch'] = np.asarray(self.saved_run['batch'])
         nsaved = len(saved_d['n'])
 
         new_d['id'] = new_d['id'] + max(saved_d['id']) + 1
-        nnew = len(new_d['n'])
+        new_d['batch'] = np.zeros(len(new_d['n']),
+                                  dtype=saved_d['batch'].dtype) + self.batch + 1
         llmin, llmax = self.new_logl_min, self.new_logl_max
 
         old_batch_bounds = self.saved_run['batch_bounds']
@@ -1711,104 +1939,46 @@ class DynamicSampler:
         del self.saved_run
         self.saved_run = RunRecord(dynamic=True)
 
-        # Start our counters at the beginning of each set of dead points.
-        idx_saved, idx_new = 0, 0  # start of our dead points
-        logl_s, logl_n = saved_d['logl'][idx_saved], new_d['logl'][idx_new]
-        nlive_s, nlive_n = saved_d['n'][idx_saved], new_d['n'][idx_new]
-
-        # Iteratively walk through both set of samples to simulate
-        # a combined run.
-        ntot = nsaved + nnew
-        for _ in range(ntot):
-            if logl_s > self.new_logl_min:
-                # If our saved samples are past the lower log-likelihood
-                # bound, both runs are now "active" and should be used.
-                nlive = nlive_s + nlive_n
-            else:
-                # If instead our collection of dead points are below
-                # the bound, just use our collection of saved samples.
-                nlive = nlive_s
-            add_info = {}
-
-            # Increment our position along depending on
-            # which dead point (saved or new) is worse.
-            if logl_s <= logl_n:
-                add_info['batch'] = saved_d['batch'][idx_saved]
-                add_source = saved_d
-                add_idx = int(idx_saved)
-                idx_saved += 1
-            else:
-                add_info['batch'] = self.batch + 1
-                add_source = new_d
-                add_idx = int(idx_new)
-                idx_new += 1
-
-            for k in [
-                    'id', 'u', 'v', 'logl', 'nc', 'boundidx', 'it',
-                    'bounditer', 'scale', 'blob'
-            ]:
-                add_info[k] = add_source[k][add_idx]
-            self.saved_run.append(add_info)
-            self.saved_run['n'].append(nlive)
+        # The order of the combined run. The stable sort places the saved
+        # samples before the new ones with the same logl
+        order = np.argsort(np.concatenate((saved_d['logl'], new_d['logl'])),
+                           kind='stable')
+        from_saved = order < nsaved
+        # The number of saved/new samples preceding each combined sample
+        # tells which samples are next in each run
+        idx_saved = np.cumsum(from_saved) - from_saved
+        idx_new = np.arange(len(order)) - idx_saved
+        # past the end of the run, logl is inf and the number of
+        # live points is zero
+        logl_s = np.append(saved_d['logl'], np.inf)[idx_saved]
+        nlive_s = np.append(saved_d['n'], 0)[idx_saved]
+        nlive_n = np.append(new_d['n'], 0)[idx_new]
+        # Above the lower log-likelihood bound of the new run
+        # both runs are "active"
+        nlive = np.where(logl_s > llmin, nlive_s + nlive_n, nlive_s)
+
+        # The combined run is stored as arrays (nothing is appended to it
+        # any more), so that the following batches do not need to
+        # convert it back and forth
+        for k in [
+                'id', 'u', 'v', 'logl', 'nc', 'boundidx', 'it', 'bounditer',
+                'scale', 'nsteps', 'blob', 'batch'
+        ]:
+            self.saved_run[k] = np.concatenate((saved_d[k], new_d[k]))[order]
+        self.saved_run['n'] = nlive
+        self.saved_run['logvol'] = _combined_logvol(self.saved_run['logl'],
+                                                    nlive,
+                                                    self.sampler.logvol_init)
 
-            # Attempt to step along our samples. If we're out of samples,
-            # set values to defaults.
-            try:
-                logl_s = saved_d['logl'][idx_saved]
-                nlive_s = saved_d['n'][idx_saved]
-            except IndexError:
-                logl_s = np.inf
-                nlive_s = 0
-            try:
-                logl_n = new_d['logl'][idx_new]
-                nlive_n = new_d['n'][idx_new]
-            except IndexError:
-                logl_n = np.inf
-                nlive_n = 0
-
-        plateau_mode = False
-        plateau_counter = 0
-        plateau_logdvol = 0
-        logvol = self.sampler.logvol_init
-        logl_array = np.array(self.saved_run['logl'])
-        nlive_array = np.array(self.saved_run['n'])
-
-        for i, (cur_logl, nlive) in enumerate(zip(logl_array, nlive_array)):
-            # Save the number of live points and expected ln(volume).
-            if (not plateau_mode and i != len(nlive_array) - 1
-                    and logl_array[i] == logl_array[i + 1]):
-                plateau_mask = (logl_array[i:] == cur_logl)
-                nplateau = plateau_mask.sum()
-                if nplateau > 1:
-                    # the number of live points should not change throughout
-                    # the plateau unless we are also merging it with the run
-                    # where the plateau is explored through final points,
-                    # i.e. when the number of live-points decreases.
-                    plateau_counter = nplateau
-                    plateau_logdvol = logvol + np.log(1. / (nlive + 1))
-                    plateau_mode = True
-            if not plateau_mode:
-                logvol -= math.log((nlive + 1.) / nlive)
-            else:
-                logvol = logvol + np.log1p(-np.exp(plateau_logdvol - logvol))
-            self.saved_run['logvol'].append(logvol)
-            if plateau_mode:
-                plateau_counter -= 1
-                if plateau_counter == 0:
-                    plateau_mode = False
         # ensure that we correctly merged
-
         assert self.saved_run['logl'][0] == min(new_d['logl'][0],
                                                 saved_d['logl'][0])
         assert self.saved_run['logl'][-1] == max(new_d['logl'][-1],
                                                  saved_d['logl'][-1])
 
-        new_logwt, new_logz, new_logzvar, new_h = compute_integrals(
-            logl=self.saved_run['logl'], logvol=self.saved_run['logvol'])
-        self.saved_run['logwt'].extend(new_logwt.tolist())
-        self.saved_run['logz'].extend(new_logz.tolist())
-        self.saved_run['logzvar'].extend(new_logzvar.tolist())
-        self.saved_run['h'].extend(new_h.tolist())
+        (self.saved_run['logwt'], self.saved_run['logz'],
+         self.saved_run['logzvar'], self.saved_run['h']) = compute_integrals(
+             logl=self.saved_run['logl'], logvol=self.saved_run['logvol'])
 
         # Reset results.
         self.new_run = None
@@ -1820,6 +1990,7 @@ class DynamicSampler:
         # Saved batch quantities.
         self.saved_run['batch_nlive'] = old_batch_nlive + [(max(new_d['n']))]
         self.saved_run['batch_bounds'] = old_batch_bounds + [((llmin, llmax))]
+        self._cache = None
 
     def run_nested(self,
                    nlive_init=None,
@@ -1846,7 +2017,8 @@ class DynamicSampler:
                    live_points=None,
                    resume=False,
                    checkpoint_file=None,
-                   checkpoint_every=60):
+                   checkpoint_every=60,
+                   nbatch_concurrent=1):
         """
         **The main dynamic nested sampling loop.** After an initial "baseline"
         run using a constant number of live points, dynamically allocates
@@ -1986,6 +2158,14 @@ class DynamicSampler:
         checkpoint_every: float, optional
             The number of seconds between checkpoints that will save
             the internal state of the sampler
+        nbatch_concurrent: int, optional
+            The number of batches planned from each evaluation of the
+            weight function and sampled concurrently over disjoint
+            ln(likelihood) ranges (see :meth:`add_batch`). This helps
+            to keep a large pool busy when the number of live points in
+            the batch is small. Each of the batches counts towards
+            `maxbatch`, while `maxiter_batch` and `maxcall_batch`
+            are shared by the batches sampled together. Default is `1`.
         """
 
         # Check for deprecated options
@@ -2078,7 +2258,8 @@ This is not supported. No sampling was performed""", RuntimeWarning)
                                    nbatch=0,
                                    dlogz=dlogz_init,
                                    logl_max=logl_max_init)
-            for n in range(self.batch, maxbatch):
+            while self.batch < maxbatch:
+                n = self.batch
                 # Update stopping criteria.
                 res = self.results
                 mcall = min(maxcall - ncall, maxcall_batch)
@@ -2113,7 +2294,10 @@ This is not supported. No sampling was performed""", RuntimeWarning)
                                               print_func=print_func,
                                               stop_val=stop_val,
                                               resume=resume,
-                                              checkpoint_file=checkpoint_file)
+                                              checkpoint_file=checkpoint_file,
+                                              nbatch_concurrent=min(
+                                                  nbatch_concurrent,
+                                                  maxbatch - n))
                     if resume:
                         # The assumption here is after the first resume
                         # iteration we will proceed as normal
@@ -2143,6 +2327,17 @@ This is not supported. No sampling was performed""", RuntimeWarning)
                 pbar.close()
             self.loglikelihood.history_save()
 
+    async def run_nested_async(self, *args, **kwargs):
+        """
+        The coroutine version of :meth:`run_nested` taking the same
+        arguments. The sampling is done in a separate thread, so the
+        running event loop is not blocked while waiting for it to finish.
+        It is meant to be used with the :class:`~dynesty.pool.AsyncioPool`.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self.run_nested, *args, **kwargs))
+
     def add_batch(self,
                   nlive=500,
                   dlogz=1e-2,
@@ -2158,7 +2353,8 @@ This is not supported. No sampling was performed""", RuntimeWarning)
                   stop_val=None,
                   resume=False,
                   checkpoint_file=None,
-                  checkpoint_every=None):
+                  checkpoint_every=None,
+                  nbatch_concurrent=1):
         """
         Allocate an additional batch of (nested) samples based on
         the combined set of previous samples using the specified
@@ -2232,6 +2428,19 @@ This is not supported. No sampling was performed""", RuntimeWarning)
             The number of seconds between checkpoints that will save
             the internal state of the sampler. If this is None, we
             we will use the timer created in run_nested()
+        nbatch_concurrent: int, optional
+            The number of batches planned from a single evaluation
+            of the weight function. If larger than one, the
+            ln(likelihood) range is split into (up to) `nbatch_concurrent`
+            disjoint ranges, that are sampled concurrently by separate
+            threads, each with its own batch sampler, random generator and
+            the `queue_size // nbatch_concurrent` share of the pool. The
+            batches are then merged one after another. This requires the
+            `map` of the pool to be thread-safe (which is the case for
+            `multiprocessing` and :class:`dynesty.pool.Pool` pools).
+            The limits `maxiter` and `maxcall` are split
+            between the batches and the checkpoints are only saved after all
+            the batches are merged. Default is `1`.
         """
 
         # Initialize values.
@@ -2249,8 +2458,30 @@ This is not supported. No sampling was performed""", RuntimeWarning)
         if mode == 'manual' and logl_bounds is None:
             raise RuntimeError(
                 "logl_bounds need to be specified for manual mode")
+        if nbatch_concurrent < 1:
+            raise ValueError('nbatch_concurrent must be at least 1')
         if mode == 'auto' or mode == 'weight':
             logl_bounds = wt_function(res, wt_kwargs)
+        if resume and self.batch_sampler is None:
+            # there is no interrupted batch to resume
+            resume = False
+        if nbatch_concurrent > 1 and not resume:
+            if logl_bounds is None:
+                logl_bounds = (-np.inf, np.inf)
+            bounds_list = _split_logl_bounds(res, logl_bounds,
+                                             nbatch_concurrent)
+            return self._add_concurrent_batches(
+                bounds_list,
+                nlive=nlive,
+                dlogz=dlogz,
+                maxiter=maxiter,
+                maxcall=maxcall,
+                save_bounds=save_bounds,
+                print_progress=print_progress,
+                print_func=print_func,
+                stop_val=stop_val,
+                checkpoint_file=checkpoint_file,
+                checkpoint_every=checkpoint_every)
         # this is just for printing
         if logl_bounds is None:
             logl_min, logl_max = -np.inf, np.inf
@@ -2343,3 +2574,140 @@ This is not supported. No sampling was performed""", RuntimeWarning)
             raise RuntimeError(
                 'add_batch called with no leftover function calls'
                 'or iterations')
+
+    def _add_concurrent_batches(self,
+                                bounds_list,
+                                nlive=500,
+                                dlogz=1e-2,
+                                maxiter=None,
+                                maxcall=None,
+                                save_bounds=True,
+                                print_progress=True,
+                                print_func=None,
+                                stop_val=None,
+                                checkpoint_file=None,
+                                checkpoint_every=None):
+        """
+        Sample the batches over the ln(likelihood) ranges `bounds_list`
+        concurrently and merge them into the run. This is used by
+        :meth:`add_batch` if `nbatch_concurrent > 1`.
+        The arguments are the same as for :meth:`add_batch`.
+
+        Returns
+        -------
+        ncall: int
+            The total number of likelihood calls
+        niter: int
+            The total number of iterations
+        logl_bounds: tuple of size (2,)
+            The ln(likelihood) range spanned by all the batches
+        results: IteratorResult
+            The last sample
+        """
+        maxcall = maxcall or sys.maxsize
+        maxiter = maxiter or sys.maxsize
+        stop_val = stop_val or np.nan
+        if maxcall <= 0 or maxiter <= 0:
+            raise RuntimeError(
+                'add_batch called with no leftover function calls'
+                'or iterations')
+        nbatch = len(bounds_list)
+        res = self.results
+        logz, logzvar = res['logz'][-1], res['logzerr'][-1]**2
+        update_interval = self.__get_update_interval(None, nlive)
+        queue_size = max(self.queue_size // nbatch, 1)
+        rstates = [
+            get_random_generator(_)
+            for _ in get_seed_sequence(self.rstate, nbatch)
+        ]
+        ncall, niter = self.ncall, self.it - 1
+        output = queue.Queue()
+        stop_event = threading.Event()
+        self.internal_state = DynamicSamplerStatesEnum.INBATCH
+        pbar, print_func = get_print_func(print_func, print_progress)
+        results = None
+        try:
+            with cf.ThreadPoolExecutor(max_workers=nbatch) as executor:
+                futures = [
+                    executor.submit(_run_concurrent_batch,
+                                    self,
+                                    nlive,
+                                    update_interval,
+                                    bounds_list[i],
+                                    rstates[i],
+                                    queue_size,
+                                    dlogz,
+                                    max(maxiter // nbatch, 1),
+                                    max(maxcall // nbatch, 1),
+                                    save_bounds,
+                                    i,
+                                    output,
+                                    stop_event) for i in range(nbatch)
+                ]
+                try:
+                    while True:
+                        try:
+                            ibatch, cur_results = output.get(timeout=0.1)
+                        except queue.Empty:
+                            if any(_.done() and _.exception() is not None
+                                   for _ in futures):
+                                stop_event.set()
+                            # the points are put in the queue before the
+                            # batch finishes
+                            if (all(_.done() for _ in futures)
+                                    and output.empty()):
+                                break
+                            continue
+                        ncall += cur_results.nc
+                        niter += 1
+                        results = IteratorResult(
+                            worst=cur_results.worst,
+                            ustar=cur_results.ustar,
+                            vstar=cur_results.vstar,
+                            loglstar=cur_results.loglstar,
+                            blob=None,
+                            logvol=np.nan,
+                            logwt=np.nan,
+                            logz=logz,
+                            logzvar=logzvar,
+                            h=np.nan,
+                            nc=cur_results.nc,
+                            worst_it=cur_results.worst_it,
+                            boundidx=cur_results.boundidx,
+                            bounditer=cur_results.bounditer,
+                            eff=cur_results.eff,
+                            delta_logz=np.nan)
+                        if print_progress:
+                            print_func(results,
+                                       niter,
+                                       ncall,
+                                       nbatch=self.batch + ibatch + 1,
+                                       stop_val=stop_val,
+                                       logl_min=bounds_list[ibatch][0],
+                                       logl_max=bounds_list[ibatch][1])
+                except BaseException:
+                    stop_event.set()
+                    raise
+                batches = [_.result() for _ in futures]
+        finally:
+            if pbar is not None:
+                pbar.close()
+            self.loglikelihood.history_save()
+
+        # Merge the batches one after another
+        for new_run, batch_ncall, logl_min, logl_max, bound in batches:
+            self.new_run = new_run
+            self.new_logl_min, self.new_logl_max = logl_min, logl_max
+            self.ncall += batch_ncall
+            self.it += len(new_run['id'])
+            self.bound = bound
+            self.combine_runs()
+        self.eff = 100. * self.it / self.ncall
+        self.internal_state = DynamicSamplerStatesEnum.BATCH_DONE
+        if checkpoint_file is not None and (
+                checkpoint_every is not None
+                or self.checkpoint_timer.is_time()):
+            # if we are run externally, we save after each set of batches
+            self.save(checkpoint_file)
+        logl_bounds = (batches[0][2], batches[-1][3])
+        return self.ncall, self.it - 1, logl_bounds, results
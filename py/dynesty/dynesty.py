@@ -7,18 +7,26 @@ provides access to the two main sampler "super-classes" via
 
 """
 
+import os
 import sys
 import warnings
 import traceback
+import pickle
 import numpy as np
 
 from .nestedsamplers import _SAMPLING, SuperSampler
 from .dynamicsampler import (DynamicSampler, _get_update_interval_ratio,
                              _SAMPLERS, _initialize_live_points)
-from .utils import (LogLikelihood, get_random_generator, get_enlarge_bootstrap,
-                    get_nonbounded)
+from .utils import (LogLikelihood, SlowFastFunction, get_blocks,
+                    get_random_generator, get_enlarge_bootstrap,
+                    get_nonbounded, get_seed_sequence, merge_runs,
+                    _EvaluationTimeout, _save_pickle)
+from ._version import __version__ as DYNESTY_VERSION
 
-__all__ = ["NestedSampler", "DynamicNestedSampler", "_function_wrapper"]
+__all__ = [
+    "NestedSampler", "DynamicNestedSampler", "run_ensemble",
+    "_function_wrapper"
+]
 
 
 def _get_citations(nested_type, bound, sampler):
@@ -97,7 +105,13 @@ def _get_citations(nested_type, bound, sampler):
          ("Skilling (2012)", "aip.scitation.org/doi/abs/10.1063/1.3703630"),
          ("Feroz & Skilling (2013)",
           "ui.adsabs.harvard.edu/abs/2013AIPC.1553..106F"),
-         ("Speagle (2020)", "ui.adsabs.harvard.edu/abs/2020MNRAS.493.3132S")]
+         ("Speagle (2020)", "ui.adsabs.harvard.edu/abs/2020MNRAS.493.3132S")],
+        'hmc':
+        [("Betancourt (2011)",
+          "ui.adsabs.harvard.edu/abs/2011AIPC.1305..165B"),
+         ("Skilling (2012)", "aip.scitation.org/doi/abs/10.1063/1.3703630"),
+         ("Feroz & Skilling (2013)",
+          "ui.adsabs.harvard.edu/abs/2013AIPC.1553..106F")]
     }
 
     def reflist_tostring(x):
@@ -182,7 +196,7 @@ def _get_walks_slices(walks0, slices0, sample, ndim):
     elif sample == 'slice':
         slices = 3
         # we don't add dimensions, since we loop over them
-    elif sample == 'rwalk':
+    elif sample in ['rwalk', 'hmc']:
         # this is technically incorrect a we need to add ndim **2
         walks = 20 + ndim
     slices = slices0 or slices
@@ -190,8 +204,8 @@ def _get_walks_slices(walks0, slices0, sample, ndim):
     if sample in ['hslice', 'rslice', 'slice'] and walks0 is not None:
         warnings.warn('Specifying walks option while using slice sampler'
                       ' does not make sense')
-    elif sample in ['rwalk'] and slices0 is not None:
-        warnings.warn('Specifying slice option while using rwalk sampler'
+    elif sample in ['rwalk', 'hmc'] and slices0 is not None:
+        warnings.warn(f'Specifying slice option while using {sample} sampler'
                       ' does not make sense')
     return walks, slices
 
@@ -222,6 +236,26 @@ def _parse_pool_queue(pool, queue_size):
     return M, queue_size
 
 
+def _check_blocks(blocks, slow_function, sample, ndim, ncdim, vectorized):
+    """
+    Verify that the parameter blocks and the slow function
+    can be used with the other sampler options
+    """
+    if blocks is not None:
+        if not callable(sample) and sample not in ['rwalk', 'slice', 'rslice']:
+            raise ValueError(
+                f'Parameter blocks are unsupported for {sample} sampling')
+        if ncdim != ndim:
+            raise ValueError('ncdim is unsupported with parameter blocks')
+    if slow_function is not None:
+        if blocks is None or len(blocks) < 2:
+            raise ValueError('The slow_function requires at least two '
+                             'parameter blocks')
+        if vectorized:
+            raise ValueError('The slow_function is unsupported for '
+                             'vectorized likelihoods')
+
+
 def _check_first_update(first_update):
     """
     Verify that the first_update dictionary is valid
@@ -277,7 +311,7 @@ optional
             `'multi'`.
 
         sample : {`'auto'`, `'unif'`, `'rwalk'`, `'slice'`, `'rslice'`,
-            `'hslice'`, callable}, optional
+            `'hslice'`, `'hmc'`, callable}, optional
             Method used to sample uniformly within the likelihood constraint,
             conditioned on the provided bounds. Unique methods available are:
             uniform sampling within the bounds(`'unif'`),
@@ -285,7 +319,9 @@ optional
             multivariate slice sampling along preferred orientations
             (`'slice'`),
             "random" slice sampling along all orientations (`'rslice'`),
-            "Hamiltonian" slices along random trajectories (`'hslice'`), and
+            "Hamiltonian" slices along random trajectories (`'hslice'`),
+            constrained Hamiltonian Monte Carlo trajectories that reflect
+            off the likelihood boundary using the `gradient` (`'hmc'`), and
             any callable function which follows the pattern of the sample
             methods
             defined in dynesty.sampling.
@@ -321,7 +357,7 @@ optional
             call. Larger update intervals larger can be more efficient
             when the likelihood function is quick to evaluate. Default behavior
             is to target a roughly constant change in prior volume, with
-            `1.5` for `'unif'`, `0.15 * walks` for `'rwalk'`.
+            `1.5` for `'unif'`, `0.15 * walks` for `'rwalk'` and `'hmc'`.
             `0.9 * ndim * slices` for `'slice'`, `2.0 * slices` for `'rslice'`,
             and `25.0 * slices` for `'hslice'`.
 
@@ -394,6 +430,7 @@ optional
             If provided, this will be used when computing reflections
             when sampling with `'hslice'`. If not provided, gradients are
             approximated numerically using 2-sided differencing.
+            The gradient is required when sampling with `'hmc'`.
 
         grad_args : iterable, optional
             Additional arguments that can be passed to `gradient`.
@@ -429,6 +466,8 @@ optional
         walks : int, optional
             For the `'rwalk'` sampling option, the minimum number of steps
             (minimum 2) before proposing a new live point. Default is `25`.
+            For the `'hmc'` sampling option, the initial number of leapfrog
+            steps in a trajectory (it is adapted during the run).
 
         facc : float, optional
             The target acceptance fraction for the `'rwalk'` sampling option.
@@ -444,13 +483,26 @@ optional
 
         fmove : float, optional
             The target fraction of samples that are proposed along a trajectory
-            (i.e. not reflecting) for the `'hslice'` sampling option.
+            (i.e. not reflecting) for the `'hslice'` and `'hmc'` sampling
+            options.
             Default is `0.9`.
 
         max_move : int, optional
             The maximum number of timesteps allowed for `'hslice'`
             per proposal forwards and backwards in time. Default is `100`.
 
+        adaptive_steps : bool, optional
+            If True, the number of `walks` for `'rwalk'` or `slices` for the
+            `'slice'`, `'rslice'` and `'hslice'` sampling options is adapted
+            during the run. The value is chosen as the smallest number of
+            steps that decorrelates the new live points from the
+            points they were started from, estimated from their
+            displacements. The `walks` or `slices` values are then
+            used as starting values and the number of steps is not allowed
+            to exceed ten times that. The number of steps used at each
+            iteration is stored in the `nsteps` field of the results.
+            Default is `False`.
+
         update_func : function, optional
             Any callable function which takes in a `blob` and `scale`
             as input and returns a modification to the internal `scale` as
@@ -475,6 +527,85 @@ optional
             stored as part of the chain. That blob can contain auxiliary
             information computed inside the likelihood function.
 
+        vectorized: bool, optional
+            The default value is False. If it is true, the log-likelihood
+            function is expected to accept a 2-D array of parameters with
+            shape (npoints, ndim) and return the 1-D array of npoints
+            log-likelihood values (or a tuple of log-likelihood and blob
+            arrays if `blob` is true). Batches of points
+            (i.e. the initial live points, or the trajectory points and
+            the numerical gradients for `'hslice'`) are then evaluated in
+            a single call rather than through the pool.
+
+        blocks: list of lists of ints, optional
+            The partition of the parameters into blocks, i.e.
+            [[0, 1, 2], [3, 4]]. If provided, the `'rwalk'`, `'slice'`
+            and `'rslice'` samplers perform each walk/slice as a cycle
+            of updates of one block of parameters at a time (conditional
+            on the values of the other parameters). Default is `None`.
+
+        block_costs: list of floats, optional
+            The relative computational costs of changing the parameters
+            of each of the `blocks`. Within a cycle the most expensive block
+            is updated once and a block that is K times cheaper is
+            updated round(K) times (the so called oversampling of
+            the fast parameters). Default is equal costs.
+
+        slow_function: function, optional
+            The function of the parameter vector returning the expensive
+            intermediate result that only depends on the parameters outside
+            of the cheapest (the fastest) block. If provided, the
+            log-likelihood is called as `loglikelihood(x, intermediate,
+            *logl_args, **logl_kwargs)` and the intermediate result
+            is reused for points sharing the values of the slow
+            parameters, i.e. during the fast block updates. Note that this
+            requires the prior transform to not mix the fast and slow
+            parameters. Default is `None`.
+
+        surrogate: bool, optional
+            If True, the proposals of the `'rwalk'` sampler are first
+            pre-screened using the cheap surrogate model of the likelihood
+            (the k nearest neighbours among the live and recent dead points,
+            refitted at every bound update), so that most of the proposals
+            that are likely to fall below the likelihood threshold are
+            rejected without evaluating the likelihood. The delayed
+            acceptance correction (Christen & Fox 2005) is applied to the
+            proposals that pass the pre-screening, so the
+            random walk still samples exactly the prior within the
+            likelihood constraint. Default is `False`.
+
+        warm_start: str, optional
+            The name of the HDF5 file with the history of likelihood
+            evaluations saved by a previous run with `save_history=True`
+            (it can be the same as `history_filename` of this run).
+            The saved evaluations are then reused, i.e. the saved prior
+            draws are used as the initial live points and the
+            log-likelihood is not recomputed for the points with exactly
+            the same parameters as the saved ones. This allows a rerun
+            (i.e. with a different `nlive`, or an interrupted run without
+            a checkpoint rerun with the same random state) to skip the
+            evaluations that were already done. The lookup is only done in
+            the main process, so with a pool it only applies to the
+            initial live points. The prior transform and the
+            likelihood must be the same as in the previous run.
+            Default is `None`.
+
+        logl_timeout: float, optional
+            If specified, the log-likelihood calls taking longer than
+            `logl_timeout` seconds are abandoned and treated as
+            returning `-inf`, i.e. the corresponding points are rejected,
+            so that occasional hanging evaluations (i.e. due to a
+            non-converging solver) do not stall the sampling. The number of
+            the abandoned calls is stored in the `ntimeout` field of the
+            results. The timeout relies on the SIGALRM signal, so it is
+            only enforced on Unix-like systems when the likelihood is
+            evaluated in the main thread of a process (i.e. without a
+            pool or with a multiprocessing pool, but not with a pool of
+            threads), and a call of compiled code is only interrupted when
+            it returns to python. Note that rejecting the points with
+            slow evaluations biases the results if those occupy a
+            significant fraction of the posterior. Default is `None`.
+
         npdim : int
             This option is deprecated and should not be used
     """
@@ -482,6 +613,22 @@ optional
     static_docstring = f"""
         Initializes and returns a sampler object for Static Nested Sampling.
 {common}
+        nreplace : int, optional
+            The number of live points with the lowest log-likelihoods
+            replaced at each iteration of the sampler (the "kill-k" parallel
+            nested sampling). All of them are replaced by the new points
+            sampled within the constraint given by the highest log-likelihood
+            of the replaced points, so that the new points can be sampled
+            in parallel in one batch. The prior volumes of the replaced points
+            are the expected volumes of the corresponding order statistics
+            (i.e. as for the final set of live points), so the result is
+            equivalent to a run with the number of live points
+            decreasing from `nlive` to `nlive - nreplace + 1`
+            during each iteration. The `samples_n` field of the results
+            then contains the number of live points for each sample.
+            It is best used with `queue_size` equal to `nreplace` (and the
+            size of the pool). Default is `1`.
+
         Returns
         -------
         sampler : sampler from :mod:`~dynesty.nestedsamplers`
@@ -547,7 +694,16 @@ class NestedSampler(SuperSampler):
                 ncdim=None,
                 blob=False,
                 save_history=False,
-                history_filename=None):
+                history_filename=None,
+                adaptive_steps=False,
+                vectorized=False,
+                blocks=None,
+                block_costs=None,
+                slow_function=None,
+                surrogate=False,
+                warm_start=None,
+                logl_timeout=None,
+                nreplace=1):
 
         # Prior dimensions.
         if npdim is not None:
@@ -570,8 +726,10 @@ functioning and will be removed in further releases""", DeprecationWarning)
 
         walks, slices = _get_walks_slices(walks, slices, sample, ndim)
 
-        if ncdim != ndim and sample in ['slice', 'hslice', 'rslice']:
-            raise ValueError('ncdim unsupported for slice sampling')
+        if ncdim != ndim and sample in ['slice', 'hslice', 'rslice', 'hmc']:
+            raise ValueError(f'ncdim unsupported for {sample} sampling')
+        if sample == 'hmc' and gradient is None:
+            raise ValueError('The hmc sampler requires the gradient')
 
         # Custom sampling function.
         if sample not in _SAMPLING and not callable(sample):
@@ -637,6 +795,23 @@ functioning and will be removed in further releases""", DeprecationWarning)
             kwargs['fmove'] = fmove
         if max_move is not None:
             kwargs['max_move'] = max_move
+        kwargs['adaptive_steps'] = adaptive_steps
+        kwargs['vectorized'] = vectorized
+
+        # Parameter blocks.
+        blocks, block_oversample = get_blocks(ndim, blocks, block_costs)
+        _check_blocks(blocks, slow_function, sample, ndim, ncdim, vectorized)
+        kwargs['blocks'] = blocks
+        kwargs['block_oversample'] = block_oversample
+        if surrogate and sample != 'rwalk':
+            raise ValueError('The surrogate pre-screening is only supported '
+                             'for rwalk sampling')
+        kwargs['surrogate'] = surrogate
+        if not 1 <= nreplace < nlive:
+            raise ValueError('The number of live points replaced at each '
+                             'iteration must be at least one and smaller '
+                             'than the number of live points')
+        kwargs['nreplace'] = nreplace
 
         update_interval_ratio = _get_update_interval_ratio(
             update_interval, sample, bound, ndim, nlive, slices, walks)
@@ -657,6 +832,14 @@ functioning and will be removed in further releases""", DeprecationWarning)
             pool_logl = pool
         else:
             pool_logl = None
+        if slow_function is not None:
+            # the slow part is recomputed only if the parameters
+            # outside of the fastest block change
+            loglikelihood = SlowFastFunction(
+                loglikelihood,
+                _function_wrapper(slow_function, [], {},
+                                  name='slow_function'),
+                np.concatenate(blocks[:-1]))
         loglike = LogLikelihood(_function_wrapper(loglikelihood,
                                                   logl_args,
                                                   logl_kwargs,
@@ -666,7 +849,10 @@ functioning and will be removed in further releases""", DeprecationWarning)
                                 blob=blob,
                                 history_filename=history_filename
                                 or 'dynesty_logl_history.h5',
-                                pool=pool_logl)
+                                pool=pool_logl,
+                                vectorized=vectorized,
+                                archive_filename=warm_start,
+                                timeout=logl_timeout)
 
         # Add in gradient.
         if gradient is not None:
@@ -754,7 +940,15 @@ class DynamicNestedSampler(DynamicSampler):
                  ncdim=None,
                  blob=False,
                  save_history=False,
-                 history_filename=None):
+                 history_filename=None,
+                 adaptive_steps=False,
+                 vectorized=False,
+                 blocks=None,
+                 block_costs=None,
+                 slow_function=None,
+                 surrogate=False,
+                 warm_start=None,
+                 logl_timeout=None):
 
         # Prior dimensions.
         if npdim is not None:
@@ -778,8 +972,10 @@ functioning and will be removed in further releases""", DeprecationWarning)
 
         walks, slices = _get_walks_slices(walks, slices, sample, ndim)
 
-        if ncdim != ndim and sample in ['slice', 'hslice', 'rslice']:
-            raise ValueError('ncdim unsupported for slice sampling')
+        if ncdim != ndim and sample in ['slice', 'hslice', 'rslice', 'hmc']:
+            raise ValueError(f'ncdim unsupported for {sample} sampling')
+        if sample == 'hmc' and gradient is None:
+            raise ValueError('The hmc sampler requires the gradient')
 
         update_interval_ratio = _get_update_interval_ratio(
             update_interval, sample, bound, ndim, nlive, slices, walks)
@@ -843,6 +1039,18 @@ functioning and will be removed in further releases""", DeprecationWarning)
             kwargs['fmove'] = fmove
         if max_move is not None:
             kwargs['max_move'] = max_move
+        kwargs['adaptive_steps'] = adaptive_steps
+        kwargs['vectorized'] = vectorized
+
+        # Parameter blocks.
+        blocks, block_oversample = get_blocks(ndim, blocks, block_costs)
+        _check_blocks(blocks, slow_function, sample, ndim, ncdim, vectorized)
+        kwargs['blocks'] = blocks
+        kwargs['block_oversample'] = block_oversample
+        if surrogate and sample != 'rwalk':
+            raise ValueError('The surrogate pre-screening is only supported '
+                             'for rwalk sampling')
+        kwargs['surrogate'] = surrogate
 
         # Set up parallel (or serial) evaluation.
         queue_size = _parse_pool_queue(pool, queue_size)[1]
@@ -859,6 +1067,14 @@ functioning and will be removed in further releases""", DeprecationWarning)
             pool_logl = pool
         else:
             pool_logl = None
+        if slow_function is not None:
+            # the slow part is recomputed only if the parameters
+            # outside of the fastest block change
+            loglikelihood = SlowFastFunction(
+                loglikelihood,
+                _function_wrapper(slow_function, [], {},
+                                  name='slow_function'),
+                np.concatenate(blocks[:-1]))
         loglike = LogLikelihood(_function_wrapper(loglikelihood,
                                                   logl_args,
                                                   logl_kwargs,
@@ -868,7 +1084,10 @@ functioning and will be removed in further releases""", DeprecationWarning)
                                 history_filename=history_filename
                                 or 'dynesty_logl_history.h5',
                                 save=save_history,
-                                blob=blob)
+                                blob=blob,
+                                vectorized=vectorized,
+                                archive_filename=warm_start,
+                                timeout=logl_timeout)
 
         # Add in gradient.
         if gradient is not None:
@@ -911,6 +1130,9 @@ class _function_wrapper:
             # This comes at performance cost, but it's worthwhile
             # as it may lead to hard to diagnose weird behaviour
             return self.func(np.asarray(x).copy(), *self.args, **self.kwargs)
+        except _EvaluationTimeout:
+            # the call was interrupted because of the timeout
+            raise
         except:  # noqa
             print(f"Exception while calling {self.name} function:")
             print("  params:", x)
@@ -919,3 +1141,169 @@ class _function_wrapper:
             print("  exception:")
             traceback.print_exc()
             raise
+
+
+def _run_ensemble_member(args):
+    """
+    Perform one run of the ensemble (see run_ensemble)
+    and return its results
+    """
+    (loglikelihood, prior_transform, ndim, seed, dynamic, sampler_kwargs,
+     run_kwargs) = args
+    rstate = np.random.Generator(np.random.PCG64(seed))
+    if dynamic:
+        cls = DynamicNestedSampler
+    else:
+        cls = NestedSampler
+    sampler = cls(loglikelihood,
+                  prior_transform,
+                  ndim,
+                  rstate=rstate,
+                  **sampler_kwargs)
+    sampler.run_nested(print_progress=False, **run_kwargs)
+    return sampler.results
+
+
+def run_ensemble(loglikelihood,
+                 prior_transform,
+                 ndim,
+                 nruns,
+                 dynamic=False,
+                 sampler_kwargs=None,
+                 run_kwargs=None,
+                 pool=None,
+                 queue_size=None,
+                 rstate=None,
+                 logzerr_target=None,
+                 checkpoint_file=None,
+                 resume=False,
+                 print_progress=True):
+    """
+    Perform an ensemble of independent nested sampling runs and merge
+    them into a single run (see :func:`~dynesty.utils.merge_runs`).
+    The runs are distributed across the pool, one run per worker, and each
+    run uses its own random generator seeded from `rstate`, so the results
+    do not depend on the pool.
+
+    Parameters
+    ----------
+    loglikelihood : function
+        Function returning ln(likelihood) given parameters as a 1-d
+        `~numpy` array of length `ndim`.
+
+    prior_transform : function
+        Function translating a unit cube to the parameter space according
+        to the prior.
+
+    ndim : int
+        Number of parameters returned by `prior_transform` and accepted by
+        `loglikelihood`.
+
+    nruns : int
+        The maximum number of runs.
+
+    dynamic : bool, optional
+        If True, the runs are performed by the
+        :class:`DynamicNestedSampler`, otherwise by the
+        :class:`NestedSampler`. Default is `False`.
+
+    sampler_kwargs : dict, optional
+        The keyword arguments of the sampler (except `rstate`).
+        The functions and the arguments must be picklable if the pool
+        is used. Note that the `pool` here should not be specified as
+        the runs are performed inside the workers of the pool.
+
+    run_kwargs : dict, optional
+        The keyword arguments of the `run_nested()` of the sampler.
+
+    pool : user-provided pool, optional
+        The pool used to perform the runs in parallel.
+
+    queue_size : int, optional
+        The number of runs performed at the same time. If no value is
+        passed, this defaults to `pool.size` (if a `pool` has been provided)
+        and `1` otherwise.
+
+    rstate : `~numpy.random.Generator`, optional
+        `~numpy.random.Generator` instance used to seed the runs.
+
+    logzerr_target : float, optional
+        If specified, no more runs are started once the standard error of
+        the mean of the ln(evidence) of the finished runs
+        (i.e. their standard deviation divided by the square root of the
+        number of runs) is below this value. At least two runs are always
+        performed.
+
+    checkpoint_file : string, optional
+        If specified, the results of the finished runs are saved in this
+        file after each batch of runs.
+
+    resume : bool, optional
+        If True and the `checkpoint_file` exists, the runs saved
+        in it are reused and only the remaining runs are performed.
+
+    print_progress : bool, optional
+        Whether to print the number of the finished runs and the current
+        ln(evidence) estimate after each batch of runs. Default is `True`.
+
+    Returns
+    -------
+    results : :class:`~dynesty.results.Results` instance
+        The merged run.
+
+    runs : list of :class:`~dynesty.results.Results` instances
+        The results of the individual runs.
+
+    """
+    if sampler_kwargs is None:
+        sampler_kwargs = {}
+    if run_kwargs is None:
+        run_kwargs = {}
+    if rstate is None:
+        rstate = get_random_generator()
+    finished = {}
+    if resume and checkpoint_file is not None and os.path.exists(
+            checkpoint_file):
+        with open(checkpoint_file, 'rb') as fp:
+            D = pickle.load(fp)
+        if D['version'] != DYNESTY_VERSION:
+            warnings.warn('The dynesty version in the checkpoint file does '
+                          'not match the current dynesty version')
+        seeds = D['seeds']
+        finished = D['runs']
+        if len(seeds) != nruns:
+            raise ValueError('The number of runs does not match the number '
+                             'of runs in the checkpoint file')
+    else:
+        seeds = get_seed_sequence(rstate, nruns)
+    mapper, nbatch = _parse_pool_queue(pool, queue_size)
+    todo = [i for i in range(nruns) if i not in finished]
+    while len(todo) > 0:
+        if logzerr_target is not None and len(finished) > 1:
+            logzs = [_['logz'][-1] for _ in finished.values()]
+            if np.std(logzs, ddof=1) / np.sqrt(len(logzs)) < logzerr_target:
+                break
+        cur_todo, todo = todo[:nbatch], todo[nbatch:]
+        args = [(loglikelihood, prior_transform, ndim, seeds[i], dynamic,
+                 sampler_kwargs, run_kwargs) for i in cur_todo]
+        for i, res in zip(cur_todo, mapper(_run_ensemble_member, args)):
+            finished[i] = res
+        if checkpoint_file is not None:
+            _save_pickle(
+                dict(runs=finished, seeds=seeds, version=DYNESTY_VERSION),
+                checkpoint_file)
+        if print_progress:
+            logzs = [_['logz'][-1] for _ in finished.values()]
+            logzerr = (np.std(logzs, ddof=1) /
+                       np.sqrt(len(logzs)) if len(logzs) > 1 else np.inf)
+            sys.stderr.write(f'runs: {len(finished)}/{nruns} | '
+                             f'logz: {np.mean(logzs):6.3f} +/- '
+                             f'{logzerr:6.3f}\n')
+    # the runs are merged in the order of their indices, so the
+    # result does not depend on the order in which they finished
+    runs = [finished[i] for i in sorted(finished)]
+    if len(runs) > 1:
+        results = merge_runs(runs, print_progress=print_progress)
+    else:
+        results = runs[0]
+    return results, runs
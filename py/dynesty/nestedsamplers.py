@@ -31,7 +31,7 @@ from .sampler import Sampler
 from .bounding import (UnitCube, Ellipsoid, MultiEllipsoid, RadFriends,
                        SupFriends, rand_choice)
 from .sampling import (sample_unif, sample_rwalk, sample_slice, sample_rslice,
-                       sample_hslice)
+                       sample_hslice, sample_hmc)
 from .utils import (unitcheck, get_enlarge_bootstrap, save_sampler,
                     restore_sampler)
 
@@ -45,9 +45,18 @@ _SAMPLING = {
     'rwalk': sample_rwalk,
     'slice': sample_slice,
     'rslice': sample_rslice,
-    'hslice': sample_hslice
+    'hslice': sample_hslice,
+    'hmc': sample_hmc
 }
 
+# Parameters of the adaptive number of walks/slices.
+# The target residual correlation between the starting and final points
+_NSTEPS_TARGET_CORR = 0.1
+# The minimum number of proposals used to estimate the correlation
+_NSTEPS_MIN_POINTS = 25
+# The maximum number of steps relative to the initial value
+_NSTEPS_MAX_MULT = 10
+
 
 class SuperSampler(Sampler):
     """
@@ -92,6 +101,7 @@ class SuperSampler(Sampler):
             'slice': self.propose_live,
             'rslice': self.propose_live,
             'hslice': self.propose_live,
+            'hmc': self.propose_live,
             'user-defined': self.propose_live
         }
 
@@ -110,6 +120,7 @@ class SuperSampler(Sampler):
             'slice': self.update_slice,
             'rslice': self.update_slice,
             'hslice': self.update_hslice,
+            'hmc': self.update_hmc,
             'user-defined': self.update_user
         }
         # Initialize other arguments.
@@ -144,6 +155,16 @@ class SuperSampler(Sampler):
         self.max_move = self.kwargs.get('max_move', 100)
         self.slice_history = {'ncontract': 0, 'nexpand': 0}
         self.hslice_history = {'nmove': 0, 'nreflect': 0, 'ncontract': 0}
+        self.hmc_history = {'nmove': 0, 'nreflect': 0, 'nreverse': 0}
+
+        # Initialize adaptive number of steps.
+        self.adaptive_steps = self.kwargs.get('adaptive_steps', False)
+        self.steps_history = {'npoints': 0, 'disp2': 0.}
+        if self.adaptive_steps or method == 'hmc':
+            # the kwargs are shared with the batch samplers of the dynamic
+            # sampler, so the limit is set from the user provided value
+            self.kwargs.setdefault('nsteps_max',
+                                   _NSTEPS_MAX_MULT * max(self.nsteps, 1))
 
     def propose_unif(self, *args):
         pass
@@ -170,9 +191,14 @@ class SuperSampler(Sampler):
         hist = self.rwalk_history
         hist['naccept'] += blob['accept']
         hist['nreject'] += blob['reject']
+        if self.adaptive_steps:
+            self.update_nsteps(blob, 'walks', 2, update=update)
         if not update:
             return
         accept, reject = hist['naccept'], hist['nreject']
+        if accept + reject == 0:
+            # all the proposals were rejected by the surrogate
+            return
         facc = (1. * accept) / (accept + reject)
         # Here we are now trying to solve the Eqn
         # f0 = F(s) where F is the function
@@ -190,6 +216,49 @@ class SuperSampler(Sampler):
         hist['naccept'] = 0
         hist['nreject'] = 0
 
+    def update_nsteps(self, blob, key, nmin, update=True):
+        """Update the number of steps (`walks` or `slices`) used to
+        evolve a live point based on how decorrelated the evolved points
+        are from their starting points.
+        If the chain is fully decorrelated, the mean squared displacement
+        between the starting and final point is twice the variance of the
+        live points. Assuming the correlation decays as rho^nsteps,
+        the deficit from that value gives us the correlation length of
+        the chain, which is then used to pick the smallest number of steps
+        that brings the residual correlation below `_NSTEPS_TARGET_CORR`.
+        The steps are accumulated over several proposals and the number of
+        steps is changed by at most a factor of two per update.
+        """
+        hist = self.steps_history
+        disp = blob['displacement'][:self.ncdim]
+        periodic = self.kwargs.get('periodic')
+        if periodic is not None:
+            # displacement across the periodic boundary
+            disp = disp.copy()
+            disp[periodic] -= np.round(disp[periodic])
+        hist['disp2'] = hist['disp2'] + disp**2
+        hist['npoints'] += 1
+        if not update or hist['npoints'] < max(self.nlive // 2,
+                                               _NSTEPS_MIN_POINTS):
+            return
+        var = np.var(self.live_u[:, :self.ncdim], axis=0)
+        good = var > 0
+        if not good.any():
+            return
+        ratio = np.mean(hist['disp2'][good] / hist['npoints'] /
+                        (2 * var[good]))
+        # residual correlation between the starting and final points
+        corr = np.clip(1 - ratio, _NSTEPS_TARGET_CORR**2, 1 - 1e-3)
+        nsteps = self.kwargs[key]
+        mult = math.log(_NSTEPS_TARGET_CORR) / math.log(corr)
+        mult = np.clip(mult, 0.5, 2)
+        self.kwargs[key] = int(
+            np.clip(math.ceil(nsteps * mult), nmin,
+                    max(self.kwargs['nsteps_max'], nmin)))
+        setattr(self, key, self.kwargs[key])
+        hist['npoints'] = 0
+        hist['disp2'] = 0.
+
     def update_slice(self, blob, update=True):
         """Update the slice proposal scale based on the relative
         size of the slices compared to our initial guess.
@@ -209,6 +278,8 @@ class SuperSampler(Sampler):
         hist['ncontract'] += blob['ncontract']
         if blob['expansion_warning_set']:
             self.kwargs['slice_doubling'] = True
+        if self.adaptive_steps:
+            self.update_nsteps(blob, 'slices', 1, update=update)
         if not update:
             return
         nexpand, ncontract = max(hist['nexpand'], 1), hist['ncontract']
@@ -232,6 +303,8 @@ class SuperSampler(Sampler):
         hist['nmove'] += blob['nmove']
         hist['nreflect'] += blob['nreflect']
         hist['ncontract'] += blob.get('ncontract', 0)
+        if self.adaptive_steps:
+            self.update_nsteps(blob, 'slices', 1, update=update)
         if not update:
             return
         nmove, nreflect = hist['nmove'], hist['nreflect']
@@ -243,6 +316,32 @@ class SuperSampler(Sampler):
         hist['nreflect'] = 0
         hist['ncontract'] = 0
 
+    def update_hmc(self, blob, update=True):
+        """Update the constrained Hamiltonian Monte Carlo step size based
+        on the fraction of steps that moved along a straight line rather
+        than reflecting off the boundary or reversing.
+        The trajectory length (the number of steps `walks`) is adapted
+        based on how decorrelated the final points are from the starting
+        points (see `update_nsteps`).
+        The keyword update determines if we are just accumulating the number
+        of steps or actually adjusting the scale
+        """
+        hist = self.hmc_history
+        hist['nmove'] += blob['nmove']
+        hist['nreflect'] += blob['nreflect']
+        hist['nreverse'] += blob['nreverse']
+        self.update_nsteps(blob, 'walks', 2, update=update)
+        if not update:
+            return
+        nmove, nreflect = hist['nmove'], hist['nreflect']
+        nreverse = hist['nreverse']
+        fmove = (1. * nmove) / max(nmove + nreflect + nreverse, 1)
+        norm = max(self.fmove, 1. - self.fmove)
+        self.scale *= math.exp((fmove - self.fmove) / norm)
+        hist['nmove'] = 0
+        hist['nreflect'] = 0
+        hist['nreverse'] = 0
+
     def update_user(self, blob, update=True):
         """Update the scale based on the user-defined update function."""
 
@@ -304,7 +403,7 @@ class UnitCubeSampler(SuperSampler):
         `live_logl`, the associated loglikelihoods.
 
     method : {`'unif'`, `'rwalk'`,
-        `'slice'`, `'rslice'`, `'hslice'`}, optional
+        `'slice'`, `'rslice'`, `'hslice'`, `'hmc'`}, optional
         Method used to sample uniformly within the likelihood constraint,
         conditioned on the provided bounds.
 
@@ -429,7 +528,7 @@ class SingleEllipsoidSampler(SuperSampler):
         `live_logl`, the associated loglikelihoods.
 
     method : {`'unif'`, `'rwalk'`, `'slice'`, `'rslice'`,
-        `'hslice'`}, optional
+        `'hslice'`, `'hmc'`}, optional
         Method used to sample uniformly within the likelihood constraint,
         conditioned on the provided bounds.
 
@@ -561,7 +660,7 @@ class SingleEllipsoidSampler(SuperSampler):
         u = self.live_u[i, :]
 
         # Choose axes.
-        if self.sampling in ['rwalk', 'rslice', 'slice']:
+        if self.sampling in ['rwalk', 'rslice', 'slice', 'hmc']:
             ax = self.ell.axes
         else:
             ax = np.identity(self.ncdim)
@@ -593,7 +692,7 @@ class MultiEllipsoidSampler(SuperSampler):
         `live_logl`, the associated loglikelihoods.
 
     method : {`'unif'`, `'rwalk'`, `'slice'`, `'rslice'`,
-        `'hslice'`}, optional
+        `'hslice'`, `'hmc'`}, optional
         Method used to sample uniformly within the likelihood constraint,
         conditioned on the provided bounds.
 
@@ -737,7 +836,7 @@ class MultiEllipsoidSampler(SuperSampler):
             if not self.mell.contains(u_fit):
                 raise RuntimeError('Update of the ellipsoid failed')
 
-        if self.sampling in ['rwalk', 'rslice', 'slice']:
+        if self.sampling in ['rwalk', 'rslice', 'slice', 'hmc']:
             # Pick a random ellipsoid (not necessarily the one that contains u)
             # This a crucial step as we must choose a random ellipsoid,
             # rather than the ellipsoid to which this point belongs.
@@ -778,7 +877,7 @@ class RadFriendsSampler(SuperSampler):
         `live_logl`, the associated loglikelihoods.
 
     method : {`'unif'`, `'rwalk'`, `'slice'`, `'rslice'`,
-        `'hslice'`}, optional
+        `'hslice'`, `'hmc'`}, optional
         Method used to sample uniformly within the likelihood constraint,
         conditioned on the provided bounds.
 
@@ -932,7 +1031,7 @@ class SupFriendsSampler(SuperSampler):
         `live_logl`, the associated loglikelihoods.
 
     method : {`'unif'`, `'rwalk'`,
-        `'slice'`, `'rslice'`, `'hslice'`}, optional
+        `'slice'`, `'rslice'`, `'hslice'`, `'hmc'`}, optional
         Method used to sample uniformly within the likelihood constraint,
         conditioned on the provided bounds.
 
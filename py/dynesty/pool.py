@@ -6,9 +6,22 @@ with dynesty since it avoids some overhead that one would get
 with standard pool
 """
 
+import os
+import math
+import time
+import threading
+import warnings
+import asyncio
+import inspect
 import multiprocessing as mp
+import multiprocessing.pool as mp_pool
+import multiprocessing.connection as mp_connection
+import concurrent.futures as cf
 
-__all__ = ['Pool']
+__all__ = [
+    'Pool', 'ThreadPool', 'FaultTolerantPool', 'SocketPool', 'socket_worker',
+    'AsyncioPool'
+]
 
 
 class FunctionCache:
@@ -48,6 +61,69 @@ def prior_transform_cache(x, *args, **kwargs):
                                          **kwargs)
 
 
+def _await_result(ret):
+    """
+    If the function returned an awaitable (i.e. it is a coroutine function),
+    run it in the event loop of the AsyncioPool and return the result
+    """
+    if inspect.isawaitable(ret):
+        return asyncio.run_coroutine_threadsafe(ret,
+                                                FunctionCache.loop).result()
+    return ret
+
+
+def _run_event_loop(loop):
+    """
+    Run the event loop until it is stopped
+    """
+    loop.run_forever()
+    loop.close()
+
+
+def loglike_async_cache(x, *args, **kwargs):
+    """
+    Likelihood function call for the AsyncioPool
+    """
+    return _await_result(loglike_cache(x, *args, **kwargs))
+
+
+def prior_transform_async_cache(x, *args, **kwargs):
+    """
+    Prior transform call for the AsyncioPool
+    """
+    return _await_result(prior_transform_cache(x, *args, **kwargs))
+
+
+# The number of chunks of tasks sent to each worker of the SocketPool
+# ahead of time, so that the next chunk is transferred while the current one
+# is being computed
+_SOCKET_PREFETCH = 2
+
+
+
+class _TimedFunction:
+    """
+    The wrapper of the function that also returns the time spent in the
+    function and the identifier of the worker that ran it
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self, x):
+        t0 = time.perf_counter()
+        ret = self.func(x)
+        t1 = time.perf_counter()
+        return ret, t1 - t0, (os.getpid(), threading.get_ident())
+
+
+def _run_chunk(func, chunk):
+    """
+    Apply the function to the chunk of tasks
+    """
+    return [func(_) for _ in chunk]
+
+
 class Pool:
     """
     The multiprocessing pool wrapper class
@@ -76,6 +152,14 @@ class Pool:
     ptform_kwargs: tuple(optional)
         The optional keywords to be added to the prior transform
         function call
+    chunksize: int(optional)
+        The number of tasks sent to a worker at once by map().
+        If None (default), it is chosen automatically based on the
+        measured time of the function calls, its variation and the overhead
+        of sending the tasks to the workers, so that fast functions are
+        sent in large chunks, while slow ones or the ones with very
+        different times of the calls are sent in small chunks
+        (see _get_chunksize()).
 
     Attributes
     ----------
@@ -84,6 +168,14 @@ class Pool:
     prior_transform: function
         Function transforming from a unit cube to the parameter
         space of interest according to the prior
+    stats: dict
+        The statistics of the map() calls, i.e. the number of calls
+        and tasks, the total wall-clock time, the total time spent in
+        the function by the workers, the overhead (the wall-clock time
+        not spent in the function by the busiest worker), the average time
+        per task and the coefficient of variation of the task times, the
+        overhead per chunk, the last chunk size and the utilization (the
+        fraction of the wall-clock time the workers spent in the function).
 
     Examples
     --------
@@ -119,7 +211,8 @@ class Pool:
                  logl_args=None,
                  logl_kwargs=None,
                  ptform_args=None,
-                 ptform_kwargs=None):
+                 ptform_kwargs=None,
+                 chunksize=None):
         self.logl_args = logl_args
         self.logl_kwargs = logl_kwargs
         self.ptform_args = ptform_args
@@ -130,14 +223,33 @@ class Pool:
         self.loglike = loglike_cache
         self.prior_transform = prior_transform_cache
         self.pool = None
+        self.chunksize = chunksize
+        self.stats = dict(ncalls=0,
+                          ntasks=0,
+                          wall_time=0.,
+                          task_time=0.,
+                          task_time2=0.,
+                          overhead_time=0.,
+                          nchunks=0,
+                          time_per_task=None,
+                          task_time_cv=0.,
+                          utilization=None,
+                          overhead_per_chunk=None,
+                          chunksize=None)
+
+    def _initargs(self):
+        """
+        Return the arguments of the initializer
+        """
+        return (self.loglike_0, self.prior_transform_0, self.logl_args
+                or (), self.logl_kwargs or {}, self.ptform_args
+                or (), self.ptform_kwargs or {})
 
     def __enter__(self):
         """
         Activate the pool
         """
-        initargs = (self.loglike_0, self.prior_transform_0, self.logl_args
-                    or (), self.logl_kwargs or {}, self.ptform_args
-                    or (), self.ptform_kwargs or {})
+        initargs = self._initargs()
         self.pool = mp.Pool(self.njobs, initializer, initargs)
         initializer(*initargs)
         # running this in the master process seems to help with
@@ -153,7 +265,77 @@ class Pool:
         F: function
         x: iterable
         """
-        return self.pool.map(F, x)
+        x = list(x)
+        ntasks = len(x)
+        if ntasks == 0:
+            return []
+        chunksize = self.chunksize or self._get_chunksize(ntasks)
+        t0 = time.perf_counter()
+        out = self.pool.map(_TimedFunction(F), x, chunksize=chunksize)
+        wall_time = time.perf_counter() - t0
+        self._update_stats(out, wall_time, chunksize)
+        return [_[0] for _ in out]
+
+    def _get_chunksize(self, ntasks):
+        """
+        Choose the chunk size. The chunks are handed out to the workers
+        as they become free, so the large chunks reduce the overhead of
+        sending them, while the small ones reduce the time the workers stay
+        idle waiting for the last chunks to finish, in particular
+        if the times of the tasks vary a lot (i.e. the slice sampling chains
+        of very different length). The wall-clock time is approximately
+        ntasks * (t + o / m) / size + m * t * (1 + cv) / 2,
+        where m is the chunk size, t is the average time per task, cv is
+        the coefficient of variation of the task times and o
+        is the overhead per chunk, and the chunk size minimizing it is
+        chosen. The chunk size is limited to have at least one chunk per
+        worker.
+        """
+        stats = self.stats
+        maxsize = int(math.ceil(ntasks / self.size))
+        if stats['ntasks'] == 0:
+            # the default of multiprocessing.Pool
+            return int(math.ceil(ntasks / (4 * self.size)))
+        if stats['time_per_task'] == 0:
+            return maxsize
+        chunksize = int(
+            round(
+                math.sqrt(2 * ntasks * stats['overhead_per_chunk'] /
+                          (self.size * stats['time_per_task'] *
+                           (1 + stats['task_time_cv'])))))
+        return min(max(chunksize, 1), maxsize)
+
+    def _update_stats(self, out, wall_time, chunksize):
+        """
+        Update the statistics of map() calls given the outputs of the
+        _TimedFunction calls
+        """
+        busy = {}
+        for _, dt, worker in out:
+            nt, t = busy.get(worker, (0, 0.))
+            busy[worker] = (nt + 1, t + dt)
+        # the busiest worker determines the wall-clock time
+        nt_max, t_max = max(busy.values(), key=lambda _: _[1])
+        stats = self.stats
+        stats['ncalls'] += 1
+        stats['ntasks'] += len(out)
+        stats['wall_time'] += wall_time
+        stats['task_time'] += sum(_[1] for _ in out)
+        stats['task_time2'] += sum(_[1]**2 for _ in out)
+        stats['overhead_time'] += max(wall_time - t_max, 0)
+        stats['nchunks'] += int(math.ceil(nt_max / chunksize))
+        stats['time_per_task'] = stats['task_time'] / stats['ntasks']
+        if stats['time_per_task'] > 0:
+            var = max(
+                stats['task_time2'] / stats['ntasks'] -
+                stats['time_per_task']**2, 0)
+            stats['task_time_cv'] = math.sqrt(var) / stats['time_per_task']
+        if stats['wall_time'] > 0:
+            stats['utilization'] = stats['task_time'] / (stats['wall_time'] *
+                                                         self.size)
+        stats['overhead_per_chunk'] = (stats['overhead_time'] /
+                                       stats['nchunks'])
+        stats['chunksize'] = chunksize
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         try:
@@ -181,3 +363,659 @@ class Pool:
 
     def join(self):
         self.pool.join()
+
+
+class ThreadPool(Pool):
+    """
+    The thread pool version of :class:`Pool` with the same interface.
+    All the workers are threads of the same process, so the functions,
+    their arguments and the points do not need to be pickled and sent
+    to other processes, and large read-only data used by the likelihood
+    (i.e. spectra or covariance matrices) is shared by the workers rather
+    than copied to each of them.
+    This is only useful if the likelihood function releases the GIL, i.e.
+    it spends most of the time in BLAS, numexpr or other compiled code,
+    otherwise the threads will not run in parallel.
+    The results do not depend on the scheduling of the tasks between the
+    threads, as each proposal uses its own random number generator seeded
+    by the sampler.
+
+    Parameters
+    ----------
+    njobs: int
+        The number of threads
+    loglike: function
+        ln(likelihood) function. It must be thread-safe.
+    prior_transform: function
+        Function transforming from a unit cube to the parameter
+        space of interest according to the prior. It must be thread-safe.
+    logl_args: tuple(optional)
+        The optional arguments to be added to the likelihood
+        function call.
+    logl_kwargs: tuple(optional)
+        The optional keywords to be added to the likelihood
+        function call
+    ptform_args: tuple(optional)
+        The optional arguments to be added to the prior transform
+        function call
+    ptform_kwargs: tuple(optional)
+        The optional keywords to be added to the prior transform
+        function call
+    chunksize: int(optional)
+        The number of tasks sent to a thread at once by map().
+        If None (default), it is chosen automatically.
+
+    Examples
+    --------
+    It is used in the same way as :class:`Pool`::
+
+        with dynesty.pool.ThreadPool(16, loglike, prior_transform) as pool:
+            dns = DynamicNestedSampler(pool.loglike, pool.prior_transform,
+                                       ndim, pool=pool)
+    """
+
+    def __enter__(self):
+        """
+        Activate the pool
+        """
+        # the threads share the FunctionCache with the main process
+        initializer(*self._initargs())
+        self.pool = mp_pool.ThreadPool(self.njobs)
+        return self
+
+
+class FaultTolerantPool(Pool):
+    """
+    The version of :class:`Pool` that survives the death of the worker
+    processes (i.e. segmentation faults in compiled likelihood code or
+    processes killed by the out-of-memory killer).
+    If a worker dies, the tasks that have not been completed yet are
+    submitted again to a new set of workers initialized with the same
+    functions and arguments. Since every task carries its own
+    random seed, the results are identical to the ones obtained without
+    the failure.
+    The standard :class:`Pool` in this situation may never return from
+    map().
+
+    Parameters
+    ----------
+    njobs: int
+        The number of multiprocessing jobs/processes
+    loglike: function
+        ln(likelihood) function
+    prior_transform: function
+        Function transforming from a unit cube to the parameter
+        space of interest according to the prior
+    logl_args: tuple(optional)
+        The optional arguments to be added to the likelihood
+        function call.
+    logl_kwargs: tuple(optional)
+        The optional keywords to be added to the likelihood
+        function call
+    ptform_args: tuple(optional)
+        The optional arguments to be added to the prior transform
+        function call
+    ptform_kwargs: tuple(optional)
+        The optional keywords to be added to the prior transform
+        function call
+    chunksize: int(optional)
+        The number of tasks sent to a worker at once by map().
+        If None (default), it is chosen automatically.
+    max_retries: int(optional)
+        The maximum number of times the tasks of a single map() call
+        are resubmitted after the failure of a worker. If the workers
+        keep failing after that, RuntimeError is raised. Default is 3.
+
+    Attributes
+    ----------
+    stats: dict
+        In addition to the statistics of :class:`Pool` it contains the
+        total number of the worker failures `nretries` and the number of
+        the tasks that were resubmitted `nresubmitted`.
+
+    Examples
+    --------
+    It is used in the same way as :class:`Pool`::
+
+        with dynesty.pool.FaultTolerantPool(16, loglike,
+                                            prior_transform) as pool:
+            dns = DynamicNestedSampler(pool.loglike, pool.prior_transform,
+                                       ndim, pool=pool)
+    """
+
+    def __init__(self,
+                 njobs,
+                 loglike,
+                 prior_transform,
+                 logl_args=None,
+                 logl_kwargs=None,
+                 ptform_args=None,
+                 ptform_kwargs=None,
+                 chunksize=None,
+                 max_retries=3):
+        super().__init__(njobs,
+                         loglike,
+                         prior_transform,
+                         logl_args=logl_args,
+                         logl_kwargs=logl_kwargs,
+                         ptform_args=ptform_args,
+                         ptform_kwargs=ptform_kwargs,
+                         chunksize=chunksize)
+        self.max_retries = max_retries
+        self.stats.update(nretries=0, nresubmitted=0)
+
+    def _spawn(self):
+        """
+        Start a new set of workers
+        """
+        self.pool = cf.ProcessPoolExecutor(self.njobs,
+                                           mp_context=mp.get_context(),
+                                           initializer=initializer,
+                                           initargs=self._initargs())
+
+    def __enter__(self):
+        """
+        Activate the pool
+        """
+        self._spawn()
+        initializer(*self._initargs())
+        return self
+
+    def map(self, F, x):
+        """ Apply the function F to the list x
+
+        Parameters
+        ==========
+
+        F: function
+        x: iterable
+        """
+        x = list(x)
+        ntasks = len(x)
+        if ntasks == 0:
+            return []
+        chunksize = self.chunksize or self._get_chunksize(ntasks)
+        func = _TimedFunction(F)
+        chunks = {
+            i: x[i:i + chunksize]
+            for i in range(0, ntasks, chunksize)
+        }
+        done = {}
+        nretries = 0
+        t0 = time.perf_counter()
+        while True:
+            futures = {
+                i: self.pool.submit(_run_chunk, func, chunk)
+                for i, chunk in chunks.items() if i not in done
+            }
+            try:
+                for i, fut in futures.items():
+                    done[i] = fut.result()
+                break
+            except cf.process.BrokenProcessPool:
+                # keep the chunks completed before the failure
+                for i, fut in futures.items():
+                    if i not in done and fut.done(
+                    ) and fut.exception() is None:
+                        done[i] = fut.result()
+                nresubmit = sum(
+                    len(chunk) for i, chunk in chunks.items()
+                    if i not in done)
+                nretries += 1
+                self.stats['nretries'] += 1
+                self.stats['nresubmitted'] += nresubmit
+                self.pool.shutdown(wait=True)
+                if nretries > self.max_retries:
+                    self.pool = None
+                    raise RuntimeError(
+                        f'The pool workers failed {nretries} times '
+                        'while evaluating the same tasks')
+                warnings.warn(f'A pool worker died, restarting the workers '
+                              f'and resubmitting {nresubmit} tasks')
+                self._spawn()
+        wall_time = time.perf_counter() - t0
+        out = [_ for i in sorted(done) for _ in done[i]]
+        self._update_stats(out, wall_time, chunksize)
+        return [_[0] for _ in out]
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+        self.pool = None
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+    def close(self):
+        pass
+
+    def join(self):
+        self.pool.shutdown(wait=True)
+
+
+def socket_worker(address, authkey, reconnect=True, retry_delay=1.):
+    """
+    Run the worker of the :class:`SocketPool`. It connects to the pool
+    and evaluates the tasks sent by it until the pool is closed.
+    If the connection is lost (or the pool is not yet running), it keeps
+    trying to connect again every retry_delay seconds.
+    The functions passed to the pool must be importable by the worker.
+
+    Parameters
+    ----------
+    address: tuple
+        The (host, port) address of the pool
+    authkey: bytes
+        The authentication key of the pool
+    reconnect: bool
+        If False, the worker exits after losing the connection to the pool
+        or if the pool is not running.
+    retry_delay: float
+        The delay between the attempts to connect in seconds
+
+    Examples
+    --------
+    The worker on the remote node can be started as::
+
+        import dynesty.pool
+        dynesty.pool.socket_worker(('host', 7000), b'secret')
+    """
+    while True:
+        try:
+            conn = mp_connection.Client(address, authkey=authkey)
+        except OSError:
+            if not reconnect:
+                return
+            time.sleep(retry_delay)
+            continue
+        try:
+            while True:
+                msg = conn.recv()
+                if msg[0] == 'init':
+                    initializer(*msg[1])
+                elif msg[0] == 'task':
+                    _, callid, i, func, chunk = msg
+                    try:
+                        out = ('result', callid, i, _run_chunk(func, chunk))
+                    except Exception as exc:  # noqa
+                        out = ('error', callid, i, exc)
+                    conn.send(out)
+                elif msg[0] == 'stop':
+                    conn.close()
+                    return
+        except (EOFError, OSError):
+            # lost the connection to the pool
+            conn.close()
+            if not reconnect:
+                return
+            time.sleep(retry_delay)
+
+
+class SocketPool(Pool):
+    """
+    The pool whose workers connect to it over TCP, so they can run on
+    different nodes of the cluster. The workers are started separately
+    using :func:`socket_worker` (or by the pool itself on the local
+    machine) and can join or leave the pool at any time. The tasks of the
+    workers that disconnected are sent to the other workers. Like in the
+    :class:`Pool`, the functions and their arguments are sent
+    to each worker only once when it connects. Each worker gets
+    several chunks of tasks in advance, so that the transfer of the
+    next chunk overlaps with the computation of the current one.
+    The results do not depend on the workers that evaluated them.
+
+    Parameters
+    ----------
+    njobs: int
+        The number of workers. It is the size of the pool as seen by the
+        sampler, the actual number of connected workers can differ.
+    loglike: function
+        ln(likelihood) function
+    prior_transform: function
+        Function transforming from a unit cube to the parameter
+        space of interest according to the prior
+    logl_args: tuple(optional)
+        The optional arguments to be added to the likelihood
+        function call.
+    logl_kwargs: tuple(optional)
+        The optional keywords to be added to the likelihood
+        function call
+    ptform_args: tuple(optional)
+        The optional arguments to be added to the prior transform
+        function call
+    ptform_kwargs: tuple(optional)
+        The optional keywords to be added to the prior transform
+        function call
+    chunksize: int(optional)
+        The number of tasks sent to a worker at once by map().
+        If None (default), it is chosen automatically.
+    address: tuple(optional)
+        The (host, port) address the pool listens on. The default is
+        ('localhost', 0), i.e. a free port on the local machine, to accept
+        the workers from other nodes the host must be the address of the
+        node reachable from the other nodes (i.e. '0.0.0.0').
+        The actual address is available in the address attribute.
+    authkey: bytes(optional)
+        The authentication key that the workers must provide. If None,
+        a random key is generated (available in the authkey attribute).
+        Note that the authentication does not encrypt the traffic and the
+        data received from the workers is unpickled, so the
+        pool should only be used within a trusted network.
+    nlocal: int(optional)
+        The number of worker processes started by the pool on the local
+        machine. Default is 0.
+    timeout: float(optional)
+        The maximum time in seconds map() waits for a worker to connect
+        if there are no workers. If None (default), it waits indefinitely.
+
+    Attributes
+    ----------
+    stats: dict
+        In addition to the statistics of :class:`Pool` it contains
+        the number of the tasks `nresubmitted` that were sent again
+        after their worker disconnected.
+
+    Examples
+    --------
+    The pool is used in the same way as :class:`Pool`::
+
+        with dynesty.pool.SocketPool(64, loglike, prior_transform,
+                                     address=('0.0.0.0', 7000),
+                                     authkey=b'secret') as pool:
+            dns = DynamicNestedSampler(pool.loglike, pool.prior_transform,
+                                       ndim, pool=pool)
+
+    while the workers are started on the other nodes with
+    :func:`socket_worker`.
+    """
+
+    def __init__(self,
+                 njobs,
+                 loglike,
+                 prior_transform,
+                 logl_args=None,
+                 logl_kwargs=None,
+                 ptform_args=None,
+                 ptform_kwargs=None,
+                 chunksize=None,
+                 address=('localhost', 0),
+                 authkey=None,
+                 nlocal=0,
+                 timeout=None):
+        super().__init__(njobs,
+                         loglike,
+                         prior_transform,
+                         logl_args=logl_args,
+                         logl_kwargs=logl_kwargs,
+                         ptform_args=ptform_args,
+                         ptform_kwargs=ptform_kwargs,
+                         chunksize=chunksize)
+        self.address = address
+        if authkey is None:
+            authkey = os.urandom(32)
+        self.authkey = authkey
+        self.nlocal = nlocal
+        self.timeout = timeout
+        self.listener = None
+        self.workers = []
+        self.local_workers = []
+        self.stats.update(nresubmitted=0)
+        self._new_workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._callid = 0
+
+    def __enter__(self):
+        """
+        Activate the pool
+        """
+        self.listener = mp_connection.Listener(self.address,
+                                               authkey=self.authkey)
+        self.address = self.listener.address
+        self._closed = False
+        threading.Thread(target=self._accept, daemon=True).start()
+        for i in range(self.nlocal):
+            proc = mp.Process(target=socket_worker,
+                              args=(self.address, self.authkey),
+                              kwargs=dict(reconnect=False),
+                              daemon=True)
+            proc.start()
+            self.local_workers.append(proc)
+        initializer(*self._initargs())
+        return self
+
+    def _accept(self):
+        """
+        Accept the connections of the workers and send them the functions
+        (this is run in a separate thread)
+        """
+        while not self._closed:
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError, mp.AuthenticationError):
+                continue
+            if self._closed:
+                conn.close()
+                break
+            try:
+                conn.send(('init', self._initargs()))
+            except OSError:
+                conn.close()
+                continue
+            with self._lock:
+                self._new_workers.append(conn)
+
+    def _drop_worker(self, conn, inflight, todo):
+        """
+        Remove the disconnected worker and put its chunks back in
+        the list of chunks to do
+        """
+        conn.close()
+        lost = inflight.pop(conn)
+        todo[:0] = [_[0] for _ in lost]
+        self.stats['nresubmitted'] += sum(_[1] for _ in lost)
+        warnings.warn(f'Lost the connection to a pool worker, '
+                      f'{len(lost)} chunks of tasks will be resubmitted')
+
+    def map(self, F, x):
+        """ Apply the function F to the list x
+
+        Parameters
+        ==========
+
+        F: function
+        x: iterable
+        """
+        x = list(x)
+        ntasks = len(x)
+        if ntasks == 0:
+            return []
+        chunksize = self.chunksize or self._get_chunksize(ntasks)
+        func = _TimedFunction(F)
+        chunks = [x[i:i + chunksize] for i in range(0, ntasks, chunksize)]
+        # the results of older calls (i.e. interrupted by an exception)
+        # are ignored
+        self._callid += 1
+        callid = self._callid
+        todo = list(range(len(chunks)))
+        # the chunks in flight (and their lengths) for each worker
+        inflight = {conn: [] for conn in self.workers}
+        done = {}
+        t0 = time.perf_counter()
+        wait_start = None
+        try:
+            while len(done) < len(chunks):
+                with self._lock:
+                    for conn in self._new_workers:
+                        inflight[conn] = []
+                    self._new_workers = []
+                for conn in list(inflight):
+                    while todo and len(inflight[conn]) < _SOCKET_PREFETCH:
+                        i = todo[0]
+                        try:
+                            conn.send(('task', callid, i, func, chunks[i]))
+                        except OSError:
+                            self._drop_worker(conn, inflight, todo)
+                            break
+                        todo.pop(0)
+                        inflight[conn].append((i, len(chunks[i])))
+                if len(inflight) == 0:
+                    if wait_start is None:
+                        wait_start = time.perf_counter()
+                    elif (self.timeout is not None and
+                          time.perf_counter() - wait_start > self.timeout):
+                        raise RuntimeError('No workers connected to the '
+                                           'pool within the timeout')
+                    time.sleep(0.01)
+                    continue
+                wait_start = None
+                for conn in mp_connection.wait(list(inflight), timeout=0.1):
+                    try:
+                        status, cur_callid, i, out = conn.recv()
+                    except (EOFError, OSError):
+                        self._drop_worker(conn, inflight, todo)
+                        continue
+                    if cur_callid != callid:
+                        continue
+                    inflight[conn] = [_ for _ in inflight[conn] if _[0] != i]
+                    if status == 'error':
+                        raise out
+                    done[i] = out
+        finally:
+            self.workers = list(inflight)
+        wall_time = time.perf_counter() - t0
+        out = [_ for i in range(len(chunks)) for _ in done[i]]
+        self._update_stats(out, wall_time, chunksize)
+        return [_[0] for _ in out]
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._closed = True
+        if self.listener is not None:
+            try:
+                # wake up the thread waiting for the connections
+                mp_connection.Client(self.address,
+                                     authkey=self.authkey).close()
+            except:  # noqa
+                pass
+            self.listener.close()
+            self.listener = None
+        with self._lock:
+            conns = self.workers + self._new_workers
+            self.workers = []
+            self._new_workers = []
+        for conn in conns:
+            try:
+                conn.send(('stop', ))
+                conn.close()
+            except:  # noqa
+                pass
+        for proc in self.local_workers:
+            proc.join(5)
+            if proc.is_alive():
+                proc.terminate()
+        self.local_workers = []
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+    def close(self):
+        pass
+
+    def join(self):
+        pass
+
+
+class AsyncioPool(Pool):
+    """
+    The pool for the likelihood functions that are coroutine functions
+    (async def), i.e. the likelihoods that mostly wait for the results from
+    simulation servers or other I/O. All the likelihood calls are run in a
+    single event loop (running in a separate thread), with up to njobs calls
+    in flight at the same time. The sampler itself
+    stays synchronous, each of its proposals (see the queue_size option of
+    the sampler) is evolved in its own thread of the pool that waits for
+    the results of the likelihood calls from the event loop. The results
+    are the same as with any other pool.
+    Both the likelihood and the prior transform can either be normal or
+    coroutine functions.
+
+    Parameters
+    ----------
+    njobs: int
+        The maximum number of proposals evolved (and hence
+        likelihood calls in flight) at the same time
+    loglike: function
+        ln(likelihood) function (can be async)
+    prior_transform: function
+        Function transforming from a unit cube to the parameter
+        space of interest according to the prior (can be async)
+    logl_args: tuple(optional)
+        The optional arguments to be added to the likelihood
+        function call.
+    logl_kwargs: tuple(optional)
+        The optional keywords to be added to the likelihood
+        function call
+    ptform_args: tuple(optional)
+        The optional arguments to be added to the prior transform
+        function call
+    ptform_kwargs: tuple(optional)
+        The optional keywords to be added to the prior transform
+        function call
+    chunksize: int(optional)
+        The number of tasks sent to a thread at once by map().
+        The default is 1, so all the tasks are run concurrently.
+
+    Examples
+    --------
+    It is used in the same way as :class:`Pool`::
+
+        async def loglike(x):
+            return await query_server(x)
+
+        with dynesty.pool.AsyncioPool(100, loglike, prior_transform) as pool:
+            dns = DynamicNestedSampler(pool.loglike, pool.prior_transform,
+                                       ndim, pool=pool)
+            dns.run_nested()
+
+    or from the running event loop using
+    :meth:`~dynesty.sampler.Sampler.run_nested_async`.
+    """
+
+    def __init__(self,
+                 njobs,
+                 loglike,
+                 prior_transform,
+                 logl_args=None,
+                 logl_kwargs=None,
+                 ptform_args=None,
+                 ptform_kwargs=None,
+                 chunksize=1):
+        super().__init__(njobs,
+                         loglike,
+                         prior_transform,
+                         logl_args=logl_args,
+                         logl_kwargs=logl_kwargs,
+                         ptform_args=ptform_args,
+                         ptform_kwargs=ptform_kwargs,
+                         chunksize=chunksize)
+        self.loglike = loglike_async_cache
+        self.prior_transform = prior_transform_async_cache
+        self.loop = None
+
+    def __enter__(self):
+        """
+        Activate the pool
+        """
+        initializer(*self._initargs())
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=_run_event_loop, args=(self.loop, ),
+                         daemon=True).start()
+        FunctionCache.loop = self.loop
+        self.pool = mp_pool.ThreadPool(self.njobs)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        super().__exit__(exc_type, exc_val, exc_tb)
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop = None
+        try:
+            del FunctionCache.loop
+        except:  # noqa
+            pass
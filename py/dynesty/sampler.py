@@ -10,10 +10,12 @@ import sys
 import warnings
 import math
 import copy
+import asyncio
+import functools
 import numpy as np
 from .results import Results, print_fn
 from .bounding import UnitCube
-from .sampling import sample_unif, SamplerArgument
+from .sampling import sample_unif, SamplerArgument, KNNSurrogate
 from .utils import (get_seed_sequence, get_print_func, progress_integration,
                     IteratorResult, RunRecord, get_neff_from_logwt,
                     compute_integrals, DelayTimer, _LOWL_VAL)
@@ -21,6 +23,23 @@ from .utils import (get_seed_sequence, get_print_func, progress_integration,
 __all__ = ["Sampler"]
 
 
+class _TimeoutCounter:
+    """
+    Wrapper of the sampling function that also returns the number of
+    likelihood calls that timed out during the sampling
+    (those are counted by the copy of the likelihood object
+    sent to the worker, so they need to be returned explicitly)
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self, args):
+        ntimeout = args.loglikelihood.ntimeout
+        ret = self.func(args)
+        return ret, args.loglikelihood.ntimeout - ntimeout
+
+
 class Sampler:
     """
     The basic sampler object that performs the actual nested sampling.
@@ -241,9 +260,20 @@ class Sampler:
         if self.save_samples:
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
-                results = [('nlive', self.nlive), ('niter', self.it - 1),
-                           ('ncall', d['nc']), ('eff', self.eff),
-                           ('samples', d['v']), ('blob', d['blob'])]
+                results = [('niter', self.it - 1), ('ncall', d['nc']),
+                           ('eff', self.eff), ('samples', d['v']),
+                           ('blob', d['blob'])]
+                if self.kwargs.get('nreplace', 1) == 1:
+                    results.append(('nlive', self.nlive))
+                else:
+                    # the number of live points varies within each
+                    # batch of replaced points
+                    results.extend([
+                        ('samples_n', np.array(self.saved_run['n'])),
+                        ('samples_batch', np.zeros(len(d['v']), dtype=int)),
+                        ('batch_nlive', np.array([self.nlive])),
+                        ('batch_bounds', np.array([(-np.inf, np.inf)]))
+                    ])
                 for k in ['id', 'it', 'u']:
                     results.append(('samples_' + k, d[k]))
                 for k in ['logwt', 'logl', 'logvol', 'logz']:
@@ -262,6 +292,9 @@ class Sampler:
             results.append(('samples_bound',
                             np.array(self.saved_run['boundidx'], dtype=int)))
             results.append(('scale', np.array(self.saved_run['scale'])))
+            results.append(('nsteps', np.array(self.saved_run['nsteps'])))
+        if getattr(self.loglikelihood, 'timeout', None) is not None:
+            results.append(('ntimeout', self.loglikelihood.ntimeout))
 
         return Results(results)
 
@@ -281,6 +314,21 @@ class Sampler:
         else:
             return get_neff_from_logwt(np.asarray(logwt))
 
+    @property
+    def nsteps(self):
+        """
+        The number of steps (`walks` for `'rwalk'` and `'hmc'` or `slices`
+        for the slice samplers) currently used to evolve a live point.
+        This is zero for sampling methods that do not rely on a number
+        of steps.
+
+        """
+        if self.method in ['rwalk', 'hmc']:
+            return self.kwargs.get('walks', 0)
+        elif self.method in ['slice', 'rslice', 'hslice']:
+            return self.kwargs.get('slices', 0)
+        return 0
+
     @property
     def citations(self):
         """
@@ -325,6 +373,8 @@ class Sampler:
             else:
                 subset = slice(None)
             bound = self.update(subset=subset)
+            if self.kwargs.get('surrogate'):
+                self.update_surrogate()
             if self.save_bounds:
                 self.bound.append(bound)
             self.nbound += 1
@@ -333,6 +383,20 @@ class Sampler:
                 self.unit_cube_sampling = False
                 self.logl_first_update = loglstar
 
+    def update_surrogate(self):
+        """
+        Refit the surrogate model used to pre-screen the proposals
+        to the live points and the most recent dead points.
+        """
+        ndead = min(len(self.saved_run['u']), self.nlive)
+        u = list(self.live_u)
+        logl = list(self.live_logl)
+        if ndead > 0:
+            u.extend(self.saved_run['u'][-ndead:])
+            logl.extend(self.saved_run['logl'][-ndead:])
+        self.kwargs['surrogate_model'] = KNNSurrogate(
+            u, logl, periodic=self.kwargs.get('periodic'))
+
     def _fill_queue(self, loglstar):
         """Sequentially add new live point proposals to the queue."""
 
@@ -394,7 +458,16 @@ class Sampler:
                                 loglikelihood=self.loglikelihood,
                                 rseed=seeds[i],
                                 kwargs=self.kwargs))
-        self.queue = list(mapper(evolve_point, args))
+        if getattr(self.loglikelihood, 'timeout', None) is None:
+            self.queue = list(mapper(evolve_point, args))
+        else:
+            # if the mapper does not copy the likelihood object
+            # the counter is already updated, so we set it rather than
+            # increment
+            ntimeout = self.loglikelihood.ntimeout
+            out = list(mapper(_TimeoutCounter(evolve_point), args))
+            self.queue = [_[0] for _ in out]
+            self.loglikelihood.ntimeout = ntimeout + sum(_[1] for _ in out)
 
     def _get_point_value(self, loglstar):
         """Grab the first live point proposal in the queue."""
@@ -410,6 +483,23 @@ class Sampler:
 
         return u, v, logl, nc, blob
 
+    def _new_points_batch(self, nreplace):
+        """Sample the new points replacing the `nreplace` live points with
+        the lowest log-likelihoods. All of them are sampled within the
+        constraint given by the highest log-likelihood of the replaced
+        points. Returns the list of the new points and the numbers of
+        live points when each of the replaced points is removed
+        (in the order of increasing log-likelihood of the replaced points).
+        """
+
+        logls = np.sort(self.live_logl)
+        # the points with the same logl are either all replaced or not
+        while nreplace > 1 and logls[nreplace - 1] == logls[nreplace]:
+            nreplace -= 1
+        loglstar = logls[nreplace - 1]
+        return [(self._new_point(loglstar), self.nlive - i)
+                for i in range(nreplace)]
+
     def _new_point(self, loglstar):
         """Propose points until a new point that satisfies the log-likelihood
         constraint `loglstar` is found."""
@@ -556,8 +646,10 @@ class Sampler:
                         # it can lead to sum(nc)!=ncall
                         boundidx=boundidx,
                         it=point_it,
+                        n=self.nlive - i,
                         bounditer=bounditer,
                         scale=self.scale,
+                        nsteps=self.nsteps,
                         blob=old_blob))
             self.eff = 100. * (self.it + i) / self.ncall  # efficiency
 
@@ -588,8 +680,8 @@ class Sampler:
             if self.save_samples:
                 for k in [
                         'id', 'u', 'v', 'logl', 'logvol', 'logwt', 'logz',
-                        'logzvar', 'h', 'nc', 'boundidx', 'it', 'bounditer',
-                        'scale', 'blob'
+                        'logzvar', 'h', 'nc', 'boundidx', 'it', 'n',
+                        'bounditer', 'scale', 'nsteps', 'blob'
                 ]:
                     del self.saved_run[k][-self.nlive:]
         else:
@@ -746,6 +838,11 @@ class Sampler:
 
         nplateau = 0
         stop_iterations = False
+        nreplace = self.kwargs.get('nreplace', 1)
+        # The new points (and the numbers of live points) for the
+        # remaining points of the current batch of replaced points
+        # (see nreplace)
+        batch = []
         # The main nested sampling loop.
         for it in range(sys.maxsize):
             delta_logz = np.logaddexp(0,
@@ -797,7 +894,9 @@ class Sampler:
                     ' stopping sampling')
                 stop_iterations = True
 
-            if stop_iterations:
+            # the batch of replaced points is always completed, as only then
+            # the live points are distributed uniformly within the volume
+            if stop_iterations and len(batch) == 0:
                 if not self.save_samples:
                     # If dumping past states, save only the required quantities
                     # TODO I don't quite understand why we do this
@@ -814,7 +913,7 @@ class Sampler:
             worst_it = self.live_it[worst]  # when point was proposed
             boundidx = self.live_bound[worst]  # associated bound index
 
-            if not self.plateau_mode:
+            if not self.plateau_mode and len(batch) == 0:
                 nplateau = (self.live_logl == self.live_logl[worst]).sum()
                 if nplateau > 1:
                     self.plateau_mode = True
@@ -822,8 +921,17 @@ class Sampler:
                     self.plateau_logdvol = np.log(1. /
                                                   (self.nlive + 1)) + logvol
                     # this is log (delta vol)
-
-            if not self.plateau_mode:
+                elif nreplace > 1:
+                    batch = self._new_points_batch(nreplace)
+
+            new_point = None
+            cur_nlive = self.nlive
+            if len(batch) > 0:
+                # The replaced point with the i-th lowest logl has
+                # the expected volume (nlive + 1 - i) / (nlive + 1)
+                new_point, cur_nlive = batch.pop(0)
+                cur_dlv = math.log((cur_nlive + 1.) / cur_nlive)
+            elif not self.plateau_mode:
                 # Expected ln(volume) shrinkage.
                 cur_dlv = self.dlv
             else:
@@ -845,7 +953,9 @@ class Sampler:
             # Sample a new live point from within the likelihood constraint
             # `logl > loglstar` using the bounding distribution and sampling
             # method from our sampler.
-            u, v, logl, nc = self._new_point(loglstar_new)
+            if new_point is None:
+                new_point = self._new_point(loglstar_new)
+            u, v, logl, nc = new_point
             ncall += nc
             self.ncall += nc
             if self.blob:
@@ -877,8 +987,10 @@ class Sampler:
                          h=h,
                          nc=nc,
                          it=worst_it,
+                         n=cur_nlive,
                          bounditer=bounditer,
                          scale=self.scale,
+                         nsteps=self.nsteps,
                          blob=old_blob))
 
             # Update the live point (previously our "worst" point).
@@ -1077,6 +1189,17 @@ class Sampler:
                 pbar.close()
             self.loglikelihood.history_save()
 
+    async def run_nested_async(self, *args, **kwargs):
+        """
+        The coroutine version of :meth:`run_nested` taking the same
+        arguments. The sampling is done in a separate thread, so the
+        running event loop is not blocked while waiting for it to finish.
+        It is meant to be used with the :class:`~dynesty.pool.AsyncioPool`.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self.run_nested, *args, **kwargs))
+
     def add_final_live(self, print_progress=True, print_func=None):
         """
         **A wrapper that executes the loop adding the final live points.**
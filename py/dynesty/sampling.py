@@ -12,15 +12,24 @@ from collections import namedtuple
 import warnings
 import numpy as np
 from numpy import linalg
+from scipy import spatial
 
 from .utils import unitcheck, apply_reflect, get_random_generator
 from .bounding import randsphere
+from . import _kernels
 
 __all__ = [
     "sample_unif", "sample_rwalk", "sample_slice", "sample_rslice",
-    "sample_hslice"
+    "sample_hslice", "sample_hmc"
 ]
 
+# The empty array of indices passed to the kernels
+_EMPTY_INDEX = np.zeros(0, dtype=int)
+
+# The initial number of trajectory points evaluated at once
+# by hslice when the likelihood is vectorized
+_HSLICE_LOOKAHEAD = 4
+
 SamplerArgument = namedtuple('SamplerArgument', [
     'u', 'loglstar', 'axes', 'scale', 'prior_transform', 'loglikelihood',
     'rseed', 'kwargs'
@@ -95,7 +104,11 @@ def sample_unif(args):
 def sample_rwalk(args):
     """
     Return a new live point proposed by random walking away from an
-    existing live point.
+    existing live point. If parameter blocks are provided in `kwargs`,
+    each walk is a cycle of proposals each changing only one block, with
+    the cheap blocks updated several times per cycle. If the surrogate
+    model is provided in `kwargs`, the proposals are pre-screened
+    with it before evaluating the likelihood.
 
     Parameters
     ----------
@@ -211,6 +224,7 @@ def generic_random_walk(u, loglstar, axes, scale, prior_transform,
     n = len(u)
     n_cluster = axes.shape[0]
     walks = kwargs.get('walks', 25)  # number of steps
+    u0 = u  # starting point, used to measure the decorrelation
 
     naccept = 0
     # Total number of accepted points with L>L*
@@ -222,20 +236,49 @@ def generic_random_walk(u, loglstar, axes, scale, prior_transform,
     ncall = 0
     # Total number of Likelihood calls (proposals evaluated)
 
-    # Here we loop for exactly walks iterations.
-    while ncall < walks:
+    nscreen = 0
+    # Total number of proposals rejected by the surrogate
+    # without evaluating the likelihood
+
+    # The surrogate model used for the delayed acceptance.
+    # The first stage accepts the proposal with the probability
+    # min(1, p(u_prop)/p(u)) where p is the surrogate probability of
+    # L>L*. The second stage accepts it if L>L* with the probability
+    # min(1, p(u)/p(u_prop)), which keeps the uniform distribution
+    # within L>L* as the target of the chain (see Christen & Fox 2005)
+    surrogate = kwargs.get('surrogate_model')
+    if surrogate is not None:
+        p_cur = surrogate(u, loglstar)
+
+    if kwargs.get('blocks') is None:
+        schedule = [None] * walks
+    else:
+        # with parameter blocks each walk is a cycle over the blocks
+        schedule = get_block_cycle(axes, kwargs) * walks
+
+    # Here we loop for exactly walks iterations (or cycles).
+    for block_axes in schedule:
 
         # This proposes a new point within the ellipsoid
         # This also potentially modifies the scale
-        u_prop, fail = propose_ball_point(u,
-                                          scale,
-                                          axes,
-                                          n,
-                                          n_cluster,
-                                          rstate=rstate,
-                                          periodic=periodic,
-                                          reflective=reflective,
-                                          nonbounded=nonbounded)
+        if block_axes is None:
+            u_prop, fail = propose_ball_point(u,
+                                              scale,
+                                              axes,
+                                              n,
+                                              n_cluster,
+                                              rstate=rstate,
+                                              periodic=periodic,
+                                              reflective=reflective,
+                                              nonbounded=nonbounded)
+        else:
+            u_prop, fail = propose_block_point(u,
+                                               scale,
+                                               block_axes,
+                                               rstate=rstate,
+                                               periodic=periodic,
+                                               reflective=reflective,
+                                               nonbounded=nonbounded)
         # If generation of points within an ellipsoid was
         # highly inefficient we adjust the scale
         if fail:
@@ -243,16 +286,28 @@ def generic_random_walk(u, loglstar, axes, scale, prior_transform,
             ncall += 1
             continue
 
+        # Pre-screen the proposed point using the surrogate.
+        if surrogate is not None:
+            p_prop = surrogate(u_prop, loglstar)
+            if rstate.random() * p_cur > p_prop:
+                # these are not counted as rejections, so the scale
+                # is tuned based on the proposals actually evaluated
+                nscreen += 1
+                continue
+
         # Check proposed point.
         v_prop = prior_transform(u_prop)
         logl_prop = loglikelihood(v_prop)
         ncall += 1
 
-        if logl_prop > loglstar:
+        if logl_prop > loglstar and (surrogate is None
+                                     or rstate.random() * p_prop < p_cur):
             u = u_prop
             v = v_prop
             logl = logl_prop
             naccept += 1
+            if surrogate is not None:
+                p_cur = p_prop
         else:
             nreject += 1
     if naccept == 0:
@@ -262,11 +317,61 @@ def generic_random_walk(u, loglstar, axes, scale, prior_transform,
         v = prior_transform(u)
         logl = loglikelihood(v)
 
-    blob = {'accept': naccept, 'reject': nreject, 'scale': scale}
+    blob = {
+        'accept': naccept,
+        'reject': nreject,
+        'screen': nscreen,
+        'scale': scale,
+        'displacement': u - u0
+    }
 
     return u, v, logl, ncall, blob
 
 
+class KNNSurrogate:
+    """
+    The cheap surrogate of the log-likelihood built from the
+    already evaluated points (i.e. the live and recent dead points).
+    It predicts the probability that the point has L>L* as the fraction
+    of its k nearest neighbours in the unit cube with L>L*.
+    It is used to pre-screen the random walk proposals.
+    """
+
+    def __init__(self, u, logl, periodic=None, k=10):
+        """
+        Initialize the object
+
+        Parameters
+        ----------
+        u: ndarray with shape (npoints, ndim)
+            Positions of the evaluated points in the unit cube
+        logl: ndarray with shape (npoints,)
+            Their log-likelihood values
+        periodic: ndarray (optional)
+            Indices of the periodic parameters
+        k: int
+            The number of neighbours
+        """
+        u = np.asarray(u)
+        boxsize = None
+        if periodic is not None:
+            # the non-periodic dimensions are given the box of size 2
+            # so that they are never wrapped
+            boxsize = np.zeros(u.shape[1]) + 2
+            boxsize[periodic] = 1
+        self.tree = spatial.KDTree(u, boxsize=boxsize)
+        self.logl = np.asarray(logl)
+        self.k = min(k, len(self.logl))
+
+    def __call__(self, u, loglstar):
+        """
+        Return the probability of L(u)>loglstar. It is never zero or one
+        """
+        idx = np.atleast_1d(self.tree.query(u, k=self.k)[1])
+        nabove = np.sum(self.logl[idx] > loglstar)
+        return (nabove + 1.) / (self.k + 2.)
+
+
 def propose_ball_point(u,
                        scale,
                        axes,
@@ -297,6 +402,17 @@ def propose_ball_point(u,
     dr = randsphere(n_cluster, rstate=rstate)
     # This generates uniform distribution within n-d ball
 
+    if _kernels.ENABLED:
+        u_prop, inside = _kernels.ball_point(
+            u, axes, dr, scale, u_non_cluster,
+            _EMPTY_INDEX if periodic is None else np.asarray(periodic),
+            _EMPTY_INDEX if reflective is None else np.asarray(reflective),
+            np.ones(n, dtype=bool) if nonbounded is None else nonbounded)
+        if inside:
+            return u_prop, False
+        else:
+            return None, True
+
     # Transform to proposal distribution.
     du = np.dot(axes, dr)
     u_prop[:n_cluster] = u_cluster + scale * du
@@ -316,6 +432,72 @@ def propose_ball_point(u,
         return None, True
 
 
+def propose_block_point(u,
+                        scale,
+                        axes,
+                        rstate=None,
+                        periodic=None,
+                        reflective=None,
+                        nonbounded=None):
+    """
+    Here we are proposing points uniformly within an ellipsoid
+    spanned by the columns of axes (that are zero outside of the
+    block of parameters that we update).
+    We are only trying once.
+    We return the tuple with
+    1) proposed point or None
+    2) failure flag (if True, the generated point was outside bounds)
+    """
+    dr = randsphere(axes.shape[1], rstate=rstate)
+    u_prop = u + scale * np.dot(axes, dr)
+
+    # Wrap periodic parameters
+    if periodic is not None:
+        u_prop[periodic] = np.mod(u_prop[periodic], 1)
+
+    # Reflect
+    if reflective is not None:
+        u_prop[reflective] = apply_reflect(u_prop[reflective])
+
+    # Check unit cube constraints.
+    if unitcheck(u_prop, nonbounded):
+        return u_prop, False
+    else:
+        return None, True
+
+
+def get_block_cycle(axes, kwargs):
+    """
+    Return the list of proposal axes used in one cycle of the
+    sampler. Without parameter blocks this is just [axes].
+    Otherwise for each block we have the (ndim, nblock) array whose
+    columns are the axes of the distribution of the block parameters
+    conditional on the remaining parameters (and zero outside the block).
+    Each block array is repeated block_oversample times, so cheap
+    blocks are updated several times per update of the expensive ones.
+    """
+    blocks = kwargs.get('blocks')
+    if blocks is None:
+        return [axes]
+    oversample = kwargs['block_oversample']
+    n = axes.shape[0]
+    cov = np.dot(axes, axes.T)
+    try:
+        prec = linalg.inv(cov)
+    except linalg.LinAlgError:
+        prec = linalg.pinv(cov)
+    cycle = []
+    for idx, nrep in zip(blocks, oversample):
+        try:
+            cur_axes = linalg.cholesky(linalg.inv(prec[np.ix_(idx, idx)]))
+        except linalg.LinAlgError:
+            cur_axes = np.diag(np.sqrt(np.diag(cov)[idx]))
+        block_axes = np.zeros((n, len(idx)))
+        block_axes[idx] = cur_axes
+        cycle.extend([block_axes] * nrep)
+    return cycle
+
+
 def _slice_doubling_accept(x1, F, loglstar, L, R, fL, fR):
     """
     Acceptance test of slice sampling when doubling mode is used.
@@ -388,10 +570,20 @@ def generic_slice_step(u, direction, nonperiodic, loglstar, loglikelihood,
 
     #  The function that evaluates the logl at the location of
     # u0 + x*direction0
+    if _kernels.ENABLED and nonperiodic is None:
+        nonperiodic_mask = np.ones(n, dtype=bool)
+    else:
+        nonperiodic_mask = nonperiodic
+
     def F(x):
         nonlocal nc
-        u_new = u + x * direction
-        if unitcheck(u_new, nonperiodic):
+        if _kernels.ENABLED:
+            u_new, inside = _kernels.line_point(u, direction, x,
+                                                nonperiodic_mask)
+        else:
+            u_new = u + x * direction
+            inside = unitcheck(u_new, nonperiodic)
+        if inside:
             logl = loglikelihood(prior_transform(u_new))
         else:
             logl = -np.inf
@@ -486,7 +678,9 @@ def sample_slice(args):
     Return a new live point proposed by a series of random slices
     away from an existing live point. Standard "Gibs-like" implementation where
     a single multivariate "slice" is a combination of `ndim` univariate slices
-    through each axis.
+    through each axis. If parameter blocks are provided in `kwargs`,
+    a slice instead cycles through the blocks, slicing along the axes of
+    each block, with the cheap blocks updated several times per cycle.
 
     Parameters
     ----------
@@ -551,41 +745,44 @@ def sample_slice(args):
     ncontract = 0
 
     # Modifying axes and computing lengths.
-    axes = scale * axes.T  # scale based on past tuning
     # Note we are transposing as axes[:,i] corresponds to i-th principal axis of the ellipsoid
+    # With parameter blocks every slice cycles through the blocks
+    # Scale based on past tuning.
+    cycle = [scale * _.T for _ in get_block_cycle(axes, kwargs)]
     expansion_warning_set = False
     # Slice sampling loop.
     for _ in range(slices):
+        for axes in cycle:
 
-        # Shuffle axis update order.
-        idxs = np.arange(n)
-        rstate.shuffle(idxs)
+            # Shuffle axis update order.
+            idxs = np.arange(len(axes))
+            rstate.shuffle(idxs)
 
-        # Slice sample along a random direction.
-        for idx in idxs:
+            # Slice sample along a random direction.
+            for idx in idxs:
 
-            # Select axis.
-            axis = axes[idx]
-            (u_prop, v_prop, logl_prop, nc1, nexpand1, ncontract1,
-             expansion_warning) = generic_slice_step(u, axis, nonperiodic,
-                                                     loglstar, loglikelihood,
-                                                     prior_transform, doubling,
-                                                     rstate)
-            u = u_prop
-            nc += nc1
-            nexpand += nexpand1
-            ncontract += ncontract1
-            if expansion_warning and not doubling:
-                # if we expanded the interval by more than
-                # the threshold we set the warning and enable doubling
-                expansion_warning_set = True
-                doubling = True
-                warnings.warn('Enabling doubling strategy of slice '
-                              'sampling from Neal(2003)')
+                # Select axis.
+                axis = axes[idx]
+                (u_prop, v_prop, logl_prop, nc1, nexpand1, ncontract1,
+                 expansion_warning) = generic_slice_step(
+                     u, axis, nonperiodic, loglstar, loglikelihood,
+                     prior_transform, doubling, rstate)
+                u = u_prop
+                nc += nc1
+                nexpand += nexpand1
+                ncontract += ncontract1
+                if expansion_warning and not doubling:
+                    # if we expanded the interval by more than
+                    # the threshold we set the warning and enable doubling
+                    expansion_warning_set = True
+                    doubling = True
+                    warnings.warn('Enabling doubling strategy of slice '
+                                  'sampling from Neal(2003)')
     blob = {
         'nexpand': nexpand,
         'ncontract': ncontract,
-        'expansion_warning_set': expansion_warning_set
+        'expansion_warning_set': expansion_warning_set,
+        'displacement': u_prop - args.u
     }
 
     return u_prop, v_prop, logl_prop, nc, blob
@@ -596,6 +793,9 @@ def sample_rslice(args):
     Return a new live point proposed by a series of random slices
     away from an existing live point. Standard "random" implementation where
     each slice is along a random direction based on the provided axes.
+    If parameter blocks are provided in `kwargs`, each slice is instead
+    a cycle of slices along random directions within each block, with
+    the cheap blocks updated several times per cycle.
 
     Parameters
     ----------
@@ -660,35 +860,39 @@ def sample_rslice(args):
     ncontract = 0
     expansion_warning_set = False
 
+    # With parameter blocks every slice cycles through the blocks
+    cycle = get_block_cycle(axes, kwargs)
+
     # Slice sampling loop.
     for _ in range(slices):
+        for axes in cycle:
 
-        # Propose a direction on the unit n-sphere.
-        drhat = rstate.standard_normal(size=n)
-        drhat /= linalg.norm(drhat)
+            # Propose a direction on the unit n-sphere.
+            drhat = rstate.standard_normal(size=axes.shape[1])
+            drhat /= linalg.norm(drhat)
 
-        # Transform and scale based on past tuning.
-        direction = np.dot(axes, drhat) * scale
-
-        (u_prop, v_prop, logl_prop, nc1, nexpand1, ncontract1,
-         expansion_warning) = generic_slice_step(u, direction, nonperiodic,
-                                                 loglstar, loglikelihood,
-                                                 prior_transform, doubling,
-                                                 rstate)
-        u = u_prop
-        nc += nc1
-        nexpand += nexpand1
-        ncontract += ncontract1
-        if expansion_warning and not doubling:
-            doubling = True
-            expansion_warning_set = True
-            warnings.warn('Enabling doubling strategy of slice '
-                          'sampling from Neal(2003)')
+            # Transform and scale based on past tuning.
+            direction = np.dot(axes, drhat) * scale
+
+            (u_prop, v_prop, logl_prop, nc1, nexpand1, ncontract1,
+             expansion_warning) = generic_slice_step(
+                 u, direction, nonperiodic, loglstar, loglikelihood,
+                 prior_transform, doubling, rstate)
+            u = u_prop
+            nc += nc1
+            nexpand += nexpand1
+            ncontract += ncontract1
+            if expansion_warning and not doubling:
+                doubling = True
+                expansion_warning_set = True
+                warnings.warn('Enabling doubling strategy of slice '
+                              'sampling from Neal(2003)')
 
     blob = {
         'nexpand': nexpand,
         'ncontract': ncontract,
-        'expansion_warning_set': expansion_warning_set
+        'expansion_warning_set': expansion_warning_set,
+        'displacement': u_prop - args.u
     }
 
     return u_prop, v_prop, logl_prop, nc, blob
@@ -703,6 +907,9 @@ def sample_hslice(args):
     and approximately reflecting off the boundaries.
     Once a series of reflections has been established, we propose a new live
     point by slice sampling across the entire path.
+    If the likelihood is vectorized (`vectorized` in kwargs), several
+    trajectory points ahead are evaluated in one call and the numerical
+    gradient stencil is evaluated in one call as well.
 
     Parameters
     ----------
@@ -765,11 +972,55 @@ def sample_hslice(args):
     grad = kwargs.get('grad', None)  # gradient of log-likelihood
     max_move = kwargs.get('max_move', 100)  # limit for `ncall`
     compute_jac = kwargs.get('compute_jac', False)  # whether Jacobian needed
+    # whether the likelihood can evaluate many points in one call
+    vectorized = kwargs.get('vectorized', False)
     jitter = 0.25  # 25% jitter
     nc = 0
     nmove = 0
     nreflect = 0
     ncontract = 0
+    # Trajectory points evaluated ahead of time along the current velocity
+    # for vectorized likelihoods. It needs to be reset every time
+    # the velocity changes.
+    lookahead = []
+    nlookahead = _HSLICE_LOOKAHEAD
+
+    def step(u_cur, vel):
+        # Make one step along the trajectory and return
+        # the new position, transformed position (or None if outside
+        # the unit cube) and log-likelihood
+        nonlocal nc, nlookahead
+        if not vectorized:
+            u_new = u_cur + rstate.uniform(1. - jitter, 1. + jitter) * vel
+            if unitcheck(u_new, nonperiodic):
+                v_new = prior_transform(np.asarray(u_new))
+                nc += 1
+                return u_new, v_new, loglikelihood(np.asarray(v_new))
+            return u_new, None, -np.inf
+        if len(lookahead) == 0:
+            # evaluate the next several steps in one call doubling
+            # the number of steps every time we run out of them
+            steps = np.cumsum(
+                rstate.uniform(1. - jitter, 1. + jitter, size=nlookahead))
+            u_new = u_cur[None, :] + steps[:, None] * vel[None, :]
+            good = np.array([unitcheck(_, nonperiodic) for _ in u_new])
+            v_new = [prior_transform(np.asarray(_)) for _ in u_new[good]]
+            if len(v_new) > 0:
+                logl_new = iter(loglikelihood.map(v_new))
+            nc += len(v_new)
+            v_new = iter(v_new)
+            for i in range(nlookahead):
+                if good[i]:
+                    lookahead.append((u_new[i], next(v_new), next(logl_new)))
+                else:
+                    lookahead.append((u_new[i], None, -np.inf))
+            nlookahead = min(2 * nlookahead, max_move + 1)
+        return lookahead.pop(0)
+
+    def reset_lookahead():
+        nonlocal nlookahead
+        lookahead.clear()
+        nlookahead = _HSLICE_LOOKAHEAD
 
     # Slice sampling loop.
     for _ in range(slices):
@@ -796,6 +1047,7 @@ def sample_hslice(args):
 
         # Progress "right" (i.e. "forwards" in time).
         reverse, reflect = False, False
+        reset_lookahead()
         u_r = np.array(u)
         ncall = 0
         while ncall <= max_move:
@@ -805,16 +1057,12 @@ def sample_hslice(args):
             u_out, u_in = None, []
             while True:
                 # Step forward.
-                u_r += rstate.uniform(1. - jitter, 1. + jitter) * vel
+                u_r, v_new, logl_r = step(u_r, vel)
                 # Evaluate point.
-                if unitcheck(u_r, nonperiodic):
-                    v_r = prior_transform(np.asarray(u_r))
-                    logl_r = loglikelihood(np.asarray(v_r))
-                    nc += 1
+                if v_new is not None:
+                    v_r = v_new
                     ncall += 1
                     nmove += 1
-                else:
-                    logl_r = -np.inf
                 # Check if we satisfy the log-likelihood constraint
                 # (i.e. are "in" or "out" of bounds).
                 if logl_r < loglstar:
@@ -856,7 +1104,16 @@ def sample_hslice(args):
 
             # Reflect off the boundary.
             u_r, logl_r = u_out, logl_out
-            if grad is None:
+            if grad is None and vectorized:
+                # Approximate the gradient numerically evaluating
+                # the whole stencil in one call.
+                h, nc1 = _batch_numerical_grad(u_r, nonperiodic,
+                                               prior_transform, loglikelihood)
+                nc += nc1
+                if h is None:
+                    reverse = True  # can't compute gradient
+                    break
+            elif grad is None:
                 # If the gradient is not provided, we will attempt to
                 # approximate it numerically using 2nd-order methods.
                 h = np.zeros(n)
@@ -927,12 +1184,14 @@ def sample_hslice(args):
                 # If the reflection angle is sufficiently large, we
                 # proceed as normal to the new position.
                 vel = vel_ref
+                reset_lookahead()
                 u_out = None
                 reflect = True
                 nreflect += 1
 
         # Progress "left" (i.e. "backwards" in time).
         reverse, reflect = False, False
+        reset_lookahead()
         vel = -np.array(axis)  # current velocity
         u_l = np.array(u)
         ncall = 0
@@ -944,16 +1203,12 @@ def sample_hslice(args):
             u_out, u_in = None, []
             while True:
                 # Step forward.
-                u_l += rstate.uniform(1. - jitter, 1. + jitter) * vel
+                u_l, v_new, logl_l = step(u_l, vel)
                 # Evaluate point.
-                if unitcheck(u_l, nonperiodic):
-                    v_l = prior_transform(np.asarray(u_l))
-                    logl_l = loglikelihood(np.asarray(v_l))
-                    nc += 1
+                if v_new is not None:
+                    v_l = v_new
                     ncall += 1
                     nmove += 1
-                else:
-                    logl_l = -np.inf
                 # Check if we satisfy the log-likelihood constraint
                 # (i.e. are "in" or "out" of bounds).
                 if logl_l < loglstar:
@@ -995,7 +1250,16 @@ def sample_hslice(args):
 
             # Reflect off the boundary.
             u_l, logl_l = u_out, logl_out
-            if grad is None:
+            if grad is None and vectorized:
+                # Approximate the gradient numerically evaluating
+                # the whole stencil in one call.
+                h, nc1 = _batch_numerical_grad(u_l, nonperiodic,
+                                               prior_transform, loglikelihood)
+                nc += nc1
+                if h is None:
+                    reverse = True  # can't compute gradient
+                    break
+            elif grad is None:
                 # If the gradient is not provided, we will attempt to
                 # approximate it numerically using 2nd-order methods.
                 h = np.zeros(n)
@@ -1066,6 +1330,7 @@ def sample_hslice(args):
                 # If the reflection angle is sufficiently large, we
                 # proceed as normal to the new position.
                 vel = vel_ref
+                reset_lookahead()
                 u_out = None
                 reflect = True
                 nreflect += 1
@@ -1134,6 +1399,233 @@ def sample_hslice(args):
                         f"u_prop: {u_prop}\n loglstar: {loglstar}\n"
                         f"logl_prop: {logl_prop}")
 
-    blob = {'nmove': nmove, 'nreflect': nreflect, 'ncontract': ncontract}
+    blob = {
+        'nmove': nmove,
+        'nreflect': nreflect,
+        'ncontract': ncontract,
+        'displacement': u_prop - args.u
+    }
 
     return u_prop, v_prop, logl_prop, nc, blob
+
+
+def _batch_numerical_grad(u, nonperiodic, prior_transform, loglikelihood):
+    """
+    Approximate the gradient of the log-likelihood with respect to the
+    unit cube using 2-sided differencing, evaluating all the 2 * ndim
+    points of the stencil in a single call of `loglikelihood.map`.
+    Returns the gradient (or None if the stencil is outside of the unit cube)
+    and the number of likelihood evaluations.
+    """
+    n = len(u)
+    delta = 1e-10
+    shift = delta * np.identity(n)
+    stencil = np.concatenate([u + shift, u - shift])
+    if not all(unitcheck(_, nonperiodic) for _ in stencil):
+        return None, 0
+    v = [prior_transform(np.asarray(_)) for _ in stencil]
+    logl = np.array([_.val for _ in loglikelihood.map(v)])
+    return (logl[:n] - logl[n:]) / (2 * delta), 2 * n
+
+
+def _grad_unit_cube(u, v, grad, prior_transform, compute_jac):
+    """
+    Evaluate the gradient of the log-likelihood with respect to the
+    unit cube coordinates, applying the Jacobian dv/du of the prior
+    transform if the gradient is defined with respect to v.
+    Returns None if the Jacobian cannot be computed (because
+    the stencil falls outside the unit cube).
+    """
+    h = np.asarray(grad(v), dtype=float)
+    if not compute_jac:
+        return h
+    delta = 1e-10
+    n = len(u)
+    jac = np.empty((n, len(v)))
+    for i in range(n):
+        u_l, u_r = np.array(u), np.array(u)
+        u_l[i] -= delta
+        u_r[i] += delta
+        if not (unitcheck(u_l) and unitcheck(u_r)):
+            return None
+        jac[i] = (np.asarray(prior_transform(u_r)) -
+                  np.asarray(prior_transform(u_l))) / (2 * delta)
+    return np.dot(jac, h)
+
+
+def sample_hmc(args):
+    """
+    Return a new live point proposed by constrained Hamiltonian Monte Carlo
+    starting from an existing live point.
+    Because the target distribution (the prior restricted to
+    ln(likelihood) > `loglstar`) is uniform in the unit cube, the leapfrog
+    trajectories are straight lines that reflect specularly off the
+    ln(likelihood) = `loglstar` boundary (using the gradient of the
+    log-likelihood as the normal) and off the edges of the unit cube.
+    Each step moves the point along its velocity; if the new position is
+    outside the constraint the velocity is reflected there and the
+    reflected step is attempted; if that also fails the velocity is
+    reversed. This is the Galilean Monte Carlo scheme from Skilling (2012),
+    which leaves the constrained prior invariant. The velocity is redrawn
+    every few steps and the total number of steps is set by `walks`.
+
+    Parameters
+    ----------
+    u : `~numpy.ndarray` with shape (ndim,)
+        Position of the initial sample. **This is a copy of an existing live
+        point.**
+
+    loglstar : float
+        Ln(likelihood) bound.
+
+    axes : `~numpy.ndarray` with shape (ndim, ndim)
+        Axes used to propose the initial velocity. These define the
+        metric used for the reflections.
+
+    scale : float
+        Value used to scale the provided axes (i.e. the step size).
+
+    prior_transform : function
+        Function transforming a sample from the a unit cube to the parameter
+        space of interest according to the prior.
+
+    loglikelihood : function
+        Function returning ln(likelihood) given parameters as a 1-d `~numpy`
+        array of length `ndim`.
+
+    kwargs : dict
+        A dictionary of additional method-specific parameters.
+
+    Returns
+    -------
+    u : `~numpy.ndarray` with shape (ndim,)
+        Position of the final proposed point within the unit cube.
+
+    v : `~numpy.ndarray` with shape (ndim,)
+        Position of the final proposed point in the target parameter space.
+
+    logl : float
+        Ln(likelihood) of the final proposed point.
+
+    nc : int
+        Number of function calls used to generate the sample.
+
+    blob : dict
+        Collection of ancillary quantities used to tune :data:`scale`.
+
+    """
+
+    # Unzipping.
+    (u, loglstar, axes, scale, prior_transform, loglikelihood,
+     kwargs) = (args.u, args.loglstar, args.axes, args.scale,
+                args.prior_transform, args.loglikelihood, args.kwargs)
+    rstate = get_random_generator(args.rseed)
+
+    # Periodicity.
+    periodic = kwargs.get('periodic')
+
+    # Setup.
+    n = len(u)
+    assert axes.shape[0] == n
+    walks = kwargs.get('walks', 25)  # number of leapfrog steps
+    grad = kwargs.get('grad', None)  # gradient of log-likelihood
+    compute_jac = kwargs.get('compute_jac', False)  # whether Jacobian needed
+    if grad is None:
+        raise ValueError('The hmc sampler requires the gradient')
+    jitter = 0.25  # 25% jitter
+    # The number of steps after which the velocity is redrawn.
+    # Straight trajectories reflecting inside a convex region preserve
+    # their distance of closest approach to the center,
+    # so without the refreshes the points will not decorrelate radially
+    ntraj = 10
+    nc = 0
+    nmove = 0
+    nreflect = 0
+    nreverse = 0
+    # non-periodic dimensions reflect off the edges of the unit cube
+    walls = np.ones(n, dtype=bool)
+    if periodic is not None:
+        walls[periodic] = False
+    # the matrix defining the metric used for the reflections
+    metric = np.dot(axes, axes.T)
+
+    def evaluate(u_prop):
+        # check the position and return v, logl (or None if the
+        # point is outside the constraint)
+        nonlocal nc
+        if periodic is not None:
+            u_prop[periodic] = np.mod(u_prop[periodic], 1)
+        if np.any(walls & ((u_prop <= 0) | (u_prop >= 1))):
+            return None, None
+        v_prop = prior_transform(u_prop)
+        logl_prop = loglikelihood(v_prop)
+        nc += 1
+        if logl_prop > loglstar:
+            return v_prop, logl_prop
+        return v_prop, None
+
+    def reflect(u_prop, v_prop, vel):
+        # reflect the velocity off the boundary at u_prop.
+        # Returns None if the normal can't be determined
+        nonlocal nc
+        if v_prop is None:
+            # normal of the unit cube edge(s)
+            out = walls & ((u_prop <= 0) | (u_prop >= 1))
+            h = np.zeros(n)
+            h[out] = np.sign(u_prop[out] - 0.5)
+        else:
+            h = _grad_unit_cube(u_prop, v_prop, grad, prior_transform,
+                                compute_jac)
+            nc += 1
+            if h is None or not np.all(np.isfinite(h)):
+                return None
+        hmet = np.dot(metric, h)
+        norm = np.dot(h, hmet)
+        if norm <= 0:
+            return None
+        return vel - 2 * np.dot(vel, h) / norm * hmet
+
+    u_cur = np.array(u)
+    v_cur, logl_cur = None, None
+    for i in range(walks):
+        if i % ntraj == 0:
+            # Propose a direction on the unit n-sphere.
+            drhat = rstate.standard_normal(size=n)
+            drhat /= linalg.norm(drhat)
+            # Transform and scale based on past tuning.
+            vel = np.dot(axes, drhat) * scale * rstate.uniform(
+                1. - jitter, 1. + jitter)
+        u_prop = u_cur + vel
+        v_prop, logl_prop = evaluate(u_prop)
+        if logl_prop is not None:
+            # straight move
+            u_cur, v_cur, logl_cur = u_prop, v_prop, logl_prop
+            nmove += 1
+            continue
+        vel_ref = reflect(u_prop, v_prop, vel)
+        if vel_ref is not None:
+            u_ref = u_prop + vel_ref
+            v_ref, logl_ref = evaluate(u_ref)
+            if logl_ref is not None:
+                u_cur, v_cur, logl_cur = u_ref, v_ref, logl_ref
+                vel = vel_ref
+                nreflect += 1
+                continue
+        # reverse the trajectory
+        vel = -vel
+        nreverse += 1
+
+    if logl_cur is None:
+        # we never moved
+        v_cur = prior_transform(u_cur)
+        logl_cur = loglikelihood(v_cur)
+        nc += 1
+
+    blob = {
+        'nmove': nmove,
+        'nreflect': nreflect,
+        'nreverse': nreverse,
+        'displacement': u_cur - args.u
+    }
+
+    return u_cur, v_cur, logl_cur, nc, blob
@@ -12,6 +12,8 @@ import copy
 import time
 import os
 import shutil
+import signal
+import threading
 from collections import namedtuple
 from functools import partial
 import pickle as pickle_module
@@ -19,6 +21,7 @@ import pickle as pickle_module
 import numpy as np
 from scipy.special import logsumexp
 from ._version import __version__ as DYNESTY_VERSION
+from . import _kernels
 try:
     import tqdm
 except ImportError:
@@ -31,9 +34,10 @@ except ImportError:
 
 __all__ = [
     "unitcheck", "resample_equal", "mean_and_cov", "quantile", "jitter_run",
-    "resample_run", "reweight_run", "unravel_run", "merge_runs", "kld_error",
-    "get_enlarge_bootstrap", "LoglOutput", "LogLikelihood", "RunRecord",
-    "DelayTimer"
+    "resample_run", "jitter_run_batch", "resample_run_batch", "reweight_run",
+    "unravel_run", "merge_runs", "kld_error", "get_enlarge_bootstrap",
+    "LoglOutput", "LogLikelihood", "SlowFastFunction", "TimeoutFunction",
+    "RunRecord", "DelayTimer"
 ]
 
 SQRTEPS = math.sqrt(float(np.finfo(np.float64).eps))
@@ -115,10 +119,135 @@ class LoglOutput:
         return float(self.val)
 
 
+class SlowFastFunction:
+    """
+    Class that evaluates the log-likelihood that is split into an
+    expensive part depending only on the slow parameters and a cheap
+    part depending on all the parameters. The output of the expensive
+    part is cached and reused as long as the slow parameters do not change.
+    """
+
+    def __init__(self, loglikelihood, slow_function, slow_idx, cache_size=2):
+        """ Initialize the object.
+
+        Parameters
+        ----------
+        loglikelihood: function
+            The function called as loglikelihood(x, intermediate, *args,
+            **kwargs) where intermediate is the output of slow_function(x)
+        slow_function: function
+            The expensive function of the slow parameters
+        slow_idx: ndarray
+            The indices of the slow parameters
+        cache_size: int
+            The number of the most recent slow_function outputs
+            kept in the cache (two is enough to keep both the current
+            point of the chain and the last proposal)
+        """
+        self.loglikelihood = loglikelihood
+        self.slow_function = slow_function
+        self.slow_idx = np.asarray(slow_idx, dtype=int)
+        self.cache_size = cache_size
+        self.cache = []
+        self.nslow = 0
+
+    def __call__(self, x, *args, **kwargs):
+        """
+        Evaluate the log-likelihood reusing the cached slow_function output
+        if possible
+        """
+        key = np.asarray(x)[self.slow_idx]
+        for i, (cur_key, cur_val) in enumerate(self.cache):
+            if np.array_equal(cur_key, key):
+                intermediate = cur_val
+                if i > 0:
+                    # move to the front
+                    self.cache.insert(0, self.cache.pop(i))
+                break
+        else:
+            intermediate = self.slow_function(x)
+            self.nslow += 1
+            self.cache.insert(0, (key.copy(), intermediate))
+            del self.cache[self.cache_size:]
+        return self.loglikelihood(x, intermediate, *args, **kwargs)
+
+    def __getstate__(self):
+        """Get state information for pickling."""
+        state = self.__dict__.copy()
+        # do not ship the cached values around
+        state['cache'] = []
+        return state
+
+
+class _EvaluationTimeout(Exception):
+    """
+    Exception raised when the function call exceeds the timeout
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise _EvaluationTimeout()
+
+
+def _timeout_supported():
+    """
+    Return True if the calls of TimeoutFunction can be interrupted
+    in the current thread
+    """
+    return (hasattr(signal, 'setitimer')
+            and threading.current_thread() is threading.main_thread())
+
+
+class TimeoutFunction:
+    """
+    Class that wraps the function and abandons its calls that take
+    longer than the timeout. The abandoned calls return None.
+    The calls are interrupted by the SIGALRM signal, so the timeout is
+    only enforced in the main thread of the process (i.e. in the main
+    process or in the processes of a multiprocessing pool) on the systems
+    supporting it. Also the function can only be interrupted when
+    it executes python code, i.e. a long call of a compiled function is
+    interrupted when it returns.
+    """
+
+    def __init__(self, func, timeout):
+        """ Initialize the object.
+
+        Parameters
+        ----------
+        func: function
+            The function
+        timeout: float
+            The timeout in seconds
+        """
+        self.func = func
+        self.timeout = timeout
+
+    def __call__(self, x):
+        """
+        Call the function, return None if the call timed out
+        """
+        if not _timeout_supported():
+            return self.func(x)
+        old_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        try:
+            try:
+                signal.setitimer(signal.ITIMER_REAL, self.timeout)
+                ret = self.func(x)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except _EvaluationTimeout:
+            ret = None
+        finally:
+            signal.signal(signal.SIGALRM, old_handler)
+        return ret
+
+
 class LogLikelihood:
     """
     Class that calls the likelihood function (using a pool if provided)
     Also if requested it saves the history of evaluations
+    and reuses the evaluations from the archive of previous runs
     """
 
     def __init__(self,
@@ -127,7 +256,10 @@ class LogLikelihood:
                  pool=None,
                  save=False,
                  history_filename=None,
-                 blob=False):
+                 blob=False,
+                 vectorized=False,
+                 archive_filename=None,
+                 timeout=None):
         """ Initialize the object.
 
         Parameters
@@ -144,58 +276,194 @@ class LogLikelihood:
         blob: boolean
             if True we expect the logl output to be a tuple of logl value and
             a blob, otherwise it'll be logl value only
+        vectorized: boolean
+            if True the likelihood function accepts a 2-D array of
+            parameters with shape (npoints, ndim) and returns the array
+            of npoints logl values (or a tuple of logl and blob arrays).
+            In that case map() evaluates all the points in a single call
+            without using the pool.
+        archive_filename: string (optional)
+            The hdf5 file with the history of evaluations saved by
+            a previous run. The saved logl values are then returned
+            for the parameter vectors exactly matching the saved ones
+            instead of calling the likelihood function, and the saved
+            prior draws can be reused as initial live points.
+            It can be the same file as history_filename.
+        timeout: float (optional)
+            If specified, the likelihood calls taking longer than timeout
+            seconds are abandoned and the logl value of -inf is returned
+            for them instead (see TimeoutFunction). The number of such
+            calls is counted in the ntimeout attribute.
         """
+        if timeout is not None:
+            if not timeout > 0:
+                raise ValueError('The timeout must be positive')
+            if not hasattr(signal, 'setitimer'):
+                warnings.warn('The timeout of the likelihood calls is not '
+                              'supported on this system and will be ignored')
+            loglikelihood = TimeoutFunction(loglikelihood, timeout)
         self.loglikelihood = loglikelihood
+        self.timeout = timeout
+        self.ntimeout = 0
         self.pool = pool
         self.history_pars = []
         self.history_logl = []
+        self.history_u = []
         self.save_every = 10000
         self.save = save
         self.history_filename = history_filename
         self.ndim = ndim
         self.failed_save = False
         self.blob = blob
+        self.vectorized = vectorized
+        self.cache = None
+        self.archive_u = np.zeros((0, ndim))
+        if archive_filename is not None:
+            # it must be read before the history file is overwritten
+            self.archive_load(archive_filename)
         if save:
             self.history_init()
 
-    def map(self, pars):
+    def map(self, pars, upars=None):
         """
         Evaluate the likelihood function on the list of vectors
         The pool is used if it was provided when the object was created
 
+        Parameters
+        ----------
+        pars: list of ndarrays
+            Parameter vectors
+        upars: list of ndarrays (optional)
+            The unit cube coordinates of the prior draws pars.
+            These are only used to save them in the history
+            (so they can be used to warm-start the next run)
+
         Returns
         -------
         ret: The list of LoglOutput objects
         """
-        if self.pool is None:
-            ret = list([
-                LoglOutput(_, self.blob) for _ in map(self.loglikelihood, pars)
-            ])
+        ret = [None] * len(pars)
+        todo = [
+            i for i, par in enumerate(pars)
+            if not self._lookup(par, ret, i)
+        ]
+        todo_pars = [pars[_] for _ in todo]
+        if len(todo_pars) == 0:
+            out = []
+        elif self.vectorized:
+            out = self._call_vectorized(todo_pars)
+        elif self.pool is None:
+            out = list(
+                [self._output(_) for _ in map(self.loglikelihood, todo_pars)])
         else:
-            ret = [
-                LoglOutput(_, self.blob)
-                for _ in self.pool.map(self.loglikelihood, pars)
+            out = [
+                self._output(_)
+                for _ in self.pool.map(self.loglikelihood, todo_pars)
             ]
+        for i, cur_out in zip(todo, out):
+            ret[i] = cur_out
         if self.save:
-            self.history_append([_.val for _ in ret], pars)
+            self.history_append([_.val for _ in ret], pars, upars)
         return ret
 
+    def _lookup(self, par, ret, i):
+        """
+        Look up the parameter vector in the archive of previous
+        evaluations. If found the result is stored in ret[i] and
+        True is returned
+        """
+        if self.cache is None:
+            return False
+        val = self.cache.get(np.asarray(par, dtype=float).tobytes())
+        if val is None:
+            return False
+        ret[i] = LoglOutput(val, False)
+        return True
+
+    def _output(self, val):
+        """
+        Wrap the output of the likelihood function into LoglOutput.
+        The timed out calls (returning None) are counted and
+        get the logl of -inf
+        """
+        if val is None:
+            self.ntimeout += 1
+            val = (-np.inf, None) if self.blob else -np.inf
+        return LoglOutput(val, self.blob)
+
+    def _call_vectorized(self, pars):
+        """
+        Evaluate the vectorized likelihood function on the list of vectors
+        in a single call
+        """
+        out = self.loglikelihood(np.atleast_2d(np.asarray(pars)))
+        if out is None:
+            # the whole call timed out
+            return [self._output(None) for _ in pars]
+        if self.blob:
+            return [LoglOutput(_, True) for _ in zip(*out)]
+        return [LoglOutput(_, False) for _ in np.asarray(out)]
+
     def __call__(self, x):
         """
         Evaluate the likelihood f-n once
         """
-        ret = LoglOutput(self.loglikelihood(x), self.blob)
+        ret = [None]
+        if self._lookup(x, ret, 0):
+            ret = ret[0]
+        elif self.vectorized:
+            ret = self._call_vectorized([x])[0]
+        else:
+            ret = self._output(self.loglikelihood(x))
         if self.save:
             self.history_append([ret.val], [x])
         return ret
 
-    def history_append(self, logls, pars):
+    def archive_load(self, filename):
+        """
+        Load the archive of the evaluations saved in the hdf5 file
+        by history_save() and set up the lookup table of logl values.
+        """
+        if h5py is None:
+            raise RuntimeError(
+                'h5py module is required for reading the history of calls')
+        if self.blob:
+            raise ValueError('The archive of evaluations cannot be used '
+                             'with blobs as they are not saved in it')
+        with h5py.File(filename, mode='r') as fp:
+            # pylint: disable=no-member
+            pars = np.asarray(fp['param'][:], dtype=float)
+            logls = np.asarray(fp['logl'][:])
+            if 'u' in fp:
+                upars = np.asarray(fp['u'][:])
+            else:
+                upars = np.zeros((0, self.ndim))
+        if pars.shape[1] != self.ndim:
+            raise ValueError('The dimensionality of the archive of '
+                             'evaluations does not match ndim')
+        self.cache = dict(zip([_.tobytes() for _ in pars], logls))
+        # the prior draws are the ones with the saved unit cube coordinates
+        self.archive_u = upars[np.all(np.isfinite(upars), axis=1)]
+
+    def archive_prior_draws(self, npoints):
+        """
+        Return up to npoints unit cube coordinates of the prior draws from
+        the archive of evaluations. Each of them is returned only once.
+        """
+        ret = self.archive_u[:npoints]
+        self.archive_u = self.archive_u[npoints:]
+        return ret
+
+    def history_append(self, logls, pars, upars=None):
         """
         Append to the internal history the list of loglikelihood values
-        And points
+        And points (and optionally the unit cube coordinates of the points)
         """
         self.history_logl.extend(logls)
         self.history_pars.extend(pars)
+        if upars is None:
+            upars = np.zeros((len(logls), self.ndim)) + np.nan
+        self.history_u.extend(upars)
         if len(self.history_logl) > self.save_every:
             self.history_save()
 
@@ -207,10 +475,17 @@ class LogLikelihood:
         self.history_counter = 0
         try:
             with h5py.File(self.history_filename, mode='w') as fp:
-                fp.create_dataset('param', (self.save_every, self.ndim),
-                                  maxshape=(None, self.ndim))
-                fp.create_dataset('logl', (self.save_every, ),
-                                  maxshape=(None, ))
+                # double precision is needed to be able to look up
+                # the saved parameter vectors exactly
+                fp.create_dataset('param', (0, self.ndim),
+                                  maxshape=(None, self.ndim),
+                                  dtype=np.float64)
+                fp.create_dataset('logl', (0, ),
+                                  maxshape=(None, ),
+                                  dtype=np.float64)
+                fp.create_dataset('u', (0, self.ndim),
+                                  maxshape=(None, self.ndim),
+                                  dtype=np.float64)
         except OSError:
             print('Failed to initialize history file')
             raise
@@ -227,12 +502,17 @@ class LogLikelihood:
             with h5py.File(self.history_filename, mode='a') as fp:
                 # pylint: disable=no-member
                 nadd = len(self.history_logl)
+                if nadd == 0:
+                    return
                 fp['param'].resize(self.history_counter + nadd, axis=0)
                 fp['logl'].resize(self.history_counter + nadd, axis=0)
+                fp['u'].resize(self.history_counter + nadd, axis=0)
                 fp['param'][-nadd:, :] = np.array(self.history_pars)
                 fp['logl'][-nadd:] = np.array(self.history_logl)
+                fp['u'][-nadd:, :] = np.array(self.history_u)
                 self.history_pars = []
                 self.history_logl = []
+                self.history_u = []
                 self.history_counter += nadd
         except OSError:
             warnings.warn(
@@ -244,6 +524,8 @@ class LogLikelihood:
         state = self.__dict__.copy()
         if 'pool' in state:
             del state['pool']
+        # the lookup table can be large, so we do not ship it around
+        state['cache'] = None
         return state
 
 
@@ -276,6 +558,7 @@ class RunRecord:
             'n',  # number of live points interior to dead point
             'bounditer',  # active bound at a specific iteration
             'scale',  # scale factor at each iteration
+            'nsteps',  # number of walks/slices at each iteration
             'blob'  # blobs output by the log-likelihood
         ]
         if dynamic:
@@ -612,8 +895,13 @@ _RESULTS_STRUCTURE = [
     ('batch_nlive', 'array[int]',
      "The number of live points used for  given batch", 'nbatch'),
     ('scale', 'array[float]', "Scalar scale applied for proposals", 'niter'),
+    ('nsteps', 'array[int]',
+     "The number of walks/slices used for proposals", 'niter'),
     ('blob', 'array[]',
-     'The auxiliary blobs computed by the log-likelihood function', 'niter')
+     'The auxiliary blobs computed by the log-likelihood function', 'niter'),
+    ('ntimeout', 'int',
+     'The number of log-likelihood calls abandoned because of the timeout',
+     None)
 ]
 
 
@@ -843,6 +1131,39 @@ def get_nonbounded(ndim, periodic, reflective):
     return nonbounded
 
 
+def get_blocks(ndim, blocks, block_costs):
+    """
+    Validate the parameter blocks and return them ordered from the slowest
+    to the fastest block together with the number of times each block is
+    updated per cycle (the oversampling factor). The block with the highest
+    cost is updated once and the block with the cost ratio of K with
+    respect to it is updated round(K) times.
+    """
+    if blocks is None:
+        if block_costs is not None:
+            raise ValueError('block_costs require blocks to be specified')
+        return None, None
+    blocks = [np.atleast_1d(np.asarray(_, dtype=int)) for _ in blocks]
+    if not np.array_equal(np.sort(np.concatenate(blocks)), np.arange(ndim)):
+        raise ValueError('The parameter blocks must include each of the '
+                         'ndim parameters exactly once')
+    if block_costs is None:
+        block_costs = np.ones(len(blocks))
+    block_costs = np.asarray(block_costs, dtype=float)
+    if len(block_costs) != len(blocks):
+        raise ValueError('The number of block costs must be equal to '
+                         'the number of blocks')
+    if not np.all(block_costs > 0):
+        raise ValueError('The block costs must be positive')
+    order = np.argsort(-block_costs, kind='stable')
+    blocks = [blocks[_] for _ in order]
+    block_costs = block_costs[order]
+    oversample = [
+        max(int(np.round(block_costs[0] / _)), 1) for _ in block_costs
+    ]
+    return blocks, oversample
+
+
 def get_print_func(print_func, print_progress):
     pbar = None
     if print_func is None:
@@ -902,6 +1223,10 @@ def unitcheck(u, nonbounded=None):
     `nonbounded`, also allows periodic boundaries conditions to exceed
     the unit cube."""
 
+    if _kernels.ENABLED:
+        if nonbounded is None:
+            return _kernels.in_unit_cube(u)
+        return _kernels.in_unit_cube_masked(u, nonbounded)
     if nonbounded is None:
         # No periodic boundary conditions provided.
         return u.min() > 0 and u.max() < 1
@@ -936,6 +1261,8 @@ def apply_reflect(u):
     u: array-like
        The input array, modified in place.
     """
+    if _kernels.ENABLED:
+        return _kernels.reflect(u)
     idxs_even = np.mod(u, 2) < 1
     u[idxs_even] = np.mod(u[idxs_even], 1)
     u[~idxs_even] = 1 - np.mod(u[~idxs_even], 1)
@@ -1183,6 +1510,7 @@ def jitter_run(res, rstate=None, approx=False):
     Probes **statistical uncertainties** on a nested sampling run by
     explicitly generating a *realization* of the prior volume associated
     with each sample (dead point). Companion function to :meth:`resample_run`.
+    See :meth:`jitter_run_batch` to generate many realizations at once.
 
     Parameters
     ----------
@@ -1285,36 +1613,44 @@ def compute_integrals(logl=None, logvol=None, reweight=None):
         array of log volumes
     reweight: array (or None)
         (optional) reweighting array to reweight posterior
+
+    The arrays can also be 2D with shape (nrealizations, nsamps), in which
+    case the integrals are computed along the last axis for each
+    realization.
     """
     # pylint: disable=invalid-unary-operand-type
     # Unfortunately pylint doesn't get the asserts
     assert logl is not None
     assert logvol is not None
 
-    loglstar_pad = np.concatenate([[-1.e300], logl])
+    logl = np.asarray(logl)
+    logvol = np.asarray(logvol)
+    loglstar_pad = np.concatenate(
+        [np.full(logl.shape[:-1] + (1, ), -1.e300), logl], axis=-1)
 
     # we want log(exp(logvol_i)-exp(logvol_(i+1)))
     # assuming that logvol0 = 0
     # log(exp(LV_{i})-exp(LV_{i+1})) =
     # = LV{i} + log(1-exp(LV_{i+1}-LV{i}))
     # = LV_{i+1} - (LV_{i+1} -LV_i) + log(1-exp(LV_{i+1}-LV{i}))
-    dlogvol = np.diff(logvol, prepend=0)
+    dlogvol = np.diff(logvol, prepend=0, axis=-1)
     logdvol = logvol - dlogvol + np.log1p(-np.exp(dlogvol))
     # logdvol is log(delta(volumes)) i.e. log (X_i-X_{i-1})
     logdvol2 = logdvol + math.log(0.5)
     # These are log(1/2(X_(i+1)-X_i))
 
-    dlogvol = -np.diff(logvol, prepend=0)
+    dlogvol = -np.diff(logvol, prepend=0, axis=-1)
     # this are delta(log(volumes)) of the run
 
     # These are log((L_i+L_{i_1})*(X_i+1-X_i)/2)
-    saved_logwt = np.logaddexp(loglstar_pad[1:], loglstar_pad[:-1]) + logdvol2
+    saved_logwt = np.logaddexp(loglstar_pad[..., 1:],
+                               loglstar_pad[..., :-1]) + logdvol2
     if reweight is not None:
         saved_logwt = saved_logwt + reweight
-    saved_logz = np.logaddexp.accumulate(saved_logwt)
+    saved_logz = np.logaddexp.accumulate(saved_logwt, axis=-1)
     # This implements eqn 16 of Speagle2020
 
-    logzmax = saved_logz[-1]
+    logzmax = saved_logz[..., -1:]
     # we'll need that to just normalize likelihoods to avoid overflows
 
     # H is defined as
@@ -1322,19 +1658,78 @@ def compute_integrals(logl=None, logvol=None, reweight=None):
     # incomplete H can be defined as
     # H = int( L/Z * ln(L) dX,X=0..x) - z_x/Z * ln(Z)
     h_part1 = np.cumsum(
-        (np.exp(loglstar_pad[1:] - logzmax + logdvol2) * loglstar_pad[1:] +
-         np.exp(loglstar_pad[:-1] - logzmax + logdvol2) * loglstar_pad[:-1]))
+        (np.exp(loglstar_pad[..., 1:] - logzmax + logdvol2) *
+         loglstar_pad[..., 1:] + np.exp(loglstar_pad[..., :-1] - logzmax +
+                                        logdvol2) * loglstar_pad[..., :-1]),
+        axis=-1)
     # here we divide the likelihood by zmax to avoid to overflow
     saved_h = h_part1 - logzmax * np.exp(saved_logz - logzmax)
     # changes in h in each step
-    dh = np.diff(saved_h, prepend=0)
+    dh = np.diff(saved_h, prepend=0, axis=-1)
 
     # I'm applying abs() here to avoid nans down the line
     # because partial H integrals could be negative
-    saved_logzvar = np.abs(np.cumsum(dh * dlogvol))
+    saved_logzvar = np.abs(np.cumsum(dh * dlogvol, axis=-1))
     return saved_logwt, saved_logz, saved_logzvar, saved_h
 
 
+def _combined_logvol(logl, nlive, logvol_init):
+    """
+    Compute the expected ln(volume) of the samples of the (combined) run
+    given their (sorted) log-likelihoods and the numbers of live points.
+    Outside of the plateaus the ln(volume) decreases by
+    log((nlive + 1) / nlive) at each sample. Within a plateau of
+    the log-likelihood the volume
+    of the first point is split uniformly between all the points of the
+    plateau.
+
+    Parameters
+    ----------
+    logl: numpy array
+        The log-likelihoods of the samples
+
+    nlive: numpy array of ints
+        The numbers of live points
+
+    logvol_init: float
+        The initial ln(volume)
+
+    Returns
+    -------
+    logvol: numpy array
+        The ln(volume) of the samples
+    """
+    nsamps = len(logl)
+    logvol = np.empty(nsamps)
+    # the ln(volume) decrements (computed in the same way as
+    # in the sequential loop)
+    uniq, inv = np.unique(nlive, return_inverse=True)
+    dlogvol = np.array([math.log((_ + 1.) / _) for _ in uniq.tolist()])[inv]
+    # the starts and the lengths of the plateaus
+    edges = np.nonzero(logl[1:] != logl[:-1])[0] + 1
+    starts = np.concatenate(([0], edges))
+    lengths = np.diff(np.concatenate((starts, [nsamps])))
+    plateau = lengths > 1
+    cur_logvol = logvol_init
+    pos = 0
+    for start, length in zip(starts[plateau], lengths[plateau]):
+        # The sequential subtraction of the decrements is the same
+        # as the cumulative sum of the negated decrements
+        logvol[pos:start] = np.cumsum(
+            np.concatenate(([cur_logvol], -dlogvol[pos:start])))[1:]
+        if start > pos:
+            cur_logvol = logvol[start - 1]
+        plateau_logdvol = cur_logvol + np.log(1. / (nlive[start] + 1))
+        for i in range(start, start + length):
+            cur_logvol = cur_logvol + np.log1p(
+                -np.exp(plateau_logdvol - cur_logvol))
+            logvol[i] = cur_logvol
+        pos = start + length
+    logvol[pos:] = np.cumsum(np.concatenate(([cur_logvol],
+                                             -dlogvol[pos:])))[1:]
+    return logvol
+
+
 def progress_integration(loglstar, loglstar_new, logz, logzvar, logvol,
                          dlogvol, h):
     """
@@ -1368,7 +1763,8 @@ def resample_run(res, rstate=None, return_idx=False):
     splits a nested sampling run with `K` particles (live points) into a
     series of `K` "strands" (i.e. runs with a single live point) which are then
     bootstrapped to construct a new "resampled" run. Companion function to
-    :meth:`jitter_run`.
+    :meth:`jitter_run`. See :meth:`resample_run_batch` to generate many
+    realizations at once.
 
     Parameters
     ----------
@@ -1528,6 +1924,221 @@ def resample_run(res, rstate=None, return_idx=False):
         return new_res
 
 
+def jitter_run_batch(res, nrealizations, rstate=None, approx=False):
+    """
+    Generate many realizations of the prior volumes associated with the
+    samples (dead points) of a nested sampling run at once. This is the
+    batched version of :meth:`jitter_run`, where the realizations are
+    returned as arrays rather than as the individual
+    :class:`~dynesty.results.Results` instances.
+
+    Parameters
+    ----------
+    res : :class:`~dynesty.results.Results` instance
+        The :class:`~dynesty.results.Results` instance taken from a previous
+        nested sampling run.
+
+    nrealizations : int
+        The number of realizations.
+
+    rstate : `~numpy.random.Generator`, optional
+        `~numpy.random.Generator` instance.
+
+    approx : bool, optional
+        Whether to approximate all sets of uniform order statistics by their
+        associated marginals (from the Beta distribution). Default is `False`.
+
+    Returns
+    -------
+    realizations : dict
+        The dictionary with the `logvol`, `logwt`, `logz`, `logzerr` and
+        `information` arrays of shape (nrealizations, nsamps) for the
+        "jittered" prior volume realizations.
+
+    """
+
+    if rstate is None:
+        rstate = get_random_generator()
+
+    nsamps, samples_n = _get_nsamps_samples_n(res)
+    if approx:
+        nlive_flag = np.ones(nsamps, dtype=bool)
+        nlive_start, bounds = [], []
+    else:
+        nlive_flag, nlive_start, bounds = _find_decrease(samples_n)
+
+    # See jitter_run() for the explanations
+    t_arr = np.zeros((nrealizations, nsamps))
+    t_arr[:, nlive_flag] = rstate.beta(a=samples_n[nlive_flag],
+                                       b=1,
+                                       size=(nrealizations,
+                                             nlive_flag.sum()))
+    for nstart, bound in zip(nlive_start, bounds):
+        sn = samples_n[bound[0]:bound[1]]
+        y_arr = rstate.exponential(scale=1.0,
+                                   size=(nrealizations, nstart + 1))
+        ycsum = y_arr.cumsum(axis=1)
+        ycsum /= ycsum[:, -1:]
+        uorder = ycsum[:, np.append(nstart, sn - 1)]
+        t_arr[:, bound[0]:bound[1]] = uorder[:, 1:] / uorder[:, :-1]
+    logvol = np.log(t_arr).cumsum(axis=1)
+
+    (saved_logwt, saved_logz, saved_logzvar,
+     saved_h) = compute_integrals(logl=res.logl, logvol=logvol)
+    return dict(logvol=logvol,
+                logwt=saved_logwt,
+                logz=saved_logz,
+                logzerr=np.sqrt(np.maximum(saved_logzvar, 0)),
+                information=saved_h)
+
+
+def resample_run_batch(res, nrealizations, rstate=None):
+    """
+    Generate many bootstrap realizations of a nested sampling run at once.
+    This is the batched version of :meth:`resample_run`. In each
+    realization the strands (i.e. runs with a single live point) of the run
+    are resampled, so that each sample (dead point) of the original run
+    enters the realization a number of times (including zero). Rather than
+    as the individual :class:`~dynesty.results.Results` instances, the
+    realizations are returned as arrays over the samples of the original
+    run.
+
+    Parameters
+    ----------
+    res : :class:`~dynesty.results.Results` instance
+        The :class:`~dynesty.results.Results` instance taken from a previous
+        nested sampling run.
+
+    nrealizations : int
+        The number of realizations.
+
+    rstate : `~numpy.random.Generator`, optional
+        `~numpy.random.Generator` instance.
+
+    Returns
+    -------
+    realizations : dict
+        The dictionary with the arrays of shape (nrealizations, nsamps).
+        `counts` is the number of times each sample enters the realization,
+        `logwt` is the total ln(weight) of its copies, while `logvol`,
+        `logz`, `logzerr` and `information` are the values after its last
+        copy (or after the preceding samples if it has no copies).
+
+    """
+
+    if rstate is None:
+        rstate = get_random_generator()
+
+    nsamps = len(res.ncall)
+    if res.isdynamic():
+        samples_n = res.samples_n
+        samples_batch = res.samples_batch
+        batch_bounds = res.batch_bounds
+        added_final_live = True
+    else:
+        nlive = res.nlive
+        niter = res.niter
+        if nsamps == niter:
+            samples_n = np.ones(niter, dtype=int) * nlive
+            added_final_live = False
+        elif nsamps == (niter + nlive):
+            samples_n = np.minimum(np.arange(nsamps, 0, -1), nlive)
+            added_final_live = True
+        else:
+            raise ValueError("Final number of samples differs from number of "
+                             "iterations and number of live points.")
+        samples_batch = np.zeros(len(samples_n), dtype=int)
+        batch_bounds = np.array([(-np.inf, np.inf)])
+    batch_llmin = batch_bounds[:, 0]
+    logl = res.logl
+
+    # Identify the strands. The samples of each strand are in the order of
+    # the run
+    ids, strand = np.unique(res.samples_id, return_inverse=True)
+    strand = strand.ravel()
+    nstrands = len(ids)
+    is_base = np.zeros(nstrands, dtype=bool)
+    is_base[strand[batch_llmin[samples_batch] == -np.inf]] = True
+    base_ids = np.nonzero(is_base)[0]
+    addon_ids = np.nonzero(~is_base)[0]
+    nbase, nadd = len(base_ids), len(addon_ids)
+    if nbase == 0 and nadd > 0:
+        raise ValueError("The provided `Results` does not include any points "
+                         "initially sampled from the prior!")
+    elif nbase == 0:
+        raise ValueError("The provided `Results` does not appear to have "
+                         "any particles!")
+    # the lower and upper log-likelihood bounds of the strands
+    first = np.full(nstrands, nsamps)
+    np.minimum.at(first, strand, np.arange(nsamps))
+    lower = batch_llmin[samples_batch[first]]
+    upper = np.full(nstrands, -np.inf)
+    np.maximum.at(upper, strand, logl)
+
+    counts = np.zeros((nrealizations, nsamps), dtype=int)
+    out = {
+        k: np.zeros((nrealizations, nsamps))
+        for k in ['logvol', 'logwt', 'logz', 'logzerr', 'information']
+    }
+    for ireal in range(nrealizations):
+        # Resample strands.
+        picks = base_ids[rstate.integers(0, nbase, size=nbase)]
+        if nadd > 0:
+            picks = np.append(picks,
+                              addon_ids[rstate.integers(0, nadd, size=nadd)])
+        strand_n = np.bincount(picks, minlength=nstrands)
+        cur_counts = strand_n[strand]
+        # the samples of the run are sorted in logl, so the copies of
+        # the samples are sorted as well
+        samp_idx = np.repeat(np.arange(nsamps), cur_counts)
+        cur_logl = logl[samp_idx]
+        cur_nsamps = len(samp_idx)
+        if added_final_live:
+            # see resample_run() for the explanations
+            samp_n = np.zeros(cur_nsamps + 1, dtype=int)
+            used = np.nonzero(strand_n)[0]
+            used_n = strand_n[used]
+            left = np.searchsorted(cur_logl, lower[used], side='right')
+            endl = np.searchsorted(cur_logl, upper[used], side='left')
+            endr = np.searchsorted(cur_logl, upper[used], side='right')
+            sel = endl > left
+            np.add.at(samp_n, left[sel], used_n[sel])
+            np.add.at(samp_n, endl[sel], -used_n[sel])
+            samp_n = np.cumsum(samp_n)[:-1]
+            # the final points of the strands
+            endsel_n = endr - endl
+            pos = np.arange(endsel_n.sum()) - np.repeat(
+                np.cumsum(endsel_n) - endsel_n, endsel_n)
+            chunk = np.repeat(endsel_n / used_n, endsel_n)
+            nlive_end = np.array(
+                (np.repeat(endsel_n, endsel_n) - 1 - pos) / chunk,
+                dtype=int) + 1
+            np.add.at(samp_n, np.repeat(endl, endsel_n) + pos, nlive_end)
+        else:
+            samp_n = samples_n[samp_idx]
+        cur_logvol = np.cumsum(np.log(samp_n / (samp_n + 1.)))
+        (cur_logwt, cur_logz, cur_logzvar,
+         cur_h) = compute_integrals(logl=cur_logl, logvol=cur_logvol)
+        # Map the copies back to the original samples
+        last = np.cumsum(cur_counts) - 1
+        prev = np.maximum(last, 0)
+        empty = last < 0
+        for key, val, init in [('logvol', cur_logvol, 0.),
+                               ('logz', cur_logz, -np.inf),
+                               ('logzerr', np.sqrt(np.maximum(cur_logzvar,
+                                                              0)), 0.),
+                               ('information', cur_h, 0.)]:
+            out[key][ireal] = np.where(empty, init, val[prev])
+        logwt = np.full(nsamps, -np.inf)
+        used = cur_counts > 0
+        logwt[used] = np.logaddexp.reduceat(cur_logwt,
+                                            (last - cur_counts + 1)[used])
+        out['logwt'][ireal] = logwt
+        counts[ireal] = cur_counts
+    out['counts'] = counts
+    return out
+
+
 def reweight_run(res, logp_new, logp_old=None):
     """
     Reweight a given run based on a new target distribution.
@@ -1682,16 +2293,38 @@ def unravel_run(res, print_progress=True):
     return new_res
 
 
+def _load_run(res):
+    """
+    Return the :class:`~dynesty.results.Results` instance given either
+    the results or the name of the file with the pickled results
+    """
+    if isinstance(res, (str, os.PathLike)):
+        with open(res, 'rb') as fp:
+            res = pickle_module.load(fp)
+    if isinstance(res, dict):
+        res = Results(res)
+    return res
+
+
 def merge_runs(res_list, print_progress=True):
     """
     Merges a set of runs with differing (possibly variable) numbers of
     live points into one run.
 
+    All the runs are merged in a single pass: the dead points of all the
+    runs are ordered by their log-likelihoods and the number of live points
+    at each point is the sum of the live points of the runs that are
+    "active" at this log-likelihood (i.e. the runs whose lowest
+    log-likelihood bound is below it).
+
     Parameters
     ----------
-    res_list : list of :class:`~dynesty.results.Results` instances
+    res_list : iterable of :class:`~dynesty.results.Results` instances
         A list of :class:`~dynesty.results.Results` instances returned from
-        previous runs.
+        previous runs. The runs can also be given as the names of files
+        with the pickled results. In that case each of the runs is read
+        from disk when needed, so the whole set of runs is never kept
+        in memory.
 
     print_progress : bool, optional
         Whether to output the current progress to `~sys.stderr`.
@@ -1704,66 +2337,144 @@ def merge_runs(res_list, print_progress=True):
 
     """
 
+    res_list = list(res_list)
     ntot = len(res_list)
-    counter = 0
-
-    # Establish our set of baseline runs and "add-on" runs.
-    rlist_base = []
-    rlist_add = []
-    for r in res_list:
-        try:
-            if np.any(r.samples_batch == 0):
-                rlist_base.append(r)
-            else:
-                rlist_add.append(r)
-        except AttributeError:
-            rlist_base.append(r)
-    nbase, nadd = len(rlist_base), len(rlist_add)
-    if nbase == 1 and nadd == 1:
-        rlist_base = res_list
-        rlist_add = []
-
-    # Merge baseline runs while there are > 2 remaining results.
-    if len(rlist_base) > 1:
-        while len(rlist_base) > 2:
-            rlist_new = []
-            nruns = len(rlist_base)
-            i = 0
-            while i < nruns:
-                try:
-                    # Ignore posterior quantities while merging the runs.
-                    r1, r2 = rlist_base[i], rlist_base[i + 1]
-                    res = _merge_two(r1, r2, compute_aux=False)
-                    rlist_new.append(res)
-                except IndexError:
-                    # Append the odd run to the new list.
-                    rlist_new.append(rlist_base[i])
-                i += 2
-                counter += 1
-                # Print progress.
-                if print_progress:
-                    sys.stderr.write(f'\rMerge: {counter}/{ntot}     ')
-            # Overwrite baseline set of results with merged results.
-            rlist_base = copy.copy(rlist_new)
-
-        # Compute posterior quantities after merging the final baseline runs.
-        res = _merge_two(rlist_base[0], rlist_base[1], compute_aux=True)
-    else:
-        res = rlist_base[0]
-
-    # Iteratively merge any remaining "add-on" results.
-    nruns = len(rlist_add)
-    for i, r in enumerate(rlist_add):
-        if i < nruns - 1:
-            res = _merge_two(res, r, compute_aux=False)
+    if ntot == 1:
+        return check_result_static(_load_run(res_list[0]))
+
+    # The first pass over the runs where we collect the information
+    # required to order the samples and compute the number of live points
+    info = {k: [] for k in ['id', 'logl', 'nc', 'it', 'n', 'batch']}
+    bounds, lowedges, sizes = [], [], []
+    # the samples of the runs that are already in memory
+    run_data = []
+    for i, r in enumerate(res_list):
+        res = _load_run(r)
+        run_nlive, run_info = _prepare_for_merge(res)
+        run_info['n'] = run_nlive
+        for k in info.keys():
+            info[k].append(np.asarray(run_info[k]))
+        bounds.append(np.asarray(run_info['bounds']))
+        lowedges.append(np.min(run_info['bounds'][run_info['batch']]))
+        sizes.append(len(run_info['id']))
+        if isinstance(r, (str, os.PathLike)):
+            run_data.append(None)
         else:
-            res = _merge_two(res, r, compute_aux=True)
-        counter += 1
+            run_data.append((run_info['u'], run_info['v'], run_info['blob']))
+        del res, run_info
         # Print progress.
         if print_progress:
-            sys.stderr.write(f'\rMerge: {counter}/{ntot}     ')
+            sys.stderr.write(f'\rMerge: {i + 1}/{ntot}     ')
+    info = {k: np.concatenate(v) for k, v in info.items()}
+    sizes = np.array(sizes)
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    lowedges = np.array(lowedges)
+    nsamps = sizes.sum()
+    run_id = np.repeat(np.arange(ntot), sizes)
+
+    # Order the samples. The stable sort places the samples of the
+    # runs earlier in the list first if the log-likelihoods are equal
+    order = np.argsort(info['logl'], kind='stable')
+    logl = info['logl'][order]
+    # The position of each sample in the combined run
+    pos = np.empty(nsamps, dtype=int)
+    pos[order] = np.arange(nsamps)
+
+    # The number of live points is the sum of the number of live
+    # points of the next samples of each active run. A run becomes
+    # active once the log-likelihood goes above its lower bound.
+    # We track the changes of that sum with the increments and then
+    # take the cumulative sum
+    start = np.searchsorted(logl, lowedges, side='right')
+    run_start = start[run_id]
+    dnlive = np.zeros(nsamps + 1, dtype=int)
+    # The runs becoming active
+    nskip = np.bincount(run_id[pos < run_start], minlength=ntot)
+    active = (nskip < sizes) & (start < nsamps)
+    np.add.at(dnlive, start[active], info['n'][offsets[active] +
+                                               nskip[active]])
+    # The next sample of the active run is taken
+    next_n = np.append(info['n'][1:], 0)
+    next_n[offsets[1:] - 1] = 0
+    sel = pos + 1 >= run_start
+    np.add.at(dnlive, pos[sel] + 1, (next_n - info['n'])[sel])
+    nlive = np.cumsum(dnlive)[:nsamps]
+    # The samples of the run below its lower bound are counted as well
+    sel = pos < run_start
+    nlive[pos[sel]] += info['n'][sel]
+
+    logvol = _combined_logvol(logl, nlive, 0.)
+
+    # These are merged batch bounds
+    combined_bounds = np.unique(np.concatenate(bounds), axis=0)
+    # Here we find where the bounds of each run are in the combined bounds
+    batch = np.empty(nsamps, dtype=int)
+    for i in range(ntot):
+        bound_map = np.array([
+            np.where(np.all(cur == combined_bounds, axis=1))[0][0]
+            for cur in bounds[i]
+        ])
+        cur_slice = slice(offsets[i], offsets[i] + sizes[i])
+        batch[cur_slice] = bound_map[info['batch'][cur_slice]]
+    batch = batch[order]
+
+    # The second pass where we put the samples into the combined run
+    samples_u, samples_v, blob = None, None, None
+    for i, r in enumerate(res_list):
+        if run_data[i] is None:
+            res = _load_run(r)
+            cur_u, cur_v, cur_blob = res.samples_u, res.samples, res.blob
+            del res
+        else:
+            cur_u, cur_v, cur_blob = run_data[i]
+            run_data[i] = None
+        cur_u, cur_v, cur_blob = [
+            np.asarray(_) for _ in (cur_u, cur_v, cur_blob)
+        ]
+        if samples_u is None:
+            samples_u = np.empty((nsamps, ) + cur_u.shape[1:],
+                                 dtype=cur_u.dtype)
+            samples_v = np.empty((nsamps, ) + cur_v.shape[1:],
+                                 dtype=cur_v.dtype)
+            blob = np.empty((nsamps, ) + cur_blob.shape[1:],
+                            dtype=cur_blob.dtype)
+        cur_pos = pos[offsets[i]:offsets[i] + sizes[i]]
+        samples_u[cur_pos] = cur_u
+        samples_v[cur_pos] = cur_v
+        blob[cur_pos] = cur_blob
+
+    ncall = info['nc'][order]
+    samples_id = info['id'][order]
+    # Compute sampling efficiency.
+    eff = 100. * nsamps / sum(ncall)
 
-    res = check_result_static(res)
+    # Save results.
+    r = dict(niter=nsamps,
+             ncall=ncall,
+             eff=eff,
+             samples=samples_v,
+             logl=logl,
+             logvol=logvol,
+             batch_bounds=combined_bounds,
+             blob=blob,
+             samples_id=samples_id,
+             samples_it=info['it'][order],
+             samples_n=nlive,
+             samples_u=samples_u,
+             samples_batch=batch)
+
+    # Compute the posterior quantities of interest.
+    (r['logwt'], r['logz'], combined_logzvar,
+     r['information']) = compute_integrals(logvol=r['logvol'], logl=r['logl'])
+    r['logzerr'] = np.sqrt(np.maximum(combined_logzvar, 0))
+
+    # Compute batch information: the number of unique point ids
+    # in each batch
+    batch_id = np.unique(np.column_stack((batch, samples_id)), axis=0)
+    r['batch_nlive'] = np.unique(batch_id[:, 0],
+                                 return_counts=True)[1].astype(int)
+
+    res = check_result_static(Results(r))
 
     return res
 
@@ -1909,187 +2620,6 @@ def _prepare_for_merge(res):
     return run_nlive, run_info
 
 
-def _merge_two(res1, res2, compute_aux=False):
-    """
-    Internal method used to merges two runs with differing (possibly variable)
-    numbers of live points into one run.
-
-    Parameters
-    ----------
-    res1 : :class:`~dynesty.results.Results` instance
-        The "base" nested sampling run.
-
-    res2 : :class:`~dynesty.results.Results` instance
-        The "new" nested sampling run.
-
-    compute_aux : bool, optional
-        Whether to compute auxiliary quantities (evidences, etc.) associated
-        with a given run. **WARNING: these are only valid if `res1` or `res2`
-        was initialized from the prior *and* their sampling bounds overlap.**
-        Default is `False`.
-
-    Returns
-    -------
-    res : :class:`~dynesty.results.Results` instances
-        :class:`~dynesty.results.Results` instance from the newly combined
-        nested sampling run.
-
-    """
-    base_nlive, base_info = _prepare_for_merge(res1)
-    new_nlive, new_info = _prepare_for_merge(res2)
-    base_nsamples = len(base_info['id'])
-    new_nsamples = len(new_info['id'])
-    # Initialize our new combined run.
-    combined_info = dict()
-    for curk in [
-            'id', 'u', 'v', 'logl', 'logvol', 'logwt', 'logz', 'logzvar', 'h',
-            'nc', 'it', 'n', 'batch', 'blob'
-    ]:
-        combined_info[curk] = []
-
-    # These are merged batch bounds
-    combined_bounds = np.unique(np.concatenate(
-        (base_info['bounds'], new_info['bounds'])),
-                                axis=0)
-    # Here we try to find where the new bounds are in the combined bounds
-    new_bound_map = {}
-    base_bound_map = {}
-    for i in range(len(new_info['bounds'])):
-        new_bound_map[i] = np.where(
-            np.all(new_info['bounds'][i] == combined_bounds, axis=1))[0][0]
-    for i in range(len(base_info['bounds'])):
-        base_bound_map[i] = np.where(
-            np.all(base_info['bounds'][i] == combined_bounds, axis=1))[0][0]
-
-    base_lowedge = np.min(base_info['bounds'][base_info['batch']])
-    new_lowedge = np.min(new_info['bounds'][new_info['batch']])
-
-    # Iteratively walk through both set of samples to simulate
-    # a combined run.
-    combined_nsamples = base_nsamples + new_nsamples
-    # Start our counters at the beginning of each set of dead points.
-    base_idx, new_idx = 0, 0
-    for i in range(combined_nsamples):
-        # Attempt to step along our samples. If we're out of samples,
-        # set values to defaults.
-        if base_idx < base_nsamples:
-            base_cur_logl = base_info['logl'][base_idx]
-            base_cur_nlive = base_nlive[base_idx]
-        else:
-            base_cur_logl = np.inf
-            base_cur_nlive = 0
-            # TODO this is potentially incorrect
-            # It is not clear what nlive should be when we
-            # are past the end of one of the run
-        if new_idx < new_nsamples:
-            new_cur_logl = new_info['logl'][new_idx]
-            new_cur_nlive = new_nlive[new_idx]
-        else:
-            new_cur_logl = np.inf
-            new_cur_nlive = 0
-
-        if base_cur_logl > new_lowedge and new_cur_logl > base_lowedge:
-            # If our samples from the both runs are past the each others'
-            # lower log-likelihood bound, both runs are now "active".
-            cur_nlive = base_cur_nlive + new_cur_nlive
-        elif base_cur_logl <= new_lowedge:
-            # If instead our collection of dead points from the "base" run
-            # are below the bound, just use those.
-            cur_nlive = base_cur_nlive
-        else:
-            # Our collection of dead points from the "new" run
-            # are below the bound, so just use those.
-            cur_nlive = new_cur_nlive
-
-        # Increment our position along depending on
-        # which dead point (saved or new) is worse.
-
-        if base_cur_logl <= new_cur_logl:
-            add_idx = base_idx
-            from_run = base_info
-            from_map = base_bound_map
-            base_idx += 1
-        else:
-            add_idx = new_idx
-            from_run = new_info
-            from_map = new_bound_map
-            new_idx += 1
-        combined_info['batch'].append(from_map[from_run['batch'][add_idx]])
-
-        for curk in ['id', 'u', 'v', 'logl', 'nc', 'it', 'blob']:
-            combined_info[curk].append(from_run[curk][add_idx])
-
-        combined_info['n'].append(cur_nlive)
-
-    plateau_mode = False
-    plateau_counter = 0
-    plateau_logdvol = 0
-    logvol = 0.
-    logl_array = np.array(combined_info['logl'])
-    nlive_array = np.array(combined_info['n'])
-    for i, (curl, nlive) in enumerate(zip(logl_array, nlive_array)):
-        # Save the number of live points and expected ln(volume).
-        if not plateau_mode:
-            plateau_mask = (logl_array[i:] == curl)
-            nplateau = plateau_mask.sum()
-            if nplateau > 1:
-                # the number of live points should not change throughout
-                # the plateau
-                # assert np.ptp(nlive_array[i:][plateau_mask]) == 0
-                # TODO currently I disabled this check
-
-                plateau_counter = nplateau
-                plateau_logdvol = logvol + np.log(1. / (nlive + 1))
-                plateau_mode = True
-        if not plateau_mode:
-            logvol -= math.log((nlive + 1.) / nlive)
-        else:
-            logvol = logvol + np.log1p(-np.exp(plateau_logdvol - logvol))
-        combined_info['logvol'].append(logvol)
-        if plateau_mode:
-            plateau_counter -= 1
-            if plateau_counter == 0:
-                plateau_mode = False
-    # Compute sampling efficiency.
-    eff = 100. * combined_nsamples / sum(combined_info['nc'])
-
-    # Save results.
-    r = dict(niter=combined_nsamples,
-             ncall=np.asarray(combined_info['nc']),
-             eff=eff,
-             samples=np.asarray(combined_info['v']),
-             logl=np.asarray(combined_info['logl']),
-             logvol=np.asarray(combined_info['logvol']),
-             batch_bounds=np.asarray(combined_bounds),
-             blob=np.asarray(combined_info['blob']))
-
-    for curk in ['id', 'it', 'n', 'u', 'batch']:
-        r['samples_' + curk] = np.asarray(combined_info[curk])
-
-    # Compute the posterior quantities of interest if desired.
-    if compute_aux:
-
-        (r['logwt'], r['logz'], combined_logzvar,
-         r['information']) = compute_integrals(logvol=r['logvol'],
-                                               logl=r['logl'])
-        r['logzerr'] = np.sqrt(np.maximum(combined_logzvar, 0))
-
-        # Compute batch information.
-        combined_id = np.asarray(combined_info['id'])
-        batch_nlive = [
-            len(np.unique(combined_id[combined_info['batch'] == i]))
-            for i in np.unique(combined_info['batch'])
-        ]
-
-        # Add to our results.
-        r['batch_nlive'] = np.array(batch_nlive, dtype=int)
-
-    # Combine to form final results object.
-    res = Results(r)
-
-    return res
-
-
 def _kld_error(args):
     """ Internal `pool.map`-friendly wrapper for :meth:`kld_error`
     used by :meth:`stopping_function`."""
@@ -2104,6 +2634,25 @@ def _kld_error(args):
                      approx=approx)
 
 
+def _realizations_logz(args):
+    """ Internal `pool.map`-friendly function computing the final
+    ln(evidence) of a batch of realizations of the run
+    (see :meth:`jitter_run_batch` and :meth:`resample_run_batch`)
+    used by :meth:`stopping_function`."""
+
+    # Extract arguments.
+    results, error, approx, nrealizations, rseed = args
+    rstate = get_random_generator(rseed)
+    if error == 'jitter':
+        ret = jitter_run_batch(results,
+                               nrealizations,
+                               rstate=rstate,
+                               approx=approx)
+    else:
+        ret = resample_run_batch(results, nrealizations, rstate=rstate)
+    return ret['logz'][:, -1]
+
+
 def old_stopping_function(results,
                           args=None,
                           rstate=None,
@@ -2298,6 +2847,15 @@ def save_sampler(sampler, fname):
         'version': DYNESTY_VERSION,
         'format_version': format_version
     }
+    _save_pickle(D, fname)
+
+
+def _save_pickle(D, fname):
+    """
+    Pickle the object into the file. The file is written under a
+    temporary name first, so that the existing file is not corrupted
+    if the writing is interrupted
+    """
     tmp_fname = fname + '.tmp'
     try:
         with open(tmp_fname, 'wb') as fp:
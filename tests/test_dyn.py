@@ -1,6 +1,8 @@
 import numpy as np
+import pytest
 import dynesty
-from utils import get_rstate, get_printing
+import dynesty.pool
+from utils import get_rstate, get_printing, NullContextManager
 """
 This is a hard test of dynamic sampling with the 2d eggbox
 """
@@ -40,3 +42,71 @@ def test_dyn():
     assert (abs(LOGZ_TRUTH - sampler.results.logz[-1]) <
             THRESHOLD * sampler.results.logzerr[-1])
     print(sampler.citations)
+
+
+
+def loglike_gau(x):
+    return -0.5 * np.sum(x**2)
+
+
+def prior_transform_gau(x):
+    return 20 * x - 10
+
+
+@pytest.mark.parametrize('withpool', [False, True])
+def test_dyn_concurrent(withpool):
+    # batches planned from one weight evaluation and sampled concurrently
+    ndim = 3
+    THRESHOLD = 5  # in sigmas
+    logz_truth = -ndim * np.log(20) + 0.5 * ndim * np.log(2 * np.pi)
+    rstate = get_rstate()
+    with (dynesty.pool.Pool(2, loglike_gau, prior_transform_gau)
+          if withpool else NullContextManager()) as pool:
+        if withpool:
+            kw = dict(pool=pool)
+            logl, ptform = pool.loglike, pool.prior_transform
+        else:
+            kw = {}
+            logl, ptform = loglike_gau, prior_transform_gau
+        sampler = dynesty.DynamicNestedSampler(logl,
+                                               ptform,
+                                               ndim,
+                                               nlive=100,
+                                               rstate=rstate,
+                                               **kw)
+        sampler.run_nested(maxbatch=5,
+                           use_stop=False,
+                           nbatch_concurrent=2,
+                           print_progress=printing)
+    res = sampler.results
+    assert sampler.batch == 5
+    assert len(res.batch_bounds) == 6
+    # the batches sampled together are ordered in likelihood
+    assert res.batch_bounds[1][1] <= res.batch_bounds[2][1]
+    assert (abs(logz_truth - res.logz[-1]) < THRESHOLD * res.logzerr[-1])
+
+
+def test_combined_logvol():
+    # compare the ln(volumes) of the combined run with the
+    # sequential computation including the plateaus
+    rstate = get_rstate()
+    logl = np.sort(np.round(rstate.uniform(size=1000) * 300) / 3)
+    logl[:10] = -np.inf
+    nlive = rstate.integers(50, 100, size=len(logl))
+    logvol_init = np.log(0.9)
+    logvol = dynesty.utils._combined_logvol(logl, nlive, logvol_init)
+    ref = []
+    cur = logvol_init
+    i = 0
+    while i < len(logl):
+        nplateau = (logl == logl[i]).sum()
+        if nplateau == 1:
+            cur -= np.log((nlive[i] + 1.) / nlive[i])
+            ref.append(cur)
+        else:
+            logdvol = cur + np.log(1. / (nlive[i] + 1))
+            for _ in range(nplateau):
+                cur = cur + np.log1p(-np.exp(logdvol - cur))
+                ref.append(cur)
+        i += nplateau
+    assert np.allclose(logvol, ref, rtol=1e-12, atol=0)
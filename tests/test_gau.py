@@ -77,6 +77,8 @@ class Gaussian:
                              np.log(linalg.det(self.cov)))
         self.prior_win = prior_win  # +/- on both sides
         self.logz_truth = self.ndim * (-np.log(2 * self.prior_win))
+        self.nslow = 0
+        self.nfast = 0
 
     # 3-D correlated multivariate normal log-likelihood
     def loglikelihood(self, x):
@@ -101,6 +103,23 @@ class Gaussian:
 
         return ret
 
+    def loglikelihood_vec(self, x):
+        """Vectorized multivariate normal log-likelihood."""
+        assert x.ndim == 2
+        return np.array([self.loglikelihood(_) for _ in x])
+
+    def slow_part(self, x):
+        """Expensive part of the log-likelihood depending on
+        the first two parameters"""
+        self.nslow += 1
+        return x[:2] - self.mean[:2]
+
+    def loglikelihood_fast(self, x, dx_slow):
+        """Multivariate normal log-likelihood using the slow part."""
+        self.nfast += 1
+        dx = np.concatenate((dx_slow, x[2:] - self.mean[2:]))
+        return -0.5 * np.dot(dx, np.dot(self.cov_inv, dx)) + self.lnorm
+
     # gradient (no jacobian)
     def grad_x(self, x):
         """Multivariate normal log-likelihood gradient."""
@@ -310,6 +329,20 @@ def test_hslice_nograd():
     check_results_gau(sampler.results, g, rstate)
 
 
+def test_hslice_vectorized():
+    rstate = get_rstate()
+    g = Gaussian()
+    sampler = dynesty.NestedSampler(g.loglikelihood_vec,
+                                    g.prior_transform,
+                                    g.ndim,
+                                    nlive=nlive,
+                                    sample='hslice',
+                                    vectorized=True,
+                                    rstate=rstate)
+    sampler.run_nested(print_progress=printing)
+    check_results_gau(sampler.results, g, rstate)
+
+
 @pytest.mark.parametrize("dyn", [False, True])
 def test_hslice_grad(dyn):
     rstate = get_rstate()
@@ -347,6 +380,114 @@ def test_hslice_grad1():
     check_results_gau(sampler.results, g, rstate)
 
 
+@pytest.mark.parametrize("dyn,jac", [(False, False), (False, True),
+                                     (True, False)])
+def test_hmc(dyn, jac):
+    rstate = get_rstate()
+    g = Gaussian()
+    if dyn:
+        CL = dynesty.DynamicNestedSampler
+        kw = dict(dlogz_init=1, n_effective=100)
+        # otherwise it's too slow
+    else:
+        CL = dynesty.NestedSampler
+        kw = {}
+    if jac:
+        grad = g.grad_x
+    else:
+        grad = g.grad_u
+    sampler = CL(g.loglikelihood,
+                 g.prior_transform,
+                 g.ndim,
+                 nlive=nlive,
+                 sample='hmc',
+                 gradient=grad,
+                 compute_jac=jac,
+                 rstate=rstate)
+    sampler.run_nested(print_progress=printing, **kw)
+    check_results_gau(sampler.results, g, rstate)
+
+
+def test_hmc_nograd():
+    g = Gaussian()
+    with pytest.raises(ValueError):
+        dynesty.NestedSampler(g.loglikelihood,
+                              g.prior_transform,
+                              g.ndim,
+                              nlive=nlive,
+                              sample='hmc')
+
+
+@pytest.mark.parametrize("dyn,sample", [(False, 'rwalk'), (False, 'slice'),
+                                        (False, 'rslice'), (True, 'rslice')])
+def test_blocks(dyn, sample):
+    # test the fast/slow parameter blocks with the cached slow part
+    rstate = get_rstate()
+    g = Gaussian()
+    if dyn:
+        cls = dynesty.DynamicNestedSampler
+    else:
+        cls = dynesty.NestedSampler
+    sampler = cls(g.loglikelihood_fast,
+                  g.prior_transform,
+                  g.ndim,
+                  nlive=nlive,
+                  sample=sample,
+                  blocks=[[2], [0, 1]],
+                  block_costs=[1, 5],
+                  slow_function=g.slow_part,
+                  rstate=rstate)
+    if dyn:
+        sampler.run_nested(maxbatch=1, print_progress=printing)
+    else:
+        sampler.run_nested(print_progress=printing)
+    check_results_gau(sampler.results, g, rstate)
+    # the fast parameter is oversampled and reuses the slow part
+    assert g.nslow < 0.5 * g.nfast
+
+
+def test_blocks_wrong():
+    g = Gaussian()
+    for kw in [
+            dict(blocks=[[0, 1], [1, 2]]),
+            dict(blocks=[[0, 1], [2]], block_costs=[1]),
+            dict(blocks=[[0, 1], [2]], sample='hslice'),
+            dict(blocks=[[0, 1, 2]], slow_function=g.slow_part)
+    ]:
+        with pytest.raises(ValueError):
+            dynesty.NestedSampler(g.loglikelihood_fast, g.prior_transform,
+                                  g.ndim, **kw)
+
+
+@pytest.mark.parametrize("dyn", [False, True])
+def test_surrogate(dyn):
+    # test the surrogate pre-screening of rwalk proposals
+    rstate = get_rstate()
+    g = Gaussian()
+    if dyn:
+        cls = dynesty.DynamicNestedSampler
+    else:
+        cls = dynesty.NestedSampler
+    sampler = cls(g.loglikelihood,
+                  g.prior_transform,
+                  g.ndim,
+                  nlive=nlive,
+                  sample='rwalk',
+                  surrogate=True,
+                  rstate=rstate)
+    if dyn:
+        sampler.run_nested(maxbatch=1, print_progress=printing)
+    else:
+        sampler.run_nested(print_progress=printing)
+    check_results_gau(sampler.results, g, rstate)
+    with pytest.raises(ValueError):
+        cls(g.loglikelihood,
+            g.prior_transform,
+            g.ndim,
+            sample='rslice',
+            surrogate=True)
+
+
 def test_dynamic():
     # check dynamic nested sampling behavior
     rstate = get_rstate()
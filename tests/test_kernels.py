@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from utils import get_rstate
+
+import dynesty._kernels as dykernels
+from dynesty import bounding
+from dynesty import sampling
+from dynesty import utils as dyfunc
+"""
+Check that the compiled kernels (or their pure python versions if numba
+is not available) give the same results and consume the random numbers
+in exactly the same way as the numpy code.
+
+"""
+
+
+def run_both(func):
+    """
+    Run the function with a freshly seeded random generator using
+    the numpy code and using the kernels. Return the outputs
+    and the states of random generators
+    """
+    ret = []
+    enabled = dykernels.ENABLED
+    try:
+        for flag in [False, True]:
+            dykernels.ENABLED = flag
+            rstate = get_rstate()
+            out = func(rstate)
+            ret.append((out, rstate.bit_generator.state))
+    finally:
+        dykernels.ENABLED = enabled
+    (out1, state1), (out2, state2) = ret
+    assert state1 == state2
+    return out1, out2
+
+
+def test_randsphere():
+    for n in [1, 2, 5, 20]:
+        out1, out2 = run_both(lambda rstate: [
+            bounding.randsphere(n, rstate=rstate) for _ in range(100)
+        ])
+        assert np.allclose(out1, out2, rtol=1e-14, atol=0)
+
+
+def test_rand_choice():
+    pb = np.array([0.1, 0.2, 0.3, 0.4])
+    out1, out2 = run_both(
+        lambda rstate: [bounding.rand_choice(pb, rstate) for _ in range(1000)])
+    assert out1 == out2
+
+
+def test_unitcheck_reflect():
+    rstate = get_rstate()
+    nonbounded = np.array([True, False, True])
+    pts = rstate.uniform(-1, 2, size=(1000, 3))
+    for nb in [None, nonbounded]:
+        out1, out2 = run_both(
+            lambda rstate: [dyfunc.unitcheck(_, nb) for _ in pts])
+        assert out1 == out2
+    out1, out2 = run_both(
+        lambda rstate: [dyfunc.apply_reflect(_.copy()) for _ in pts])
+    assert np.allclose(out1, out2, rtol=1e-14, atol=0)
+
+
+@pytest.mark.parametrize('periodic,reflective,n_cluster',
+                         [(None, None, 3), ([0], [2], 3), ([1], None, 2)])
+def test_propose_ball_point(periodic, reflective, n_cluster):
+    n = 3
+    nonbounded = dyfunc.get_nonbounded(n, periodic, reflective)
+    u = np.array([0.1, 0.5, 0.9])
+    axes = np.array([[0.3, 0., 0.], [0.1, 0.2, 0.], [0., 0.1, 0.3]])
+    axes = axes[:n_cluster, :n_cluster]
+
+    def func(rstate):
+        return [
+            sampling.propose_ball_point(u,
+                                        1.,
+                                        axes,
+                                        n,
+                                        n_cluster,
+                                        rstate=rstate,
+                                        periodic=periodic,
+                                        reflective=reflective,
+                                        nonbounded=nonbounded)
+            for _ in range(1000)
+        ]
+
+    out1, out2 = run_both(func)
+    for (u1, fail1), (u2, fail2) in zip(out1, out2):
+        assert fail1 == fail2
+        if not fail1:
+            assert np.allclose(u1, u2, rtol=1e-14, atol=0)
+
+
+def loglike(x):
+    return -0.5 * np.sum(x**2)
+
+
+def prior_transform(u):
+    return 20 * u - 10
+
+
+@pytest.mark.parametrize('sample', ['rwalk', 'slice', 'rslice'])
+def test_sampler_rng(sample):
+    # the full proposal of a new point consumes the same random numbers
+    func = {
+        'rwalk': sampling.sample_rwalk,
+        'slice': sampling.sample_slice,
+        'rslice': sampling.sample_rslice
+    }[sample]
+
+    def run(rstate):
+        args = sampling.SamplerArgument(u=np.array([0.5, 0.52, 0.48]),
+                                        loglstar=-10,
+                                        axes=np.eye(3) * 0.1,
+                                        scale=1.,
+                                        prior_transform=prior_transform,
+                                        loglikelihood=loglike,
+                                        rseed=rstate,
+                                        kwargs={})
+        return func(args)
+
+    out1, out2 = run_both(run)
+    assert np.allclose(out1[0], out2[0], rtol=1e-12, atol=0)
+    assert out1[3] == out2[3]
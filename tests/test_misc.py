@@ -2,6 +2,7 @@ import numpy as np
 import pytest
 import dynesty
 import pickle
+import time
 from scipy import linalg
 import dynesty.utils as dyutil
 from multiprocessing import Pool
@@ -359,7 +360,8 @@ def test_oldstop():
                        print_progress=printing)
 
 
-def test_stop_nmc():
+@pytest.mark.parametrize('error', ['jitter', 'resample'])
+def test_stop_nmc(error):
     # test stopping relying in n_mc
     ndim = 2
     rstate = get_rstate()
@@ -370,10 +372,57 @@ def test_stop_nmc():
                                            rstate=rstate)
     sampler.run_nested(dlogz_init=1,
                        n_effective=None,
-                       stop_kwargs=dict(n_mc=25),
+                       stop_kwargs=dict(n_mc=25, error=error),
                        print_progress=printing)
 
 
+@pytest.mark.parametrize('dyn', [False, True])
+def test_realizations_batch(dyn):
+    # many realizations of the run at once
+    ndim = 2
+    rstate = get_rstate()
+    if dyn:
+        sampler = dynesty.DynamicNestedSampler(loglike,
+                                               prior_transform,
+                                               ndim,
+                                               nlive=nlive,
+                                               rstate=rstate)
+        sampler.run_nested(maxbatch=2,
+                           use_stop=False,
+                           print_progress=printing)
+    else:
+        sampler = dynesty.NestedSampler(loglike,
+                                        prior_transform,
+                                        ndim,
+                                        nlive=nlive,
+                                        rstate=rstate)
+        sampler.run_nested(print_progress=printing)
+    res = sampler.results
+    nreal = 200
+    nsamps = len(res.logl)
+    for ret in [
+            dyutil.jitter_run_batch(res, nreal, rstate=rstate),
+            dyutil.resample_run_batch(res, nreal, rstate=rstate)
+    ]:
+        for k in ['logvol', 'logwt', 'logz', 'logzerr', 'information']:
+            assert ret[k].shape == (nreal, nsamps)
+        logz = ret['logz'][:, -1]
+        assert np.abs(logz.mean() - res.logz[-1]) < 3 * res.logzerr[-1]
+        assert 0.5 < logz.std() / res.logzerr[-1] < 2
+    # a single realization is the same as from resample_run()
+    seed = 42
+    ret = dyutil.resample_run_batch(res, 1, rstate=get_rstate(seed))
+    res1, idx = dyutil.resample_run(res,
+                                    rstate=get_rstate(seed),
+                                    return_idx=True)
+    assert np.all(ret['counts'][0] == np.bincount(idx, minlength=nsamps))
+    assert np.isclose(ret['logz'][0, -1], res1.logz[-1])
+    jit = dyutil.jitter_run_batch(res, 1, rstate=rstate)
+    assert np.allclose(
+        dyutil.compute_integrals(logl=res.logl, logvol=jit['logvol'][0])[1],
+        jit['logz'][0])
+
+
 @pytest.mark.parametrize('dyn', [False, True])
 def test_results(dyn):
     # test of various results interfaces functionality
@@ -750,6 +799,44 @@ def test_merge(bounds):
     assert np.all(np.abs(stds - 1) < 0.1)
 
 
+def test_merge_files(tmp_path):
+    # merging many runs at once, including the runs read from disk
+    ndim = 2
+    rstate = get_rstate()
+    res_list = []
+    for i in range(4):
+        sampler = dynesty.NestedSampler(loglike,
+                                        prior_transform,
+                                        ndim,
+                                        nlive=50 + 10 * i,
+                                        rstate=rstate)
+        sampler.run_nested(print_progress=printing, add_live=i != 1)
+        res_list.append(sampler.results)
+    sampler = dynesty.DynamicNestedSampler(loglike,
+                                           prior_transform,
+                                           ndim,
+                                           nlive=50,
+                                           rstate=rstate)
+    sampler.run_nested(maxbatch=2, use_stop=False, print_progress=printing)
+    res_list.append(sampler.results)
+    fnames = []
+    for i, res in enumerate(res_list):
+        fname = str(tmp_path / f'run{i}.pkl')
+        with open(fname, 'wb') as fp:
+            pickle.dump(res, fp)
+        fnames.append(fname)
+    res1 = dyutil.merge_runs(res_list, print_progress=printing)
+    res2 = dyutil.merge_runs(fnames[:2] + res_list[2:],
+                             print_progress=printing)
+    assert res1.niter == sum(len(_.logl) for _ in res_list)
+    assert np.all(np.diff(res1.logl) >= 0)
+    for k in ['logl', 'logz', 'samples', 'samples_u', 'samples_n']:
+        assert np.all(res1[k] == res2[k])
+    # the evidences of the runs are consistent
+    logz = np.array([_.logz[-1] for _ in res_list])
+    assert np.abs(res1.logz[-1] - logz.mean()) < 3 * res1.logzerr[-1]
+
+
 def test_quantile():
     rstate = get_rstate()
     with pytest.raises(Exception):
@@ -810,3 +897,160 @@ def test_doubling_slice():
                                  sample='rslice',
                                  rstate=rstate)
     samp.run_nested(print_progress=printing)
+
+
+@pytest.mark.parametrize('dyn,sample',
+                         itertools.product([False, True],
+                                           ['rwalk', 'rslice', 'hslice']))
+def test_adaptive_steps(dyn, sample):
+    # test that the number of walks/slices is adapted and recorded
+    ndim = 3
+    rstate = get_rstate()
+    if dyn:
+        cls = dynesty.DynamicNestedSampler
+    else:
+        cls = dynesty.NestedSampler
+    sampler = cls(loglike,
+                  prior_transform,
+                  ndim,
+                  nlive=nlive,
+                  sample=sample,
+                  adaptive_steps=True,
+                  rstate=rstate)
+    if dyn:
+        sampler.run_nested(dlogz_init=1,
+                           maxbatch=1,
+                           print_progress=printing)
+    else:
+        sampler.run_nested(dlogz=1, print_progress=printing)
+    res = sampler.results
+    assert len(res['nsteps']) == len(res['logl'])
+    assert len(np.unique(res['nsteps'])) > 1
+    assert res['nsteps'].min() >= 1
+
+
+def loglike_hang(x):
+    # the evaluation hangs in part of the parameter space
+    if x[0] > 5:
+        time.sleep(100)
+    return -0.5 * np.sum(x**2)
+
+
+@pytest.mark.parametrize('dyn,withpool',
+                         itertools.product([False, True], [False, True]))
+def test_timeout(dyn, withpool):
+    # test that the hanging calls are abandoned and counted
+    ndim = 2
+    rstate = get_rstate()
+    if dyn:
+        cls = dynesty.DynamicNestedSampler
+    else:
+        cls = dynesty.NestedSampler
+    with (Pool(2) if withpool else NullContextManager()) as pool:
+        sampler = cls(loglike_hang,
+                      prior_transform,
+                      ndim,
+                      nlive=nlive,
+                      logl_timeout=0.01,
+                      pool=pool,
+                      queue_size=2 if withpool else None,
+                      rstate=rstate)
+        if dyn:
+            sampler.run_nested(dlogz_init=1,
+                               maxbatch=1,
+                               print_progress=printing)
+        else:
+            sampler.run_nested(dlogz=1, print_progress=printing)
+    res = sampler.results
+    assert res['ntimeout'] > 0
+    # the points in the hanging region are rejected
+    assert np.all(res['logl'][res['samples'][:, 0] > 5] < -1e100)
+
+
+@pytest.mark.parametrize('withpool', [False, True])
+def test_nreplace(withpool):
+    # test replacing several live points at each iteration
+    ndim = 2
+    nreplace = 10
+    rstate = get_rstate()
+    with (Pool(2) if withpool else NullContextManager()) as pool:
+        sampler = dynesty.NestedSampler(loglike,
+                                        prior_transform,
+                                        ndim,
+                                        nlive=nlive,
+                                        nreplace=nreplace,
+                                        pool=pool,
+                                        queue_size=nreplace
+                                        if withpool else None,
+                                        rstate=rstate)
+        sampler.run_nested(dlogz=0.1, print_progress=printing)
+    res = sampler.results
+    logz_truth = np.log(2 * np.pi) - ndim * np.log(2 * size)
+    assert abs(res['logz'][-1] - logz_truth) < 4 * res['logzerr'][-1]
+    # the number of live points decreases within each batch
+    assert np.all(res['samples_n'][:nreplace] == nlive - np.arange(nreplace))
+    assert res['samples_n'][nreplace] == nlive
+    dyutil.jitter_run(res, rstate=rstate)
+    with pytest.raises(ValueError):
+        dynesty.NestedSampler(loglike,
+                              prior_transform,
+                              ndim,
+                              nlive=nlive,
+                              nreplace=nlive)
+
+
+def test_ensemble(tmp_path):
+    # test the ensemble of runs
+    ndim = 2
+    nruns = 4
+    kw = dict(sampler_kwargs=dict(nlive=nlive),
+              run_kwargs=dict(dlogz=1),
+              print_progress=printing)
+    res, runs = dynesty.run_ensemble(loglike,
+                                     prior_transform,
+                                     ndim,
+                                     nruns,
+                                     rstate=get_rstate(),
+                                     **kw)
+    assert len(runs) == nruns
+    logz_truth = np.log(2 * np.pi) - ndim * np.log(2 * size)
+    assert abs(res['logz'][-1] - logz_truth) < 4 * res['logzerr'][-1]
+    # the runs do not depend on the pool
+    with Pool(2) as pool:
+        res1, runs1 = dynesty.run_ensemble(loglike,
+                                           prior_transform,
+                                           ndim,
+                                           nruns,
+                                           rstate=get_rstate(),
+                                           pool=pool,
+                                           queue_size=2,
+                                           **kw)
+    for r, r1 in zip(runs, runs1):
+        assert np.all(r['logl'] == r1['logl'])
+    # stopping early
+    res1, runs1 = dynesty.run_ensemble(loglike,
+                                       prior_transform,
+                                       ndim,
+                                       nruns,
+                                       rstate=get_rstate(),
+                                       logzerr_target=100,
+                                       **kw)
+    assert len(runs1) == 2
+    # resuming
+    fname = str(tmp_path / 'ensemble.pkl')
+    dynesty.run_ensemble(loglike,
+                         prior_transform,
+                         ndim,
+                         2,
+                         rstate=get_rstate(),
+                         checkpoint_file=fname,
+                         **kw)
+    res1, runs1 = dynesty.run_ensemble(loglike,
+                                       prior_transform,
+                                       ndim,
+                                       2,
+                                       checkpoint_file=fname,
+                                       resume=True,
+                                       **kw)
+    for r, r1 in zip(runs, runs1):
+        assert np.all(r['logl'] == r1['logl'])
@@ -1,3 +1,6 @@
+import os
+import time
+import asyncio
 import numpy as np
 import pytest
 import dynesty
@@ -84,6 +87,254 @@ def test_pool_x():
         terminator(pool)
 
 
+def test_pool_chunksize():
+    # test the automatic and fixed chunk sizes and the statistics
+    rstate = get_rstate()
+    x = rstate.uniform(size=(1000, ndim))
+    with dypool.Pool(2, loglike_gau, prior_transform_gau) as pool:
+        for i in range(3):
+            res = pool.map(pool.loglike, x)
+        assert np.allclose(res, [loglike_gau(_) for _ in x])
+        stats = pool.stats
+        assert stats['ncalls'] == 3
+        assert stats['ntasks'] == 3 * len(x)
+        assert 1 <= stats['chunksize'] <= len(x) // 2
+        assert stats['time_per_task'] > 0
+        assert stats['utilization'] > 0
+        terminator(pool)
+    with dypool.Pool(2, loglike_gau, prior_transform_gau,
+                     chunksize=7) as pool:
+        res = pool.map(pool.loglike, x)
+        assert np.allclose(res, [loglike_gau(_) for _ in x])
+        assert pool.stats['chunksize'] == 7
+        terminator(pool)
+
+
+def loglike_uneven(x):
+    # a small fraction of the calls take much longer
+    time.sleep(0.01 if x[0] < 0.05 else 0.0002)
+    return 0.
+
+
+def test_pool_uneven():
+    # the tasks with very different times are sent in small chunks
+    rstate = get_rstate()
+    x = rstate.uniform(size=(1000, ndim))
+    with dypool.Pool(2, loglike_uneven, prior_transform_gau) as pool:
+        for i in range(3):
+            pool.map(pool.loglike, x)
+        assert pool.stats['task_time_cv'] > 1
+        assert pool.stats['chunksize'] < len(x) // 8
+        terminator(pool)
+
+
+def test_thread_pool():
+    # test the thread pool on egg problem
+    # also check that the results do not depend on the number of threads
+    logls = []
+    for njobs in [1, 2]:
+        rstate = get_rstate()
+        with dypool.ThreadPool(njobs, loglike_egg,
+                               prior_transform_egg) as pool:
+            sampler = dynesty.NestedSampler(pool.loglike,
+                                            pool.prior_transform,
+                                            ndim,
+                                            nlive=nlive,
+                                            pool=pool,
+                                            queue_size=100,
+                                            rstate=rstate)
+            sampler.run_nested(dlogz=0.1, print_progress=printing)
+
+            assert (abs(LOGZ_TRUTH_EGG - sampler.results['logz'][-1])
+                    < 5. * sampler.results['logzerr'][-1])
+            logls.append(sampler.results['logl'])
+            terminator(pool)
+    assert np.all(logls[0] == logls[1])
+
+
+class _Counter:
+    ncalls = 0
+
+
+def loglike_egg_crash(x, marker=None):
+    # kill the worker once (the first worker to create the marker file)
+    # after some number of calls
+    _Counter.ncalls += 1
+    if marker is not None and _Counter.ncalls == 1000:
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL))
+            os._exit(1)
+        except FileExistsError:
+            pass
+    return loglike_egg(x)
+
+
+def loglike_always_crash(x):
+    os._exit(1)
+
+
+@pytest.mark.filterwarnings("ignore:A pool worker died")
+def test_fault_tolerant_pool(tmp_path):
+    # check that the failure of the worker does not change the results
+    logls = []
+    for marker in [None, str(tmp_path / 'marker')]:
+        rstate = get_rstate()
+        with dypool.FaultTolerantPool(2,
+                                      loglike_egg_crash,
+                                      prior_transform_egg,
+                                      logl_kwargs=dict(marker=marker)) as pool:
+            sampler = dynesty.NestedSampler(pool.loglike,
+                                            pool.prior_transform,
+                                            ndim,
+                                            nlive=nlive,
+                                            pool=pool,
+                                            queue_size=100,
+                                            rstate=rstate)
+            sampler.run_nested(dlogz=0.1, print_progress=printing)
+            assert pool.stats['nretries'] == (marker is not None)
+            logls.append(sampler.results['logl'])
+            terminator(pool)
+    assert np.all(logls[0] == logls[1])
+
+
+@pytest.mark.filterwarnings("ignore:A pool worker died")
+def test_fault_tolerant_pool_fail():
+    # the number of retries is bounded
+    x = np.zeros((10, ndim))
+    with dypool.FaultTolerantPool(2,
+                                  loglike_always_crash,
+                                  prior_transform_gau,
+                                  max_retries=1) as pool:
+        with pytest.raises(RuntimeError):
+            pool.map(pool.loglike, x)
+        assert pool.stats['nretries'] == 2
+        assert pool.stats['nresubmitted'] == 2 * len(x)
+
+
+def test_socket_pool():
+    # test the socket pool on egg problem with the workers on localhost
+    # the results must be the same as with other pools
+    logls = []
+    for i in range(2):
+        rstate = get_rstate()
+        if i == 0:
+            pool = dypool.SocketPool(2,
+                                     loglike_egg,
+                                     prior_transform_egg,
+                                     nlocal=2,
+                                     timeout=60)
+        else:
+            pool = dypool.ThreadPool(2, loglike_egg, prior_transform_egg)
+        with pool:
+            sampler = dynesty.NestedSampler(pool.loglike,
+                                            pool.prior_transform,
+                                            ndim,
+                                            nlive=nlive,
+                                            pool=pool,
+                                            queue_size=100,
+                                            rstate=rstate)
+            sampler.run_nested(dlogz=0.1, print_progress=printing)
+            assert (abs(LOGZ_TRUTH_EGG - sampler.results['logz'][-1])
+                    < 5. * sampler.results['logzerr'][-1])
+            logls.append(sampler.results['logl'])
+            terminator(pool)
+    assert np.all(logls[0] == logls[1])
+
+
+@pytest.mark.filterwarnings("ignore:Lost the connection")
+def test_socket_pool_lost_worker(tmp_path):
+    # the tasks of the worker that died are resubmitted
+    # and the new workers can join
+    rstate = get_rstate()
+    x = rstate.uniform(size=(3000, ndim))
+    with dypool.SocketPool(2,
+                           loglike_egg_crash,
+                           prior_transform_egg,
+                           logl_kwargs=dict(marker=str(tmp_path / 'marker')),
+                           nlocal=2,
+                           chunksize=10,
+                           timeout=60) as pool:
+        res = pool.map(pool.loglike, x)
+        assert np.allclose(res, [loglike_egg(_) for _ in x])
+        assert pool.stats['nresubmitted'] > 0
+        assert len(pool.workers) == 1
+        proc = mp.Process(target=dypool.socket_worker,
+                          args=(pool.address, pool.authkey),
+                          kwargs=dict(reconnect=False))
+        proc.start()
+        res = pool.map(pool.loglike, x)
+        assert np.allclose(res, [loglike_egg(_) for _ in x])
+        terminator(pool)
+    proc.join()
+
+
+class _InFlight:
+    ncur = 0
+    nmax = 0
+
+
+async def loglike_egg_async(x):
+    # also record the maximum number of calls in flight
+    _InFlight.ncur += 1
+    _InFlight.nmax = max(_InFlight.nmax, _InFlight.ncur)
+    await asyncio.sleep(1e-4)
+    _InFlight.ncur -= 1
+    return loglike_egg(x)
+
+
+def test_asyncio_pool():
+    # test the pool with the coroutine likelihood
+    # the results must be the same as with other pools
+    logls = []
+    _InFlight.nmax = 0
+    for i in range(2):
+        rstate = get_rstate()
+        if i == 0:
+            pool = dypool.AsyncioPool(50, loglike_egg_async,
+                                      prior_transform_egg)
+        else:
+            pool = dypool.ThreadPool(2, loglike_egg, prior_transform_egg)
+        with pool:
+            sampler = dynesty.NestedSampler(pool.loglike,
+                                            pool.prior_transform,
+                                            ndim,
+                                            nlive=300,
+                                            pool=pool,
+                                            queue_size=50,
+                                            rstate=rstate)
+            sampler.run_nested(maxiter=300,
+                               add_live=False,
+                               print_progress=printing)
+            logls.append(sampler.results['logl'])
+            terminator(pool)
+    assert _InFlight.nmax > 1
+    assert np.all(logls[0] == logls[1])
+
+
+def test_asyncio_pool_async():
+    # test running the sampler from the event loop
+
+    async def run():
+        rstate = get_rstate()
+        with dypool.AsyncioPool(50, loglike_egg_async,
+                                prior_transform_egg) as pool:
+            sampler = dynesty.DynamicNestedSampler(pool.loglike,
+                                                   pool.prior_transform,
+                                                   ndim,
+                                                   nlive=300,
+                                                   pool=pool,
+                                                   queue_size=50,
+                                                   rstate=rstate)
+            await sampler.run_nested_async(maxiter=600,
+                                           maxbatch=1,
+                                           print_progress=printing)
+            terminator(pool)
+        return sampler.results
+
+    res = asyncio.run(run())
+    assert len(res['logl']) > 0
+
+
 def test_pool_dynamic():
     # test pool on gau problem
     # i specify large queue_size here, otherwise it is too slow
@@ -56,3 +56,63 @@ def test_saving(dopool, maxiter):
             os.unlink(fname)
         except FileNotFoundError:
             pass
+
+
+class CountingLike:
+
+    def __init__(self):
+        self.ncall = 0
+
+    def __call__(self, x):
+        self.ncall += 1
+        return loglike(x)
+
+
+def test_warm_start():
+    # test that the evaluations saved by a run are reused by the next one
+    ndim = 2
+    fname = 'dynesty_test_%d.h5' % (os.getpid())
+    maxiter = 1000
+    like = CountingLike()
+    sampler = dynesty.NestedSampler(like,
+                                    prior_transform,
+                                    ndim,
+                                    nlive=nlive,
+                                    sample='rwalk',
+                                    save_history=True,
+                                    history_filename=fname,
+                                    rstate=get_rstate())
+    sampler.run_nested(print_progress=printing, maxiter=maxiter)
+    assert like.ncall > 0
+
+    # the exact rerun does not need to evaluate the likelihood at all
+    like1 = CountingLike()
+    sampler1 = dynesty.NestedSampler(like1,
+                                     prior_transform,
+                                     ndim,
+                                     nlive=nlive,
+                                     sample='rwalk',
+                                     warm_start=fname,
+                                     rstate=get_rstate())
+    sampler1.run_nested(print_progress=printing, maxiter=maxiter)
+    assert like1.ncall == 0
+    assert np.all(sampler1.results['logl'] == sampler.results['logl'])
+
+    # the run with more live points and different seed
+    # reuses the saved prior draws
+    like2 = CountingLike()
+    sampler2 = dynesty.NestedSampler(like2,
+                                     prior_transform,
+                                     ndim,
+                                     nlive=2 * nlive,
+                                     sample='rwalk',
+                                     warm_start=fname,
+                                     save_history=True,
+                                     history_filename=fname,
+                                     rstate=get_rstate(1))
+    assert like2.ncall == nlive
+    sampler2.run_nested(print_progress=printing, maxiter=maxiter)
+    try:
+        os.unlink(fname)
+    except FileNotFoundError:
+        pass